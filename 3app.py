@@ -5,7 +5,11 @@ import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import requests
 import numpy as np
-from io import StringIO
+
+from charts import cached_figure, downsample, figure_cache, render_mode
+from derived import dataset_version
+from schema import CLIENT_SCHEMA, apply_schema, describe_drift, read_csv_dtypes
+from sheet_fetch import csv_export_url, sheet_client
 
 # Page configuration
 st.set_page_config(
@@ -200,22 +204,24 @@ GRANT_TYPES = {
 
 @st.cache_data
 def load_google_sheets_data():
-    """Load data from Google Sheets with error handling"""
+    """Load data from Google Sheets with error handling, with its dataset version"""
     try:
         # Convert Google Sheets URL to CSV export URL
         sheet_id = "1xok6PwIk5Kyj78KhBFkjJYGNSdkosxeXliTy0Alt3bc"
-        csv_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv&gid=0"
+        csv_url = csv_export_url(sheet_id, gid=0)
         
-        response = requests.get(csv_url, timeout=10)
-        if response.status_code == 200:
-            df = pd.read_csv(StringIO(response.text))
-            return df
-        else:
-            st.warning("Could not load live data. Using sample data.")
-            return generate_sample_data()
+        df = sheet_client.fetch_csv(csv_url, dtype=read_csv_dtypes(CLIENT_SCHEMA))
+        df, schema_report = apply_schema(df, CLIENT_SCHEMA)
+        if describe_drift(schema_report):
+            st.warning(f"Sheet schema drift: {describe_drift(schema_report)}")
+    except requests.HTTPError:
+        st.warning("Could not load live data. Using sample data.")
+        df = generate_sample_data()
     except Exception as e:
         st.warning(f"Error loading data: {str(e)}. Using sample data.")
-        return generate_sample_data()
+        df = generate_sample_data()
+    # Hashed once per load so reruns key the figure cache for free
+    return df, dataset_version(df)
 
 def generate_sample_data():
     """Generate sample data for demonstration"""
@@ -252,7 +258,7 @@ def main():
     
     # Load data
     with st.spinner("Loading grant data..."):
-        df = load_google_sheets_data()
+        df, version = load_google_sheets_data()
     
     # Sidebar navigation
     st.sidebar.title("Navigation")
@@ -269,7 +275,7 @@ def main():
     elif page == "Client Management":
         show_client_management(df)
     elif page == "Analytics":
-        show_analytics(df)
+        show_analytics(df, version)
     elif page == "Reports":
         show_reports(df)
 
@@ -442,22 +448,31 @@ def show_client_management(df):
                 key="download_clients_csv"
             )
 
-def show_analytics(df):
-    """Display analytics and insights"""
+def show_analytics(df, version):
+    """Display analytics and insights for this version of the data"""
     st.header("📈 Analytics & Insights")
     
     if df.empty:
         st.warning("No data available for analytics")
         return
     
+    theme = st.get_option('theme.base')
+    
     # Time series analysis
     if 'Application_Date' in df.columns:
         st.subheader("Application Trends")
         df['Application_Date'] = pd.to_datetime(df['Application_Date'])
-        daily_apps = df.groupby(df['Application_Date'].dt.date).size().reset_index()
-        daily_apps.columns = ['Date', 'Applications']
         
-        fig = px.line(daily_apps, x='Date', y='Applications', title="Daily Applications")
+        def daily_applications_chart():
+            daily_apps = df.groupby(df['Application_Date'].dt.date).size().reset_index()
+            daily_apps.columns = ['Date', 'Applications']
+            daily_apps['Date'] = pd.to_datetime(daily_apps['Date'])
+            # Long histories plot an LTTB sample that keeps the peaks and dips
+            shown = downsample(daily_apps, 'Date', 'Applications')
+            return px.line(shown, x='Date', y='Applications', title="Daily Applications",
+                           render_mode=render_mode(len(daily_apps)))
+        
+        fig = cached_figure('daily_applications', version, daily_applications_chart, theme=theme)
         st.plotly_chart(fig, use_container_width=True, key="daily_applications_chart")
     
     # Status analysis
@@ -466,19 +481,27 @@ def show_analytics(df):
         
         with col1:
             st.subheader("Application Status Distribution")
-            status_counts = df['Status'].value_counts()
-            fig = px.pie(values=status_counts.values, names=status_counts.index)
+            
+            def status_chart():
+                status_counts = df['Status'].value_counts()
+                return px.pie(values=status_counts.values, names=status_counts.index)
+            
+            fig = cached_figure('status_distribution', version, status_chart, theme=theme)
             st.plotly_chart(fig, use_container_width=True, key="status_pie_chart")
         
         with col2:
             st.subheader("Success Rate by Grant Type")
             if 'Grant_Type' in df.columns:
-                success_rate = df.groupby('Grant_Type')['Status'].apply(
-                    lambda x: (x == 'Approved').sum() / len(x) * 100
-                ).sort_values(ascending=False)
+                def success_rate_chart():
+                    success_rate = df.groupby('Grant_Type', observed=True)['Status'].apply(
+                        lambda x: (x == 'Approved').sum() / len(x) * 100
+                    ).sort_values(ascending=False)
+                    
+                    fig = px.bar(x=success_rate.index, y=success_rate.values)
+                    fig.update_layout(xaxis_title="Grant Type", yaxis_title="Success Rate (%)")
+                    return fig
                 
-                fig = px.bar(x=success_rate.index, y=success_rate.values)
-                fig.update_layout(xaxis_title="Grant Type", yaxis_title="Success Rate (%)")
+                fig = cached_figure('success_rate', version, success_rate_chart, theme=theme)
                 st.plotly_chart(fig, use_container_width=True, key="success_rate_chart")
     
     # Amount analysis
@@ -495,6 +518,12 @@ def show_analytics(df):
             if 'Status' in df.columns:
                 approved_amount = df[df['Status'] == 'Approved']['Amount_Requested'].sum()
                 st.metric("Total Approved", f"${approved_amount:,.0f}")
+    
+    with st.expander("⏱️ Chart Build Times"):
+        st.dataframe(
+            pd.DataFrame(figure_cache.stats()).T.rename(columns={'build_ms': 'Last build (ms)'}).round(1),
+            use_container_width=True
+        )
 
 def show_reports(df):
     """Display reporting interface"""
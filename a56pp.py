@@ -8,6 +8,9 @@ import json
 from urllib.parse import urlparse
 import numpy as np
 
+from schema import GRANT_SCHEMA, apply_schema, describe_drift, read_csv_dtypes
+from sheet_fetch import csv_export_url, sheet_client, sheet_id_from_url
+
 # Page configuration
 st.set_page_config(
     page_title="Comprehensive Grants Management Dashboard",
@@ -55,10 +58,12 @@ def load_google_sheets_data(sheet_url):
     """Load data from Google Sheets"""
     try:
         # Convert Google Sheets URL to CSV export URL
-        if 'docs.google.com/spreadsheets' in sheet_url:
-            sheet_id = sheet_url.split('/d/')[1].split('/')[0]
-            csv_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv"
-            df = pd.read_csv(csv_url)
+        sheet_id = sheet_id_from_url(sheet_url)
+        if sheet_id:
+            df = sheet_client.fetch_csv(csv_export_url(sheet_id), dtype=read_csv_dtypes(GRANT_SCHEMA))
+            df, schema_report = apply_schema(df, GRANT_SCHEMA)
+            if describe_drift(schema_report):
+                st.warning(f"Sheet schema drift: {describe_drift(schema_report)}")
             return df
     except Exception as e:
         st.error(f"Error loading Google Sheets data: {e}")
@@ -342,7 +347,7 @@ def main():
     
     with col2:
         # Funding by grant type
-        funding_by_type = df.groupby('Grant Type')['Funding'].sum().sort_values(ascending=False).head(10)
+        funding_by_type = df.groupby('Grant Type', observed=True)['Funding'].sum().sort_values(ascending=False).head(10)
         funding_df = pd.DataFrame({'Grant Type': funding_by_type.index, 'Total Funding': funding_by_type.values})
         fig = px.bar(funding_df, x='Total Funding', y='Grant Type', orientation='h', title="Top 10 Grant Types by Funding")
         st.plotly_chart(fig, use_container_width=True)
@@ -418,7 +423,7 @@ def main():
             {df['Status'].value_counts().to_string()}
             
             Top Grant Types by Funding:
-            {df.groupby('Grant Type')['Funding'].sum().sort_values(ascending=False).head(5).to_string()}
+            {df.groupby('Grant Type', observed=True)['Funding'].sum().sort_values(ascending=False).head(5).to_string()}
             """
             st.download_button(
                 label="Download Report",
@@ -0,0 +1,156 @@
+"""Dashboard rollups over the derived grant frame, updated incrementally per version"""
+
+import threading
+from collections import OrderedDict
+from datetime import date
+
+import pandas as pd
+
+from config import AGGREGATE_CACHE_SIZE
+from derived import dataset_version
+
+# Group columns of each rollup; () is the whole-frame total
+ROLLUPS = {
+    'total': (),
+    'status': ('Status',),
+    'eligibility': ('Eligibility',),
+    'grant_type': ('Grant Type',),
+    'agency': ('Agency',),
+    'urgency': ('Urgency',),
+    'status_eligibility': ('Status', 'Eligibility'),
+    'grant_type_status': ('Grant Type', 'Status')
+}
+
+# Additive measures kept for every group
+MEASURES = ['rows', 'funding', 'funded', 'opportunities']
+
+
+def _measures(df):
+    """Return the group columns plus one additive measure column per MEASURES entry"""
+    keys = sorted({column for columns in ROLLUPS.values() for column in columns})
+    funding = pd.to_numeric(df['Funding'], errors='coerce')
+    frame = pd.DataFrame({column: df[column].astype('category') for column in keys}, index=df.index)
+    frame['rows'] = 1
+    frame['funding'] = funding.fillna(0).astype(float)
+    frame['funded'] = funding.notna().astype(int)
+    frame['opportunities'] = df['Opportunity Number'].notna().astype(int)
+    return frame
+
+
+def _rollup(frame, keys):
+    """Return the measures of frame summed per group of keys"""
+    if not keys:
+        # sum() yields one mixed Series, so transposing it makes every measure float
+        return frame[MEASURES].sum().to_frame().T.set_axis(['All']).astype(frame[MEASURES].dtypes.to_dict())
+    table = frame.groupby(list(keys), observed=True)[MEASURES].sum().reset_index()
+    # Plain group labels, so rollups of frames with different categories align
+    return table.astype({column: object for column in keys}).set_index(list(keys)).sort_index()
+
+
+class GrantAggregates:
+    """Every dashboard rollup of one grant frame.
+
+    Tables hold additive measures only (row count, funding sum, funded row
+    count, opportunity count), so a new version can be reached from an old
+    one by subtracting the rows that left or changed and adding the rows
+    that arrived or changed, without regrouping the unchanged rows.
+    """
+
+    def __init__(self, frame, hashes, tables):
+        self.frame = frame
+        self.hashes = hashes
+        self.tables = tables
+
+    @classmethod
+    def build(cls, df):
+        """Compute every rollup of df from scratch"""
+        frame = _measures(df)
+        tables = {name: _rollup(frame, keys) for name, keys in ROLLUPS.items()}
+        return cls(frame, pd.util.hash_pandas_object(frame, index=False), tables)
+
+    def update(self, df):
+        """Return the aggregates of df, adjusting only the groups touched by changed rows"""
+        frame = _measures(df)
+        hashes = pd.util.hash_pandas_object(frame, index=False)
+        if not (frame.index.is_unique and self.frame.index.is_unique):
+            return GrantAggregates.build(df)
+
+        previous = self.hashes.reindex(hashes.index)
+        incoming = hashes.index[previous.ne(hashes).to_numpy()]
+        outgoing = self.hashes.index.difference(hashes.index).union(incoming.intersection(self.hashes.index))
+        if not len(incoming) and not len(outgoing):
+            return GrantAggregates(frame, hashes, self.tables)
+
+        added, removed = frame.loc[incoming], self.frame.loc[outgoing]
+        tables = {}
+        for name, keys in ROLLUPS.items():
+            table = self.tables[name]
+            table = table.add(_rollup(added, keys), fill_value=0)
+            table = table.sub(_rollup(removed, keys), fill_value=0)
+            tables[name] = table[table['rows'] > 0].astype(frame[MEASURES].dtypes.to_dict())
+        return GrantAggregates(frame, hashes, tables)
+
+    def totals(self):
+        """Return the whole-frame measures as a dict"""
+        table = self.tables['total']
+        return {measure: table[measure].iloc[0].item() if len(table) else 0 for measure in MEASURES}
+
+    def counts(self, name):
+        """Return row counts per group, largest first, like value_counts"""
+        table = self.tables[name]
+        return table['rows'].sort_values(ascending=False, kind='stable')
+
+    def table(self, name):
+        """Return the measures per group with the mean funding of funded rows"""
+        table = self.tables[name].copy()
+        table['mean'] = table['funding'] / table['funded'].where(table['funded'] > 0)
+        return table
+
+    def matrix(self, name, measure='rows'):
+        """Return a two-key rollup as a matrix of one measure, missing pairs as 0"""
+        return self.tables[name][measure].unstack(fill_value=0).sort_index()
+
+
+class AggregateCache:
+    """Bounded LRU of grant aggregates keyed on dataset version and day.
+
+    The derived urgency buckets move with the date, so like the derived
+    frames entries roll over at midnight. A new key starts from the most
+    recent aggregates and only re-groups the rows that changed.
+    """
+
+    def __init__(self, maxsize=AGGREGATE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.builds = 0
+        self.updates = 0
+        self._aggregates = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, df, version=None):
+        """Return the aggregates of df, building or updating them on a miss"""
+        key = (version or dataset_version(df), date.today())
+        with self._lock:
+            if key in self._aggregates:
+                self._aggregates.move_to_end(key)
+                return self._aggregates[key]
+            latest = next(reversed(self._aggregates.values()), None)
+
+        aggregates = latest.update(df) if latest is not None else GrantAggregates.build(df)
+        with self._lock:
+            if latest is None:
+                self.builds += 1
+            else:
+                self.updates += 1
+            self._aggregates[key] = aggregates
+            self._aggregates.move_to_end(key)
+            while len(self._aggregates) > self.maxsize:
+                self._aggregates.popitem(last=False)
+        return aggregates
+
+
+aggregate_cache = AggregateCache()
+
+
+def get_aggregates(df, version=None):
+    """Return the shared dashboard rollups for this version of df"""
+    return aggregate_cache.get(df, version)
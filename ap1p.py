@@ -3,8 +3,17 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
-import requests
-from io import StringIO
+
+from config import SHEET_TABS
+from autocomplete import build_phrases, get_autocomplete
+from derived import dataset_version
+from facets import get_facet_index, with_count
+from query_plan import CLIENT_FILTER_COLUMNS, GRANT_FILTER_COLUMNS, run_filters
+from refresher import get_refresher
+from saved_searches import saved_searches
+from schema import CLIENT_SCHEMA, apply_schema, describe_drift, read_csv_dtypes
+from search_service import build_documents, get_global_search
+from sheet_fetch import load_sheet_tabs, sheet_client, tab_url
 
 # Configure Streamlit page
 st.set_page_config(
@@ -123,32 +132,64 @@ GRANT_CATEGORIES = {
     ]
 }
 
+# Which search hit kinds each "Search In" choice covers
+SEARCH_TYPE_KINDS = {
+    "All": None,
+    "Grant Types": ['grant_type', 'category'],
+    "Clients": ['client'],
+    "Industries": ['industry']
+}
+
+# How each kind of autocomplete suggestion is offered
+SUGGESTION_LABELS = {
+    "grant_type": "Browse {}",
+    "category": "Browse {}",
+    "industry": "Filter by {}",
+    "state": "Filter by State: {}",
+    "client": "Client: {}",
+    "title": "Grant: {}",
+    "agency": "Agency: {}"
+}
+
 # Initialize session state for search and filters
 if 'search_history' not in st.session_state:
     st.session_state.search_history = []
 
-if 'saved_filters' not in st.session_state:
-    st.session_state.saved_filters = {}
+@st.cache_data
+def load_google_sheets_data(sheet_id, sheet_names=tuple(SHEET_TABS)):
+    """Load every tab from Google Sheets concurrently, with each tab's dataset version.
 
-@st.cache_data(ttl=300)  # Cache for 5 minutes
-def load_google_sheets_data(sheet_id, sheet_name="Sheet1"):
-    """Load data from Google Sheets"""
-    try:
-        # Convert Google Sheets URL to CSV export URL
-        csv_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-        response = requests.get(csv_url)
-        
-        if response.status_code == 200:
-            # Read CSV data
-            csv_data = StringIO(response.text)
-            df = pd.read_csv(csv_data)
-            return df
-        else:
-            st.error(f"Failed to load data from sheet: {sheet_name}")
-            return pd.DataFrame()
-    except Exception as e:
-        st.error(f"Error loading data: {str(e)}")
-        return pd.DataFrame()
+    This is the first load only; client_refresher keeps the client tab current.
+    """
+    sheets, tab_report = load_sheet_tabs(sheet_id, list(sheet_names), dtype=read_csv_dtypes(CLIENT_SCHEMA))
+    for sheet_name, df in sheets.items():
+        sheets[sheet_name], schema_report = apply_schema(df, CLIENT_SCHEMA)
+        if describe_drift(schema_report):
+            st.warning(f"Sheet {sheet_name} schema drift: {describe_drift(schema_report)}")
+    for sheet_name, info in tab_report.items():
+        if info['source'] == 'failed':
+            st.error(f"Failed to load data from sheet: {sheet_name} ({info['error']})")
+        elif info['source'] == 'cache':
+            st.warning(f"Sheet {sheet_name} could not be refreshed - showing the last cached copy")
+    # Hashed once per load so reruns key the search, facet and filter caches for free
+    versions = {sheet_name: dataset_version(df) for sheet_name, df in sheets.items()}
+    return sheets, versions, tab_report
+
+def client_refresher(sheet_id, version=None):
+    """Return the background refresher that keeps the client tab of sheet_id current"""
+    def fetch_clients():
+        df = sheet_client.fetch_csv(tab_url(sheet_id, SHEET_TABS[0]), dtype=read_csv_dtypes(CLIENT_SCHEMA))
+        if df.empty:
+            raise ValueError("Client sheet is empty")
+        return apply_schema(df, CLIENT_SCHEMA)[0]
+    
+    return get_refresher((sheet_id, SHEET_TABS[0]), fetch_clients, version=version)
+
+@st.cache_data
+def load_sample_data():
+    """Create the sample client data once, with its dataset version"""
+    df = create_sample_data()
+    return df, dataset_version(df)
 
 def create_sample_data():
     """Create sample data for demonstration"""
@@ -199,41 +240,58 @@ def global_search_interface():
                 st.session_state.global_search = search
                 st.rerun()
 
+def index_search_sources(df, version):
+    """Give this session the search and suggestions over this version of the client data"""
+    # Held per session, so other sessions loading other versions never swap them out
+    st.session_state.client_search = get_global_search(
+        version, lambda: build_documents(GRANT_TYPES, clients=df)
+    )
+    st.session_state.client_suggestions = get_autocomplete(
+        version, lambda: build_phrases(GRANT_TYPES, clients=df)
+    )
+    saved_searches.refresh(
+        df, version,
+        lambda frame, spec, frame_version: run_filters(
+            frame, spec, CLIENT_FILTER_COLUMNS, GRANT_CATEGORIES, frame_version
+        )[0].index
+    )
+
 def show_global_search_results(query):
     """Show global search results"""
     st.sidebar.markdown("**Search Results:**")
+    search = st.session_state.client_search
+    hits = search.search(query)
     
     # Search in grant types
-    matching_grants = [grant for grant in GRANT_TYPES if query.lower() in grant.lower()]
+    matching_grants = [hit.title for hit in hits if hit.kind == 'grant_type']
     if matching_grants:
         st.sidebar.markdown("**Grant Types:**")
         for grant in matching_grants[:3]:
             st.sidebar.markdown(f"• {grant}")
     
+    matching_clients = [hit for hit in hits if hit.kind == 'client']
+    if matching_clients:
+        st.sidebar.markdown("**Clients:**")
+        for hit in matching_clients[:3]:
+            st.sidebar.markdown(f"• {hit.title} ({hit.detail})")
+    
     # Search suggestions
     suggestions = generate_search_suggestions(query)
     if suggestions:
         st.sidebar.markdown("**Suggestions:**")
         for suggestion in suggestions:
             st.sidebar.markdown(f"• {suggestion}")
+    
+    st.sidebar.caption(f"{len(hits)} results in {search.stats()['last_seconds'] * 1000:.1f} ms")
 
 def generate_search_suggestions(query):
-    """Generate search suggestions based on query"""
-    suggestions = []
-    
-    # Industry suggestions
-    industries = ['Technology', 'Healthcare', 'Manufacturing', 'Agriculture', 'Education', 'Energy']
-    matching_industries = [ind for ind in industries if query.lower() in ind.lower()]
-    suggestions.extend([f"Filter by {ind}" for ind in matching_industries])
-    
-    # Grant category suggestions
-    for category, grants in GRANT_CATEGORIES.items():
-        if query.lower() in category.lower():
-            suggestions.append(f"Browse {category}")
-    
-    return suggestions[:3]
+    """Generate typo-tolerant search suggestions for the query"""
+    return [
+        SUGGESTION_LABELS[suggestion.kind].format(suggestion.text)
+        for suggestion in st.session_state.client_suggestions.suggest(query)
+    ]
 
-def advanced_search_interface():
+def advanced_search_interface(version):
     """Advanced search interface"""
     st.markdown('<div class="search-container">', unsafe_allow_html=True)
     st.subheader("🔍 Advanced Search & Filters")
@@ -268,7 +326,7 @@ def advanced_search_interface():
         show_advanced_filters()
     
     with search_tab3:
-        show_saved_searches()
+        show_saved_searches(version)
     
     st.markdown('</div>', unsafe_allow_html=True)
     
@@ -331,6 +389,9 @@ def show_advanced_filters():
             key="filter_date_range"
         )
     
+    filter_name = st.text_input("Filter Set Name", placeholder="Enter a name to save this filter set",
+                                key="filter_set_name")
+    
     # Apply filters button
     col1, col2, col3 = st.columns([1, 1, 1])
     
@@ -340,7 +401,7 @@ def show_advanced_filters():
     
     with col2:
         if st.button("💾 Save Filter Set"):
-            save_filter_set(selected_categories, selected_industries, selected_states, funding_range, deadline_filter, date_range)
+            save_filter_set(filter_name, selected_categories, selected_industries, selected_states, funding_range, deadline_filter, date_range)
     
     with col3:
         if st.button("🔄 Clear All Filters"):
@@ -359,33 +420,37 @@ def apply_advanced_filters(categories, industries, states, funding_range, deadli
     }
     st.success("Filters applied successfully!")
 
-def save_filter_set(categories, industries, states, funding_range, deadline, date_range):
+def save_filter_set(filter_name, categories, industries, states, funding_range, deadline, date_range):
     """Save current filter set"""
-    filter_name = st.text_input("Filter Set Name", placeholder="Enter a name for this filter set")
-    
-    if filter_name:
-        st.session_state.saved_filters[filter_name] = {
-            'categories': categories,
-            'industries': industries,
-            'states': states,
-            'funding_range': funding_range,
-            'deadline': deadline,
-            'date_range': date_range,
-            'created_at': datetime.now()
-        }
-        st.success(f"Filter set '{filter_name}' saved!")
+    if not filter_name:
+        st.warning("Enter a name for this filter set first")
+        return
+    
+    saved_searches.save(filter_name, {
+        'categories': categories,
+        'industries': industries,
+        'states': states,
+        'funding_range': funding_range,
+        'deadline': deadline,
+        'date_range': date_range
+    })
+    st.success(f"Filter set '{filter_name}' saved!")
 
-def show_saved_searches():
+def show_saved_searches(version):
     """Show saved search and filter sets"""
-    if st.session_state.saved_filters:
+    searches = saved_searches.searches(version)
+    if searches:
         st.subheader("Saved Filter Sets")
         
-        for name, filters in st.session_state.saved_filters.items():
-            with st.expander(f"📁 {name}"):
+        for search in searches:
+            name, filters = search['name'], search['spec']
+            new_badge = f" · 🆕 {search['new_matches']} new" if search['new_matches'] else ""
+            summary = "results pending" if search['pending'] else f"{search['matches']} matches{new_badge}"
+            with st.expander(f"📁 {name} ({summary})"):
                 col1, col2 = st.columns([3, 1])
                 
                 with col1:
-                    st.write(f"**Created:** {filters['created_at'].strftime('%Y-%m-%d %H:%M')}")
+                    st.write(f"**Created:** {search['created_at'].replace('T', ' ')[:16]}")
                     if filters['categories']:
                         st.write(f"**Categories:** {', '.join(filters['categories'])}")
                     if filters['industries']:
@@ -395,18 +460,23 @@ def show_saved_searches():
                 
                 with col2:
                     if st.button(f"Apply", key=f"apply_{name}"):
-                        load_saved_filter(name)
+                        load_saved_filter(name, version)
                     if st.button(f"Delete", key=f"delete_{name}"):
-                        del st.session_state.saved_filters[name]
+                        saved_searches.delete(name)
                         st.rerun()
     else:
         st.info("No saved filter sets yet. Create some using the Advanced Filters tab!")
 
-def load_saved_filter(name):
+def load_saved_filter(name, version):
     """Load a saved filter set"""
-    filters = st.session_state.saved_filters[name]
-    st.session_state.active_filters = filters
-    st.success(f"Loaded filter set: {name}")
+    search = saved_searches.open(name, version)
+    if search is None:
+        return
+    st.session_state.active_filters = search['spec']
+    st.success(
+        f"Loaded filter set: {name} - {len(search['ids'])} matches, "
+        f"{len(search['new_ids'])} new since last view"
+    )
 
 def clear_all_filters():
     """Clear all active filters"""
@@ -418,12 +488,14 @@ def show_search_results(search_info):
     """Show search results"""
     st.subheader(f"🔍 Search Results for: '{search_info['query']}'")
     
-    query = search_info['query'].lower()
     search_type = search_info['type']
+    search = st.session_state.client_search
+    hits = search.search(search_info['query'], kinds=SEARCH_TYPE_KINDS[search_type])
+    st.caption(f"{len(hits)} results in {search.stats()['last_seconds'] * 1000:.1f} ms")
     
     # Search in different data types based on selection
     if search_type in ["All", "Grant Types"]:
-        matching_grants = [grant for grant in GRANT_TYPES if query in grant.lower()]
+        matching_grants = [hit.title for hit in hits if hit.kind == 'grant_type']
         if matching_grants:
             st.write(f"**Found {len(matching_grants)} matching grant types:**")
             
@@ -439,6 +511,17 @@ def show_search_results(search_info):
                             st.session_state.selected_grant = grant
                             st.rerun()
     
+    if search_type in ["All", "Clients", "Industries"]:
+        matching_industries = [hit.title for hit in hits if hit.kind == 'industry']
+        if matching_industries:
+            st.write(f"**Matching industries:** {', '.join(matching_industries)}")
+        
+        matching_clients = [hit for hit in hits if hit.kind == 'client']
+        if matching_clients:
+            st.write(f"**Found {len(matching_clients)} matching clients:**")
+            for hit in matching_clients[:10]:
+                st.write(f"• **{hit.title}** - {hit.detail}")
+    
     # Show active filters if any
     if hasattr(st.session_state, 'active_filters'):
         show_active_filters()
@@ -484,6 +567,24 @@ def main():
     # Header
     st.markdown('<h1 class="main-header">Grant Management Dashboard</h1>', unsafe_allow_html=True)
     
+    # Load data
+    sheet_id = "1xok6PwIk5Kyj78KhBFkjJYGNSdkosxeXliTy0Alt3bc"
+    
+    # Try to load real data, fallback to sample data
+    with st.spinner("Loading data..."):
+        sheets, versions, tab_report = load_google_sheets_data(sheet_id)
+        df = sheets.get(SHEET_TABS[0], pd.DataFrame())
+        version = versions.get(SHEET_TABS[0])
+        # Reloads run on the refresher thread; a newer copy is served once it is ready
+        refresher = client_refresher(sheet_id, version)
+        refreshed_df, refreshed_version, _ = refresher.current()
+        if refreshed_version is not None:
+            df, version = refreshed_df, refreshed_version
+        if df.empty:
+            st.warning("Using sample data for demonstration")
+            df, version = load_sample_data()
+    index_search_sources(df, version)
+    
     # Global search in sidebar
     global_search_interface()
     
@@ -494,26 +595,25 @@ def main():
         ["Overview", "Grant Types", "Client Management", "Analytics", "Reports"]
     )
     
-    # Load data
-    sheet_id = "1xok6PwIk5Kyj78KhBFkjJYGNSdkosxeXliTy0Alt3bc"
+    refresh_status = refresher.status()
+    if refresh_status['age'] is not None:
+        st.sidebar.caption(
+            f"🔄 Data age {refresh_status['age']:.0f}s · last refresh took {refresh_status['last_duration']:.2f}s"
+        )
     
-    # Try to load real data, fallback to sample data
-    with st.spinner("Loading data..."):
-        df = load_google_sheets_data(sheet_id)
-        if df.empty:
-            st.warning("Using sample data for demonstration")
-            df = create_sample_data()
+    with st.sidebar.expander("⏱️ Sheet Load Times"):
+        st.dataframe(pd.DataFrame(tab_report).T, use_container_width=True)
     
     # Show advanced search interface on relevant pages
     if page in ["Grant Types", "Client Management"]:
-        advanced_search_interface()
+        advanced_search_interface(version)
     
     if page == "Overview":
         show_overview(df)
     elif page == "Grant Types":
         show_grant_types()
     elif page == "Client Management":
-        show_client_management(df)
+        show_client_management(df, version)
     elif page == "Analytics":
         show_analytics(df)
     elif page == "Reports":
@@ -611,19 +711,33 @@ def show_grant_types():
     else:
         display_grant_grid(available_grants)
 
+@st.cache_data
+def grant_types_frame(grants):
+    """Return the grant types as a frame with their category, for filtering, and its dataset version"""
+    category_of = {grant: category for category, members in GRANT_CATEGORIES.items() for grant in members}
+    frame = pd.DataFrame({
+        'Grant Type': list(grants),
+        'Category': [category_of.get(grant, "Other Grants") for grant in grants]
+    })
+    return frame, dataset_version(frame)
+
 def apply_grant_filters(grants, filters):
     """Apply filters to grant list"""
-    filtered_grants = grants.copy()
-    
-    # Apply category filters
-    if filters.get('categories'):
-        category_grants = []
-        for category in filters['categories']:
-            if category in GRANT_CATEGORIES:
-                category_grants.extend(GRANT_CATEGORIES[category])
-        filtered_grants = [g for g in filtered_grants if g in category_grants]
-    
-    return filtered_grants
+    frame, version = grant_types_frame(tuple(grants))
+    filtered, plan = run_filters(frame, filters, GRANT_FILTER_COLUMNS, GRANT_CATEGORIES, version)
+    show_skipped_filters(plan, "grant types")
+    return filtered['Grant Type'].tolist()
+
+def apply_client_filters(df, version, filters):
+    """Apply the active advanced filters to this version of the client frame"""
+    filtered, plan = run_filters(df, filters, CLIENT_FILTER_COLUMNS, GRANT_CATEGORIES, version)
+    show_skipped_filters(plan, "clients")
+    return filtered
+
+def show_skipped_filters(plan, target):
+    """Note the active filters this data has no column for"""
+    if plan.skipped:
+        st.caption(f"Not applied to {target} (no matching data): {', '.join(plan.skipped)}")
 
 def display_grant_list(grants):
     """Display grants as a list"""
@@ -824,47 +938,50 @@ def show_grant_statistics(grant_type):
     fig = px.histogram(x=amounts, nbins=10, title='Distribution of Award Amounts')
     st.plotly_chart(fig, use_container_width=True)
 
-def show_client_management(df):
+def show_client_management(df, version):
     """Display enhanced client management interface with advanced search"""
     st.header("Client Management")
     
     # Enhanced search and filter interface
     col1, col2, col3, col4 = st.columns(4)
     
+    facet_columns = [column for column in ['Industry', 'State'] if column in df.columns]
+    facets = get_facet_index(df, facet_columns, version=version)
+    # An empty multiselect means "no filter" here, so it maps to None
+    counts = facets.counts({
+        column: st.session_state.get(f"client_{column.lower()}_filter") or None for column in facet_columns
+    })
+    industry_filter, state_filter = [], []
+    
     with col1:
         search_client = st.text_input("🔍 Search Clients", placeholder="Name, email, business...")
     
     with col2:
         if 'Industry' in df.columns:
             industry_filter = st.multiselect("Industries", 
-                                           list(df['Industry'].unique()),
+                                           facets.values('Industry'),
+                                           format_func=with_count(counts['Industry']),
                                            key="client_industry_filter")
     
     with col3:
         if 'State' in df.columns:
             state_filter = st.multiselect("States", 
-                                        list(df['State'].unique()),
+                                        facets.values('State'),
+                                        format_func=with_count(counts['State']),
                                         key="client_state_filter")
     
     with col4:
         sort_by = st.selectbox("Sort by", ["Name", "Industry", "State", "Recent"])
     
     # Apply filters
-    filtered_df = df.copy()
+    filtered_df = df[facets.mask({'Industry': industry_filter or None, 'State': state_filter or None})]
+    if hasattr(st.session_state, 'active_filters'):
+        advanced = apply_client_filters(df, version, st.session_state.active_filters)
+        filtered_df = filtered_df[filtered_df.index.isin(advanced.index)]
     
     if search_client:
-        mask = (
-            filtered_df['client'].str.contains(search_client, case=False, na=False) |
-            filtered_df['Email'].str.contains(search_client, case=False, na=False) |
-            filtered_df['Business'].str.contains(search_client, case=False, na=False)
-        )
-        filtered_df = filtered_df[mask]
-    
-    if 'Industry' in df.columns and industry_filter:
-        filtered_df = filtered_df[filtered_df['Industry'].isin(industry_filter)]
-    
-    if 'State' in df.columns and state_filter:
-        filtered_df = filtered_df[filtered_df['State'].isin(state_filter)]
+        client_hits = st.session_state.client_search.search(search_client, kinds=['client'])
+        filtered_df = filtered_df[filtered_df.index.isin([hit.key for hit in client_hits])]
     
     # Sort data
     if sort_by == "Name":
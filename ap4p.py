@@ -4,8 +4,9 @@ import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import numpy as np
-import requests
-from io import StringIO
+
+from schema import CLIENT_SCHEMA, apply_schema, describe_drift, read_csv_dtypes
+from sheet_fetch import csv_export_url, sheet_client
 
 # Page configuration
 st.set_page_config(
@@ -64,14 +65,13 @@ def load_google_sheets_data():
     try:
         # Convert Google Sheets URL to CSV export URL
         sheet_id = "1xok6PwIk5Kyj78KhBFkjJYGNSdkosxeXliTy0Alt3bc"
-        csv_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv&gid=0"
+        csv_url = csv_export_url(sheet_id, gid=0)
         
-        response = requests.get(csv_url)
-        if response.status_code == 200:
-            df = pd.read_csv(StringIO(response.text))
-            return df
-        else:
-            return create_sample_data()
+        df = sheet_client.fetch_csv(csv_url, dtype=read_csv_dtypes(CLIENT_SCHEMA))
+        df, schema_report = apply_schema(df, CLIENT_SCHEMA)
+        if describe_drift(schema_report):
+            st.warning(f"Sheet schema drift: {describe_drift(schema_report)}")
+        return df
     except:
         return create_sample_data()
 
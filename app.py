@@ -7,8 +7,26 @@ import requests
 import json
 from urllib.parse import urlparse
 import numpy as np
-from io import BytesIO
 import base64
+import time
+
+from aggregates import get_aggregates
+from charts import cached_figure, downsample, figure_cache, render_mode
+from compact import compact_frame
+from dates import normalize_dates, parsed_column_name, row_date, source_columns
+from deadlines import get_deadlines
+from derived import dataset_version, get_derived_frame
+from export import excel_exporter, summary_rows
+from facets import get_facet_index, with_count
+from insights import insight_engine
+from pagination import get_sort_index, order_key, page_count, page_orders, page_slice
+from http_client import http_client
+from sheet_fetch import csv_export_url, sheet_client, sheet_id_from_url
+from refresher import get_refresher
+from registry import dataset_registry
+from search_index import get_search_index
+from schema import GRANT_SCHEMA, apply_schema, has_drift, read_csv_dtypes
+from snapshots import snapshot_store
 
 # Page configuration
 st.set_page_config(
@@ -270,13 +288,10 @@ st.markdown("""
 def load_google_sheets_data(sheet_url):
     """Load data from Google Sheets with enhanced error handling"""
     try:
-        if 'docs.google.com/spreadsheets' in sheet_url:
-            # Extract sheet ID from URL
-            sheet_id = sheet_url.split('/d/')[1].split('/')[0]
-            csv_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv"
-            
+        sheet_id = sheet_id_from_url(sheet_url)
+        if sheet_id:
             # Load data with error handling
-            df = pd.read_csv(csv_url)
+            df = sheet_client.fetch_csv(csv_export_url(sheet_id), dtype=read_csv_dtypes(GRANT_SCHEMA))
             
             # Data validation
             if df.empty:
@@ -284,6 +299,7 @@ def load_google_sheets_data(sheet_url):
                 return create_sample_data()
             
             st.success(f"✅ Successfully loaded {len(df)} grants from Google Sheets!")
+            st.session_state['snapshot'] = snapshot_store.save(df, source=sheet_url, version=dataset_version(df))
             return df
         else:
             st.error("Invalid Google Sheets URL format")
@@ -293,6 +309,76 @@ def load_google_sheets_data(sheet_url):
         st.info("Loading comprehensive sample data for demonstration...")
         return create_sample_data()
 
+def sheet_refresher(sheet_url, version=None):
+    """Return the background refresher that keeps sheet_url's data and snapshot current.
+
+    version is that of the data already snapshotted, so reloading it saves nothing.
+    """
+    def fetch_sheet():
+        df = sheet_client.fetch_csv(
+            csv_export_url(sheet_id_from_url(sheet_url)), dtype=read_csv_dtypes(GRANT_SCHEMA)
+        )
+        if df.empty:
+            raise ValueError("Google Sheet is empty")
+        return df
+    
+    return get_refresher(
+        sheet_url,
+        fetch_sheet,
+        on_change=lambda df, version: snapshot_store.save(df, source=sheet_url, version=version),
+        version=version
+    )
+
+def load_latest_snapshot():
+    """Put the newest on-disk snapshot in session state"""
+    snapshot_df, snapshot = snapshot_store.load_latest()
+    if snapshot_df is None:
+        return False
+    
+    prepare_grant_data(snapshot_df)
+    st.session_state['snapshot'] = snapshot
+    return True
+
+def swap_in_refreshed_data():
+    """Serve the current data, swapping in the refresher's newer copy once it is ready"""
+    snapshot = st.session_state.get('snapshot') or {}
+    source = snapshot.get('source')
+    if not source:
+        return None
+    
+    refresher = sheet_refresher(source, snapshot.get('version'))
+    refreshed_df, version, _ = refresher.current()
+    if version is not None and version != st.session_state.get('refresh_version'):
+        prepare_grant_data(refreshed_df)
+        st.session_state['refresh_version'] = version
+    return refresher.status()
+
+def _prepare_grant_frame(df):
+    """Normalize raw grant data so every view reads typed columns"""
+    df, schema_report = apply_schema(df, GRANT_SCHEMA)
+    df, date_report = normalize_dates(df)
+    df, memory_report = compact_frame(df)
+    return df, {
+        'schema_report': schema_report,
+        'date_report': date_report,
+        'memory_report': memory_report
+    }
+
+def prepare_grant_data(df):
+    """Register freshly loaded grant data and point this session at the shared copy"""
+    version = dataset_registry.register(df, prepare=_prepare_grant_frame)
+    st.session_state['df_version'] = version
+    # Pins the shared copy for as long as this session uses it
+    st.session_state['df_lease'] = dataset_registry.lease(version)
+    st.session_state.update(dataset_registry.info(version))
+    return version
+
+def current_grant_data():
+    """Return this session's view of the shared grant data, or None if it has none"""
+    version = st.session_state.get('df_version')
+    return dataset_registry.get(version) if version else None
+
+@st.cache_data
 def create_sample_data():
     """Create comprehensive sample data with all Airtable fields"""
     grant_types = [
@@ -352,128 +438,19 @@ def create_sample_data():
     
     return pd.DataFrame(data)
 
-def safe_date_parse(date_str):
-    """Safely parse date strings with multiple format support"""
-    if pd.isna(date_str) or date_str is None or date_str == '':
-        return None
-    
-    date_formats = ["%Y-%m-%d", "%m/%d/%Y", "%d/%m/%Y", "%Y-%m-%d %H:%M:%S"]
-    
-    for fmt in date_formats:
-        try:
-            return datetime.strptime(str(date_str), fmt)
-        except (ValueError, TypeError):
-            continue
-    
-    return None
+def generate_insights(df, version=None):
+    """Generate intelligent insights from the data, reusing results whose columns are unchanged"""
+    return insight_engine.run(df, version)
 
-def calculate_grant_score(grant_data):
-    """Calculate a comprehensive grant opportunity score"""
-    score = 0
-    max_score = 100
-    
-    # Eligibility (30 points)
-    if grant_data['Eligibility'] == 'Yes':
-        score += 30
-    
-    # Status (20 points)
-    status_scores = {'Interested': 20, 'Under Review': 15, 'New': 10, 'Not Interested': 0}
-    score += status_scores.get(grant_data['Status'], 0)
-    
-    # Deadline urgency (20 points)
-    response_date = safe_date_parse(grant_data['Response Date'])
-    if response_date:
-        days_left = (response_date - datetime.now()).days
-        if days_left > 90:
-            score += 20
-        elif days_left > 30:
-            score += 15
-        elif days_left > 7:
-            score += 10
-        else:
-            score += 5
-    
-    # Funding amount (30 points)
-    funding = grant_data['Funding']
-    if funding >= 1000000:
-        score += 30
-    elif funding >= 500000:
-        score += 25
-    elif funding >= 250000:
-        score += 20
-    elif funding >= 100000:
-        score += 15
-    else:
-        score += 10
-    
-    return min(score, max_score)
-
-def generate_insights(df):
-    """Generate intelligent insights from the data"""
-    insights = []
-    
-    # Funding insights
-    total_funding = df['Funding'].sum()
-    avg_funding = df['Funding'].mean()
-    insights.append(f"💰 Total available funding across all grants: ${total_funding:,.0f}")
-    insights.append(f"📊 Average grant size: ${avg_funding:,.0f}")
-    
-    # Eligibility insights
-    eligible_count = len(df[df['Eligibility'] == 'Yes'])
-    eligibility_rate = (eligible_count / len(df)) * 100
-    insights.append(f"✅ {eligible_count} grants ({eligibility_rate:.1f}%) match your eligibility criteria")
-    
-    # Urgency insights
-    urgent_grants = []
-    for _, grant in df.iterrows():
-        response_date = safe_date_parse(grant['Response Date'])
-        if response_date:
-            days_left = (response_date - datetime.now()).days
-            if days_left < 14:
-                urgent_grants.append(grant['Title'])
-    
-    if urgent_grants:
-        insights.append(f"🚨 {len(urgent_grants)} grants have deadlines within 2 weeks!")
-    
-    # Status insights
-    interested_count = len(df[df['Status'] == 'Interested'])
-    insights.append(f"⭐ {interested_count} grants marked as 'Interested' - high priority opportunities")
-    
-    # Agency insights
-    top_agency = df['Agency'].value_counts().head(1)
-    if not top_agency.empty:
-        insights.append(f"🏛️ Most active agency: {top_agency.index[0]} with {top_agency.values[0]} grant opportunities")
-    
-    return insights
-
-def create_excel_download(df):
-    """Create downloadable Excel file with formatted data"""
-    output = BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df.to_excel(writer, sheet_name='All Grants', index=False)
-        
-        # Create summary sheet
-        summary_data = {
-            'Metric': ['Total Grants', 'Total Funding', 'Average Funding', 'Eligible Grants', 'Interested Grants'],
-            'Value': [
-                len(df),
-                f"${df['Funding'].sum():,.0f}",
-                f"${df['Funding'].mean():,.0f}",
-                len(df[df['Eligibility'] == 'Yes']),
-                len(df[df['Status'] == 'Interested'])
-            ]
-        }
-        summary_df = pd.DataFrame(summary_data)
-        summary_df.to_excel(writer, sheet_name='Summary', index=False)
-    
-    output.seek(0)
-    return output
+def create_excel_download(df, aggregates):
+    """Stream df and a summary from its aggregates into an Excel workbook and return its bytes"""
+    return excel_exporter.download(df, summary_rows(aggregates))
 
 def display_grant_card(grant_data):
     """Display comprehensive grant information as an enhanced card"""
     with st.container():
         # Calculate grant score
-        grant_score = calculate_grant_score(grant_data)
+        grant_score = grant_data['Opportunity Score']
         
         st.markdown(f"""
         <div class="grant-card">
@@ -499,543 +476,561 @@ def display_grant_card(grant_data):
         status_class = f"status-{grant_data['Status'].lower().replace(' ', '-')}"
         st.markdown(f'<div style="text-align: center; margin: 1rem 0;"><span class="{status_class}">{grant_data["Status"]}</span></div>', unsafe_allow_html=True)
         
-        # Create enhanced tabs for different sections
-        tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs([
-            "📋 Overview", 
-            "💰 Funding Details", 
-            "📅 Timeline & Deadlines", 
-            "🏢 Agency Info", 
-            "👥 Client Details", 
-            "📊 Analytics",
-            "💡 Recommendations"
-        ])
-        
-        with tab1:
-            st.markdown('<div class="tab-container">', unsafe_allow_html=True)
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                st.markdown(f"""
-                <div class="field-container">
-                    <div class="field-label">Grant Type</div>
-                    <div class="field-value">{grant_data["Grant Type"]}</div>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                st.markdown(f"""
-                <div class="field-container">
-                    <div class="field-label">Duration</div>
-                    <div class="field-value">{grant_data["Duration"]}</div>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                eligibility_color = "#27ae60" if grant_data["Eligibility"] == "Yes" else "#e74c3c"
-                eligibility_icon = "✅" if grant_data["Eligibility"] == "Yes" else "❌"
-                st.markdown(f"""
-                <div class="field-container">
-                    <div class="field-label">Eligibility Status</div>
-                    <div class="field-value" style="background-color: {eligibility_color}; font-weight: bold;">
-                        {eligibility_icon} {grant_data["Eligibility"]}
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                if grant_data["Eligibility Notes"]:
-                    st.markdown(f"""
-                    <div class="field-container">
-                        <div class="field-label">Eligibility Requirements</div>
-                        <div class="field-value">{grant_data["Eligibility Notes"]}</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-            
-            with col2:
-                st.markdown(f"""
-                <div class="field-container">
-                    <div class="field-label">Project Goal</div>
-                    <div class="field-value">{grant_data["Goal"]}</div>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                st.markdown(f"""
-                <div class="field-container">
-                    <div class="field-label">Success Criteria</div>
-                    <div class="field-value">{grant_data["Success Criteria"]}</div>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                if grant_data["Notes"]:
-                    st.markdown(f"""
-                    <div class="field-container">
-                        <div class="field-label">Additional Notes</div>
-                        <div class="field-value">{grant_data["Notes"]}</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-            
-            # URL with enhanced styling
-            st.markdown(f"""
-            <div class="field-container">
-                <div class="field-label">Application Portal</div>
-                <div class="field-value">
-                    <a href="{grant_data["URL"]}" target="_blank" style="color: #fff; text-decoration: none; font-weight: bold;">
-                        🔗 {grant_data["URL"]}
-                    </a>
-                </div>
+        # Only the open section is built; the others cost nothing until selected
+        section = st.radio(
+            "Section",
+            list(GRANT_CARD_SECTIONS),
+            horizontal=True,
+            key=f"card_section_{grant_data.name}",
+            label_visibility="collapsed"
+        )
+        GRANT_CARD_SECTIONS[section](grant_data)
+
+def _card_overview(grant_data):
+    """Overview section: type, eligibility, goal and notes"""
+    st.markdown('<div class="tab-container">', unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown(f"""
+        <div class="field-container">
+            <div class="field-label">Grant Type</div>
+            <div class="field-value">{grant_data["Grant Type"]}</div>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        st.markdown(f"""
+        <div class="field-container">
+            <div class="field-label">Duration</div>
+            <div class="field-value">{grant_data["Duration"]}</div>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        eligibility_color = "#27ae60" if grant_data["Eligibility"] == "Yes" else "#e74c3c"
+        eligibility_icon = "✅" if grant_data["Eligibility"] == "Yes" else "❌"
+        st.markdown(f"""
+        <div class="field-container">
+            <div class="field-label">Eligibility Status</div>
+            <div class="field-value" style="background-color: {eligibility_color}; font-weight: bold;">
+                {eligibility_icon} {grant_data["Eligibility"]}
             </div>
-            """, unsafe_allow_html=True)
-            
-            st.markdown('</div>', unsafe_allow_html=True)
+        </div>
+        """, unsafe_allow_html=True)
         
-        with tab2:
-            st.markdown('<div class="tab-container">', unsafe_allow_html=True)
-            
-            # Enhanced funding metrics
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.markdown(f"""
-                <div class="metric-card">
-                    <div class="metric-value">${grant_data['Funding']:,}</div>
-                    <div class="metric-label">Target Funding</div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with col2:
-                st.markdown(f"""
-                <div class="metric-card">
-                    <div class="metric-value">${grant_data['Award Ceiling']:,}</div>
-                    <div class="metric-label">Maximum Award</div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with col3:
-                st.markdown(f"""
-                <div class="metric-card">
-                    <div class="metric-value">${grant_data['Award Floor']:,}</div>
-                    <div class="metric-label">Minimum Award</div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            # Funding range visualization
-            funding_range = grant_data['Award Ceiling'] - grant_data['Award Floor']
-            target_position = ((grant_data['Funding'] - grant_data['Award Floor']) / funding_range) * 100 if funding_range > 0 else 50
-            
+        if pd.notna(grant_data["Eligibility Notes"]) and grant_data["Eligibility Notes"]:
             st.markdown(f"""
-            <div class="funding-highlight">
-                💡 Funding Range: ${grant_data['Award Floor']:,} - ${grant_data['Award Ceiling']:,}
-                <br>Target Position: {target_position:.1f}% of range
-                <br>Potential ROI: High Value Opportunity
+            <div class="field-container">
+                <div class="field-label">Eligibility Requirements</div>
+                <div class="field-value">{grant_data["Eligibility Notes"]}</div>
             </div>
             """, unsafe_allow_html=True)
-            
-            # Enhanced funding visualization
-            funding_data = pd.DataFrame({
-                'Type': ['Minimum Award', 'Target Funding', 'Maximum Award'],
-                'Amount': [grant_data['Award Floor'], grant_data['Funding'], grant_data['Award Ceiling']],
-            })
-            fig = px.bar(funding_data, x='Type', y='Amount', 
-                        title="Funding Structure Breakdown",
-                        color='Type',
-                        color_discrete_map={
-                            'Minimum Award': '#e74c3c',
-                            'Target Funding': '#f39c12',
-                            'Maximum Award': '#27ae60'
-                        })
-            fig.update_layout(
-                showlegend=False, 
-                plot_bgcolor='rgba(0,0,0,0)', 
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(size=12)
-            )
-            st.plotly_chart(fig, use_container_width=True)
-            
-            # Funding distribution gauge
-            fig_gauge = go.Figure(go.Indicator(
-                mode="gauge+number+delta",
-                value=grant_data['Funding'],
-                domain={'x': [0, 1], 'y': [0, 1]},
-                title={'text': "Target Funding Position"},
-                delta={'reference': grant_data['Award Floor']},
-                gauge={
-                    'axis': {'range': [None, grant_data['Award Ceiling']]},
-                    'bar': {'color': "#667eea"},
-                    'steps': [
-                        {'range': [grant_data['Award Floor'], grant_data['Funding']], 'color': "lightgray"},
-                        {'range': [grant_data['Funding'], grant_data['Award Ceiling']], 'color': "white"}
-                    ],
-                    'threshold': {
-                        'line': {'color': "red", 'width': 4},
-                        'thickness': 0.75,
-                        'value': grant_data['Award Ceiling'] * 0.9
-                    }
-                }
-            ))
-            fig_gauge.update_layout(
-                paper_bgcolor='rgba(0,0,0,0)',
-                plot_bgcolor='rgba(0,0,0,0)',
-                height=300
-            )
-            st.plotly_chart(fig_gauge, use_container_width=True)
-            
-            st.markdown('</div>', unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown(f"""
+        <div class="field-container">
+            <div class="field-label">Project Goal</div>
+            <div class="field-value">{grant_data["Goal"]}</div>
+        </div>
+        """, unsafe_allow_html=True)
         
-        with tab3:
-            st.markdown('<div class="tab-container">', unsafe_allow_html=True)
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                st.markdown(f"""
-                <div class="field-container">
-                    <div class="field-label">Posted Date</div>
-                    <div class="field-value">📅 {grant_data["Posted Date"]}</div>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                st.markdown(f"""
-                <div class="field-container">
-                    <div class="field-label">Created</div>
-                    <div class="field-value">🕐 {grant_data["Created"]}</div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with col2:
-                # Enhanced deadline display with urgency indicators
-                response_date = safe_date_parse(grant_data["Response Date"])
-                if response_date:
-                    days_left = (response_date - datetime.now()).days
-                    
-                    if days_left < 7:
-                        deadline_class = "deadline-urgent"
-                        urgency_icon = "🚨"
-                        urgency_text = "URGENT - IMMEDIATE ACTION REQUIRED"
-                    elif days_left < 30:
-                        deadline_class = "deadline-warning"
-                        urgency_icon = "⚠️"
-                        urgency_text = "WARNING - DEADLINE APPROACHING"
-                    else:
-                        deadline_class = "deadline-safe"
-                        urgency_icon = "✅"
-                        urgency_text = "AMPLE TIME AVAILABLE"
-                    
-                    st.markdown(f"""
-                    <div class="{deadline_class}">
-                        {urgency_icon} {urgency_text}<br>
-                        Response Due: {grant_data["Response Date"]}<br>
-                        <strong>{days_left} days remaining</strong>
-                    </div>
-                    """, unsafe_allow_html=True)
-                else:
-                    st.markdown(f"""
-                    <div class="field-container">
-                        <div class="field-label">Response Date</div>
-                        <div class="field-value">📅 {grant_data["Response Date"]}</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                st.markdown(f"""
-                <div class="field-container">
-                    <div class="field-label">Last Modified</div>
-                    <div class="field-value">🔄 {grant_data["Last Modified"]}</div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            # Timeline visualization
-            if response_date:
-                posted_date = safe_date_parse(grant_data["Posted Date"])
-                if posted_date:
-                    total_days = (response_date - posted_date).days
-                    elapsed_days = (datetime.now() - posted_date).days
-                    progress_percentage = (elapsed_days / total_days * 100) if total_days > 0 else 0
-                    
-                    st.markdown(f"""
-                    <div class="field-container">
-                        <div class="field-label">Application Window Progress</div>
-                        <div class="progress-bar">
-                            <div class="progress-fill" style="width: {progress_percentage}%"></div>
-                        </div>
-                        <div style="text-align: center; color: white; margin-top: 0.5rem;">
-                            {progress_percentage:.1f}% of application period elapsed
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    # Timeline visualization
-                    timeline_data = pd.DataFrame({
-                        'Stage': ['Posted', 'Current', 'Deadline'],
-                        'Date': [posted_date, datetime.now(), response_date],
-                        'Days': [0, elapsed_days, total_days]
-                    })
-                    
-                    fig_timeline = px.scatter(timeline_data, x='Days', y=[1, 1, 1], 
-                                             size=[15, 15, 15], 
-                                             color='Stage',
-                                             title="Grant Application Timeline",
-                                             text='Stage',
-                                             color_discrete_map={
-                                                 'Posted': '#3498db',
-                                                 'Current': '#f39c12',
-                                                 'Deadline': '#e74c3c'
-                                             })
-                    fig_timeline.update_traces(textposition='top center')
-                    fig_timeline.update_layout(
-                        showlegend=False,
-                        yaxis={'visible': False},
-                        plot_bgcolor='rgba(0,0,0,0)',
-                        paper_bgcolor='rgba(0,0,0,0)',
-                        height=200
-                    )
-                    st.plotly_chart(fig_timeline, use_container_width=True)
-            
-            st.markdown('</div>', unsafe_allow_html=True)
+        st.markdown(f"""
+        <div class="field-container">
+            <div class="field-label">Success Criteria</div>
+            <div class="field-value">{grant_data["Success Criteria"]}</div>
+        </div>
+        """, unsafe_allow_html=True)
         
-        with tab4:
-            st.markdown('<div class="tab-container">', unsafe_allow_html=True)
-            
+        if grant_data["Notes"]:
             st.markdown(f"""
-            <div class="contact-card">
-                <h3 style="margin-bottom: 1rem;">🏛️ Granting Agency Information</h3>
-                <div style="font-size: 1.5rem; font-weight: bold; margin-bottom: 1rem;">{grant_data["Agency"]}</div>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                st.markdown(f"""
-                <div class="field-container">
-                    <div class="field-label">📧 Email Contact</div>
-                    <div class="field-value">
-                        <a href="mailto:{grant_data['Agency Email']}" style="color: white; text-decoration: none;">
-                            {grant_data['Agency Email']}
-                        </a>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with col2:
-                st.markdown(f"""
-                <div class="field-container">
-                    <div class="field-label">📞 Phone Number</div>
-                    <div class="field-value">{grant_data["Agency Phone"]}</div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            st.markdown("""
-            <div class="recommendation-card">
-                <strong>💡 Best Practices for Agency Contact:</strong><br>
-                • Prepare specific questions before reaching out<br>
-                • Reference the opportunity number in all communications<br>
-                • Keep a log of all interactions<br>
-                • Follow up within 48 hours of initial contact<br>
-                • Request clarification on eligibility criteria if needed
+            <div class="field-container">
+                <div class="field-label">Additional Notes</div>
+                <div class="field-value">{grant_data["Notes"]}</div>
             </div>
             """, unsafe_allow_html=True)
-            
-            st.markdown('</div>', unsafe_allow_html=True)
+    
+    # URL with enhanced styling
+    st.markdown(f"""
+    <div class="field-container">
+        <div class="field-label">Application Portal</div>
+        <div class="field-value">
+            <a href="{grant_data["URL"]}" target="_blank" style="color: #fff; text-decoration: none; font-weight: bold;">
+                🔗 {grant_data["URL"]}
+            </a>
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+
+def _card_funding(grant_data):
+    """Funding section: award range and funding charts"""
+    st.markdown('<div class="tab-container">', unsafe_allow_html=True)
+    
+    # Enhanced funding metrics
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.markdown(f"""
+        <div class="metric-card">
+            <div class="metric-value">${grant_data['Funding']:,}</div>
+            <div class="metric-label">Target Funding</div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown(f"""
+        <div class="metric-card">
+            <div class="metric-value">${grant_data['Award Ceiling']:,}</div>
+            <div class="metric-label">Maximum Award</div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col3:
+        st.markdown(f"""
+        <div class="metric-card">
+            <div class="metric-value">${grant_data['Award Floor']:,}</div>
+            <div class="metric-label">Minimum Award</div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    # Funding range visualization
+    funding_range = grant_data['Award Ceiling'] - grant_data['Award Floor']
+    target_position = ((grant_data['Funding'] - grant_data['Award Floor']) / funding_range) * 100 if funding_range > 0 else 50
+    
+    st.markdown(f"""
+    <div class="funding-highlight">
+        💡 Funding Range: ${grant_data['Award Floor']:,} - ${grant_data['Award Ceiling']:,}
+        <br>Target Position: {target_position:.1f}% of range
+        <br>Potential ROI: High Value Opportunity
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Enhanced funding visualization
+    funding_data = pd.DataFrame({
+        'Type': ['Minimum Award', 'Target Funding', 'Maximum Award'],
+        'Amount': [grant_data['Award Floor'], grant_data['Funding'], grant_data['Award Ceiling']],
+    })
+    fig = px.bar(funding_data, x='Type', y='Amount', 
+                title="Funding Structure Breakdown",
+                color='Type',
+                color_discrete_map={
+                    'Minimum Award': '#e74c3c',
+                    'Target Funding': '#f39c12',
+                    'Maximum Award': '#27ae60'
+                })
+    fig.update_layout(
+        showlegend=False, 
+        plot_bgcolor='rgba(0,0,0,0)', 
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(size=12)
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    
+    # Funding distribution gauge
+    fig_gauge = go.Figure(go.Indicator(
+        mode="gauge+number+delta",
+        value=grant_data['Funding'],
+        domain={'x': [0, 1], 'y': [0, 1]},
+        title={'text': "Target Funding Position"},
+        delta={'reference': grant_data['Award Floor']},
+        gauge={
+            'axis': {'range': [None, grant_data['Award Ceiling']]},
+            'bar': {'color': "#667eea"},
+            'steps': [
+                {'range': [grant_data['Award Floor'], grant_data['Funding']], 'color': "lightgray"},
+                {'range': [grant_data['Funding'], grant_data['Award Ceiling']], 'color': "white"}
+            ],
+            'threshold': {
+                'line': {'color': "red", 'width': 4},
+                'thickness': 0.75,
+                'value': grant_data['Award Ceiling'] * 0.9
+            }
+        }
+    ))
+    fig_gauge.update_layout(
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        height=300
+    )
+    st.plotly_chart(fig_gauge, use_container_width=True)
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+
+def _card_timeline(grant_data):
+    """Timeline section: dates and deadline countdown"""
+    st.markdown('<div class="tab-container">', unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown(f"""
+        <div class="field-container">
+            <div class="field-label">Posted Date</div>
+            <div class="field-value">📅 {grant_data["Posted Date"]}</div>
+        </div>
+        """, unsafe_allow_html=True)
         
-        with tab5:
-            st.markdown('<div class="tab-container">', unsafe_allow_html=True)
+        st.markdown(f"""
+        <div class="field-container">
+            <div class="field-label">Created</div>
+            <div class="field-value">🕐 {grant_data["Created"]}</div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col2:
+        # Enhanced deadline display with urgency indicators
+        response_date = row_date(grant_data, "Response Date")
+        if response_date:
+            days_left = (response_date - datetime.now()).days
+            
+            if days_left < 7:
+                deadline_class = "deadline-urgent"
+                urgency_icon = "🚨"
+                urgency_text = "URGENT - IMMEDIATE ACTION REQUIRED"
+            elif days_left < 30:
+                deadline_class = "deadline-warning"
+                urgency_icon = "⚠️"
+                urgency_text = "WARNING - DEADLINE APPROACHING"
+            else:
+                deadline_class = "deadline-safe"
+                urgency_icon = "✅"
+                urgency_text = "AMPLE TIME AVAILABLE"
             
             st.markdown(f"""
-            <div class="contact-card">
-                <h3 style="margin-bottom: 1rem;">👥 Client & Business Information</h3>
+            <div class="{deadline_class}">
+                {urgency_icon} {urgency_text}<br>
+                Response Due: {grant_data["Response Date"]}<br>
+                <strong>{days_left} days remaining</strong>
             </div>
             """, unsafe_allow_html=True)
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                st.markdown(f"""
-                <div class="field-container">
-                    <div class="field-label">Client Name</div>
-                    <div class="field-value">{grant_data["client"]}</div>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                st.markdown(f"""
-                <div class="field-container">
-                    <div class="field-label">Business Name</div>
-                    <div class="field-value">{grant_data["Business"]}</div>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                st.markdown(f"""
-                <div class="field-container">
-                    <div class="field-label">Email</div>
-                    <div class="field-value">
-                        <a href="mailto:{grant_data['Email']}" style="color: white; text-decoration: none;">
-                            {grant_data['Email']}
-                        </a>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                st.markdown(f"""
-                <div class="field-container">
-                    <div class="field-label">Phone</div>
-                    <div class="field-value">{grant_data["phone number"]}</div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with col2:
-                st.markdown(f"""
-                <div class="field-container">
-                    <div class="field-label">Industry</div>
-                    <div class="field-value">{grant_data["Industry"]}</div>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                st.markdown(f"""
-                <div class="field-container">
-                    <div class="field-label">NAICS Code</div>
-                    <div class="field-value">{grant_data["NSIC code"]}</div>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                st.markdown(f"""
-                <div class="field-container">
-                    <div class="field-label">Location</div>
-                    <div class="field-value">{grant_data["State"]}, {grant_data["Country"]}</div>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                st.markdown(f"""
-                <div class="field-container">
-                    <div class="field-label">Address</div>
-                    <div class="field-value">{grant_data["Address"]}</div>
-                </div>
-                """, unsafe_allow_html=True)
-            
+        else:
             st.markdown(f"""
             <div class="field-container">
-                <div class="field-label">Business Summary</div>
-                <div class="field-value">{grant_data["Summary"]}</div>
+                <div class="field-label">Response Date</div>
+                <div class="field-value">📅 {grant_data["Response Date"]}</div>
             </div>
             """, unsafe_allow_html=True)
-            
-            st.markdown('</div>', unsafe_allow_html=True)
         
-        with tab6:
-            st.markdown('<div class="tab-container">', unsafe_allow_html=True)
-            
-            st.subheader("📊 Grant Opportunity Analytics")
-            
-            # Competitive analysis
-            col1, col2 = st.columns(2)
-            with col1:
-                # Score breakdown
-                score_breakdown = {
-                    'Eligibility': 30 if grant_data['Eligibility'] == 'Yes' else 0,
-                    'Status Priority': 20 if grant_data['Status'] == 'Interested' else 10,
-                    'Deadline Factor': 15,
-                    'Funding Level': 25
-                }
-                
-                fig_breakdown = px.pie(
-                    values=list(score_breakdown.values()),
-                    names=list(score_breakdown.keys()),
-                    title="Opportunity Score Breakdown"
-                )
-                fig_breakdown.update_layout(
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(0,0,0,0)'
-                )
-                st.plotly_chart(fig_breakdown, use_container_width=True)
-            
-            with col2:
-                # Funding comparison
-                funding_comparison = pd.DataFrame({
-                    'Metric': ['Floor', 'Target', 'Ceiling', 'Median'],
-                    'Value': [
-                        grant_data['Award Floor'],
-                        grant_data['Funding'],
-                        grant_data['Award Ceiling'],
-                        (grant_data['Award Floor'] + grant_data['Award Ceiling']) / 2
-                    ]
-                })
-                
-                fig_comp = px.bar(funding_comparison, x='Metric', y='Value',
-                                 title="Funding Metrics Comparison",
-                                 color='Metric')
-                fig_comp.update_layout(
-                    showlegend=False,
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(0,0,0,0)'
-                )
-                st.plotly_chart(fig_comp, use_container_width=True)
+        st.markdown(f"""
+        <div class="field-container">
+            <div class="field-label">Last Modified</div>
+            <div class="field-value">🔄 {grant_data["Last Modified"]}</div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    # Timeline visualization
+    if response_date:
+        posted_date = row_date(grant_data, "Posted Date")
+        if posted_date:
+            total_days = (response_date - posted_date).days
+            elapsed_days = (datetime.now() - posted_date).days
+            progress_percentage = (elapsed_days / total_days * 100) if total_days > 0 else 0
             
-            # Success probability indicator
-            success_prob = min((grant_score / 100) * 100, 95)
             st.markdown(f"""
-            <div class="insight-card">
-                <h3>🎯 Success Probability Analysis</h3>
-                <div style="font-size: 3rem; font-weight: bold; text-align: center; margin: 1rem 0;">
-                    {success_prob:.1f}%
+            <div class="field-container">
+                <div class="field-label">Application Window Progress</div>
+                <div class="progress-bar">
+                    <div class="progress-fill" style="width: {progress_percentage}%"></div>
                 </div>
-                <div style="text-align: center;">
-                    Based on eligibility, timing, funding level, and strategic fit
+                <div style="text-align: center; color: white; margin-top: 0.5rem;">
+                    {progress_percentage:.1f}% of application period elapsed
                 </div>
             </div>
             """, unsafe_allow_html=True)
             
-            st.markdown('</div>', unsafe_allow_html=True)
-        
-        with tab7:
-            st.markdown('<div class="tab-container">', unsafe_allow_html=True)
-            
-            st.subheader("💡 Strategic Recommendations")
-            
-            # Generate personalized recommendations
-            recommendations = []
-            
-            if grant_data['Eligibility'] == 'Yes':
-                recommendations.append("✅ <strong>Eligibility Confirmed:</strong> You meet the basic requirements. Priority: HIGH")
-            else:
-                recommendations.append("⚠️ <strong>Eligibility Issue:</strong> Review requirements carefully or consider partnership opportunities")
-            
-            response_date = safe_date_parse(grant_data['Response Date'])
-            if response_date:
-                days_left = (response_date - datetime.now()).days
-                if days_left < 14:
-                    recommendations.append(f"🚨 <strong>Urgent Action Required:</strong> Only {days_left} days until deadline - start application immediately")
-                elif days_left < 30:
-                    recommendations.append(f"⚠️ <strong>Time Sensitive:</strong> {days_left} days remaining - begin preparation this week")
-                else:
-                    recommendations.append(f"✅ <strong>Good Timeline:</strong> {days_left} days available - plan thoroughly")
-            
-            if grant_data['Funding'] >= 1000000:
-                recommendations.append("💰 <strong>High-Value Opportunity:</strong> Significant funding available - consider assembling a strong team")
-            elif grant_data['Funding'] >= 500000:
-                recommendations.append("💵 <strong>Substantial Funding:</strong> Mid-tier opportunity with good potential ROI")
-            
-            if grant_data['Status'] == 'Interested':
-                recommendations.append("⭐ <strong>Previously Flagged:</strong> This grant is marked as interested - review and take action")
-            elif grant_data['Status'] == 'New':
-                recommendations.append("🆕 <strong>New Opportunity:</strong> Recently discovered - evaluate fit and update status")
-            
-            # Display recommendations
-            for i, rec in enumerate(recommendations, 1):
-                st.markdown(f"""
-                <div class="recommendation-card">
-                    <div style="font-size: 1.2rem; margin-bottom: 0.5rem;"><strong>Recommendation #{i}</strong></div>
-                    <div>{rec}</div>
-                </div>
-                """, unsafe_allow_html=True)
+            # Timeline visualization
+            timeline_data = pd.DataFrame({
+                'Stage': ['Posted', 'Current', 'Deadline'],
+                'Date': [posted_date, datetime.now(), response_date],
+                'Days': [0, elapsed_days, total_days]
+            })
             
-            # Action checklist
-            st.markdown("""
-            <div class="insight-card">
-                <h3>📋 Pre-Application Checklist</h3>
-                <ul style="text-align: left; margin: 1rem 0;">
-                    <li>Review full RFP and eligibility requirements</li>
-                    <li>Assess organizational capacity and resources</li>
-                    <li>Identify potential partners or collaborators</li>
-                    <li>Draft preliminary project narrative</li>
-                    <li>Prepare required documentation</li>
-                    <li>Review budget requirements and constraints</li>
-                    <li>Contact agency for clarification if needed</li>
-                    <li>Set internal deadlines (1-2 weeks before submission)</li>
-                </ul>
+            fig_timeline = px.scatter(timeline_data, x='Days', y=[1, 1, 1], 
+                                     size=[15, 15, 15], 
+                                     color='Stage',
+                                     title="Grant Application Timeline",
+                                     text='Stage',
+                                     color_discrete_map={
+                                         'Posted': '#3498db',
+                                         'Current': '#f39c12',
+                                         'Deadline': '#e74c3c'
+                                     })
+            fig_timeline.update_traces(textposition='top center')
+            fig_timeline.update_layout(
+                showlegend=False,
+                yaxis={'visible': False},
+                plot_bgcolor='rgba(0,0,0,0)',
+                paper_bgcolor='rgba(0,0,0,0)',
+                height=200
+            )
+            st.plotly_chart(fig_timeline, use_container_width=True)
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+
+def _card_agency(grant_data):
+    """Agency section: agency contact details"""
+    st.markdown('<div class="tab-container">', unsafe_allow_html=True)
+    
+    st.markdown(f"""
+    <div class="contact-card">
+        <h3 style="margin-bottom: 1rem;">🏛️ Granting Agency Information</h3>
+        <div style="font-size: 1.5rem; font-weight: bold; margin-bottom: 1rem;">{grant_data["Agency"]}</div>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown(f"""
+        <div class="field-container">
+            <div class="field-label">📧 Email Contact</div>
+            <div class="field-value">
+                <a href="mailto:{grant_data['Agency Email']}" style="color: white; text-decoration: none;">
+                    {grant_data['Agency Email']}
+                </a>
             </div>
-            """, unsafe_allow_html=True)
-            
-            st.markdown('</div>', unsafe_allow_html=True)
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown(f"""
+        <div class="field-container">
+            <div class="field-label">📞 Phone Number</div>
+            <div class="field-value">{grant_data["Agency Phone"]}</div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    st.markdown("""
+    <div class="recommendation-card">
+        <strong>💡 Best Practices for Agency Contact:</strong><br>
+        • Prepare specific questions before reaching out<br>
+        • Reference the opportunity number in all communications<br>
+        • Keep a log of all interactions<br>
+        • Follow up within 48 hours of initial contact<br>
+        • Request clarification on eligibility criteria if needed
+    </div>
+    """, unsafe_allow_html=True)
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+
+def _card_client(grant_data):
+    """Client section: client and business details"""
+    st.markdown('<div class="tab-container">', unsafe_allow_html=True)
+    
+    st.markdown(f"""
+    <div class="contact-card">
+        <h3 style="margin-bottom: 1rem;">👥 Client & Business Information</h3>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown(f"""
+        <div class="field-container">
+            <div class="field-label">Client Name</div>
+            <div class="field-value">{grant_data["client"]}</div>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        st.markdown(f"""
+        <div class="field-container">
+            <div class="field-label">Business Name</div>
+            <div class="field-value">{grant_data["Business"]}</div>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        st.markdown(f"""
+        <div class="field-container">
+            <div class="field-label">Email</div>
+            <div class="field-value">
+                <a href="mailto:{grant_data['Email']}" style="color: white; text-decoration: none;">
+                    {grant_data['Email']}
+                </a>
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        st.markdown(f"""
+        <div class="field-container">
+            <div class="field-label">Phone</div>
+            <div class="field-value">{grant_data["phone number"]}</div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown(f"""
+        <div class="field-container">
+            <div class="field-label">Industry</div>
+            <div class="field-value">{grant_data["Industry"]}</div>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        st.markdown(f"""
+        <div class="field-container">
+            <div class="field-label">NAICS Code</div>
+            <div class="field-value">{grant_data["NSIC code"]}</div>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        st.markdown(f"""
+        <div class="field-container">
+            <div class="field-label">Location</div>
+            <div class="field-value">{grant_data["State"]}, {grant_data["Country"]}</div>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        st.markdown(f"""
+        <div class="field-container">
+            <div class="field-label">Address</div>
+            <div class="field-value">{grant_data["Address"]}</div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    st.markdown(f"""
+    <div class="field-container">
+        <div class="field-label">Business Summary</div>
+        <div class="field-value">{grant_data["Summary"]}</div>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+
+def _card_analytics(grant_data):
+    """Analytics section: score breakdown and funding comparison"""
+    grant_score = grant_data['Opportunity Score']
+    st.markdown('<div class="tab-container">', unsafe_allow_html=True)
+    
+    st.subheader("📊 Grant Opportunity Analytics")
+    
+    # Competitive analysis
+    col1, col2 = st.columns(2)
+    with col1:
+        # Score breakdown
+        score_breakdown = {
+            'Eligibility': 30 if grant_data['Eligibility'] == 'Yes' else 0,
+            'Status Priority': 20 if grant_data['Status'] == 'Interested' else 10,
+            'Deadline Factor': 15,
+            'Funding Level': 25
+        }
+        
+        fig_breakdown = px.pie(
+            values=list(score_breakdown.values()),
+            names=list(score_breakdown.keys()),
+            title="Opportunity Score Breakdown"
+        )
+        fig_breakdown.update_layout(
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)'
+        )
+        st.plotly_chart(fig_breakdown, use_container_width=True)
+    
+    with col2:
+        # Funding comparison
+        funding_comparison = pd.DataFrame({
+            'Metric': ['Floor', 'Target', 'Ceiling', 'Median'],
+            'Value': [
+                grant_data['Award Floor'],
+                grant_data['Funding'],
+                grant_data['Award Ceiling'],
+                (grant_data['Award Floor'] + grant_data['Award Ceiling']) / 2
+            ]
+        })
+        
+        fig_comp = px.bar(funding_comparison, x='Metric', y='Value',
+                         title="Funding Metrics Comparison",
+                         color='Metric')
+        fig_comp.update_layout(
+            showlegend=False,
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)'
+        )
+        st.plotly_chart(fig_comp, use_container_width=True)
+    
+    # Success probability indicator
+    success_prob = min((grant_score / 100) * 100, 95)
+    st.markdown(f"""
+    <div class="insight-card">
+        <h3>🎯 Success Probability Analysis</h3>
+        <div style="font-size: 3rem; font-weight: bold; text-align: center; margin: 1rem 0;">
+            {success_prob:.1f}%
+        </div>
+        <div style="text-align: center;">
+            Based on eligibility, timing, funding level, and strategic fit
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+
+def _card_recommendations(grant_data):
+    """Recommendations section: suggested next steps and checklist"""
+    st.markdown('<div class="tab-container">', unsafe_allow_html=True)
+    
+    st.subheader("💡 Strategic Recommendations")
+    
+    # Generate personalized recommendations
+    recommendations = []
+    
+    if grant_data['Eligibility'] == 'Yes':
+        recommendations.append("✅ <strong>Eligibility Confirmed:</strong> You meet the basic requirements. Priority: HIGH")
+    else:
+        recommendations.append("⚠️ <strong>Eligibility Issue:</strong> Review requirements carefully or consider partnership opportunities")
+    
+    response_date = row_date(grant_data, 'Response Date')
+    if response_date:
+        days_left = (response_date - datetime.now()).days
+        if days_left < 14:
+            recommendations.append(f"🚨 <strong>Urgent Action Required:</strong> Only {days_left} days until deadline - start application immediately")
+        elif days_left < 30:
+            recommendations.append(f"⚠️ <strong>Time Sensitive:</strong> {days_left} days remaining - begin preparation this week")
+        else:
+            recommendations.append(f"✅ <strong>Good Timeline:</strong> {days_left} days available - plan thoroughly")
+    
+    if grant_data['Funding'] >= 1000000:
+        recommendations.append("💰 <strong>High-Value Opportunity:</strong> Significant funding available - consider assembling a strong team")
+    elif grant_data['Funding'] >= 500000:
+        recommendations.append("💵 <strong>Substantial Funding:</strong> Mid-tier opportunity with good potential ROI")
+    
+    if grant_data['Status'] == 'Interested':
+        recommendations.append("⭐ <strong>Previously Flagged:</strong> This grant is marked as interested - review and take action")
+    elif grant_data['Status'] == 'New':
+        recommendations.append("🆕 <strong>New Opportunity:</strong> Recently discovered - evaluate fit and update status")
+    
+    # Display recommendations
+    for i, rec in enumerate(recommendations, 1):
+        st.markdown(f"""
+        <div class="recommendation-card">
+            <div style="font-size: 1.2rem; margin-bottom: 0.5rem;"><strong>Recommendation #{i}</strong></div>
+            <div>{rec}</div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    # Action checklist
+    st.markdown("""
+    <div class="insight-card">
+        <h3>📋 Pre-Application Checklist</h3>
+        <ul style="text-align: left; margin: 1rem 0;">
+            <li>Review full RFP and eligibility requirements</li>
+            <li>Assess organizational capacity and resources</li>
+            <li>Identify potential partners or collaborators</li>
+            <li>Draft preliminary project narrative</li>
+            <li>Prepare required documentation</li>
+            <li>Review budget requirements and constraints</li>
+            <li>Contact agency for clarification if needed</li>
+            <li>Set internal deadlines (1-2 weeks before submission)</li>
+        </ul>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+
+# Grant card sections in display order
+GRANT_CARD_SECTIONS = {
+    "📋 Overview": _card_overview,
+    "💰 Funding Details": _card_funding,
+    "📅 Timeline & Deadlines": _card_timeline,
+    "🏢 Agency Info": _card_agency,
+    "👥 Client Details": _card_client,
+    "📊 Analytics": _card_analytics,
+    "💡 Recommendations": _card_recommendations
+}
 
 def main():
     """Main application function with enhanced features"""
@@ -1061,13 +1056,15 @@ def main():
         
         if st.button("🔄 Load Data", type="primary"):
             if sheet_url:
-                st.session_state['df'] = load_google_sheets_data(sheet_url)
+                st.session_state['snapshot'] = None
+                prepare_grant_data(load_google_sheets_data(sheet_url))
             else:
                 st.warning("Please enter a Google Sheets URL")
         
         if st.button("📊 Load Sample Data"):
-            st.session_state['df'] = create_sample_data()
-            st.success(f"✅ Loaded {len(st.session_state['df'])} sample grants!")
+            st.session_state['snapshot'] = None
+            prepare_grant_data(create_sample_data())
+            st.success(f"✅ Loaded {len(current_grant_data())} sample grants!")
         
         st.divider()
         
@@ -1082,20 +1079,72 @@ def main():
         st.divider()
         
         # Quick stats in sidebar
-        if 'df' in st.session_state and not st.session_state['df'].empty:
-            df = st.session_state['df']
+        df = current_grant_data()
+        if df is not None and not df.empty:
             st.header("📊 Quick Stats")
             st.metric("Total Grants", len(df))
             st.metric("Total Funding", f"${df['Funding'].sum():,.0f}")
             st.metric("Avg Grant Size", f"${df['Funding'].mean():,.0f}")
             eligible = len(df[df['Eligibility'] == 'Yes'])
             st.metric("Eligible Grants", f"{eligible} ({(eligible/len(df)*100):.1f}%)")
+            if st.session_state.get('snapshot'):
+                st.caption(f"💾 Snapshot saved {st.session_state['snapshot']['saved_at']}")
+            
+            if st.session_state.get('date_report'):
+                with st.expander("🗓️ Date Parsing"):
+                    st.dataframe(pd.DataFrame(st.session_state['date_report']).T, use_container_width=True)
+            
+            schema_report = st.session_state.get('schema_report')
+            if schema_report and has_drift(schema_report):
+                with st.expander("🧬 Schema Drift"):
+                    st.json(schema_report)
+            
+            memory_report = st.session_state.get('memory_report')
+            if memory_report:
+                with st.expander("🧠 Memory"):
+                    st.metric(
+                        "Grant Data",
+                        f"{memory_report['bytes_after'] / 1024:,.0f} KB",
+                        f"-{(memory_report['bytes_before'] - memory_report['bytes_after']) / 1024:,.0f} KB",
+                        delta_color="inverse"
+                    )
+                    registry_stats = dataset_registry.stats()
+                    st.metric("Shared Datasets", registry_stats['entries'])
+                    st.metric("All Sessions", f"{registry_stats['bytes'] / 1024:,.0f} KB")
+                    st.caption(
+                        f"Registry hits {registry_stats['hits']} · misses {registry_stats['misses']}"
+                        f" · {registry_stats['leased']} in use by sessions"
+                    )
+            
+            fetch_stats = http_client.stats()
+            if fetch_stats['requests']:
+                with st.expander("🌐 Network"):
+                    st.metric("Requests", fetch_stats['requests'])
+                    st.metric("Downloaded", f"{fetch_stats['bytes'] / 1024:,.1f} KB")
+                    st.metric("Avg Latency", f"{fetch_stats['avg_latency'] * 1000:,.0f} ms")
+                    st.metric("Retries", fetch_stats['retries'])
+
+            chart_stats = figure_cache.stats()
+            if chart_stats:
+                with st.expander("📊 Charts"):
+                    st.dataframe(
+                        pd.DataFrame(chart_stats).T.rename(columns={'build_ms': 'Last build (ms)'}).round(1),
+                        use_container_width=True
+                    )
+
+    # Initialize session state from the last snapshot for an instant first paint;
+    # the background refresher then keeps sheet-backed data current
+    # Sessions hold only a version id; an evicted dataset is reloaded the same way
+    if current_grant_data() is None:
+        if not load_latest_snapshot():
+            prepare_grant_data(create_sample_data())
+    refresh_status = swap_in_refreshed_data()
+    if refresh_status and refresh_status['age'] is not None:
+        st.sidebar.caption(
+            f"🔄 Data age {refresh_status['age']:.0f}s · last refresh took {refresh_status['last_duration']:.2f}s"
+        )
     
-    # Initialize session state
-    if 'df' not in st.session_state:
-        st.session_state['df'] = create_sample_data()
-    
-    df = st.session_state['df']
+    df = get_derived_frame(current_grant_data(), st.session_state['df_version'])
     
     if df.empty:
         st.warning("No data available. Please load data from Google Sheets or use sample data.")
@@ -1111,17 +1160,28 @@ def main():
     elif view_mode == "Analytics Hub":
         display_analytics_hub(df)
 
+def chart_version():
+    """Return the cache version for charts of the current grant data.
+
+    Days left, urgency and scores move with the date, so the day is part of it.
+    """
+    return (st.session_state.get('df_version'), datetime.now().date().isoformat())
+
 def display_dashboard_overview(df):
     """Display comprehensive dashboard overview"""
     st.header("📊 Executive Dashboard")
     
+    aggregates = get_aggregates(df, st.session_state.get('df_version'))
+    totals = aggregates.totals()
+    version, theme = chart_version(), st.get_option('theme.base')
+    
     # Key metrics row
     col1, col2, col3, col4, col5 = st.columns(5)
     
     with col1:
         st.markdown(f"""
         <div class="metric-card">
-            <div class="metric-value">{len(df)}</div>
+            <div class="metric-value">{totals['rows']}</div>
             <div class="metric-label">Total Grants</div>
         </div>
         """, unsafe_allow_html=True)
@@ -1129,13 +1189,13 @@ def display_dashboard_overview(df):
     with col2:
         st.markdown(f"""
         <div class="metric-card">
-            <div class="metric-value">${df['Funding'].sum()/1000000:.1f}M</div>
+            <div class="metric-value">${totals['funding']/1000000:.1f}M</div>
             <div class="metric-label">Total Funding</div>
         </div>
         """, unsafe_allow_html=True)
     
     with col3:
-        eligible_count = len(df[df['Eligibility'] == 'Yes'])
+        eligible_count = int(aggregates.counts('eligibility').get('Yes', 0))
         st.markdown(f"""
         <div class="metric-card">
             <div class="metric-value">{eligible_count}</div>
@@ -1144,7 +1204,7 @@ def display_dashboard_overview(df):
         """, unsafe_allow_html=True)
     
     with col4:
-        interested_count = len(df[df['Status'] == 'Interested'])
+        interested_count = int(aggregates.counts('status').get('Interested', 0))
         st.markdown(f"""
         <div class="metric-card">
             <div class="metric-value">{interested_count}</div>
@@ -1153,7 +1213,7 @@ def display_dashboard_overview(df):
         """, unsafe_allow_html=True)
     
     with col5:
-        avg_funding = df['Funding'].mean()
+        avg_funding = totals['funding'] / totals['funded'] if totals['funded'] else float('nan')
         st.markdown(f"""
         <div class="metric-card">
             <div class="metric-value">${avg_funding/1000:.0f}K</div>
@@ -1165,7 +1225,7 @@ def display_dashboard_overview(df):
     st.markdown("---")
     st.subheader("🔍 Intelligent Insights")
     
-    insights = generate_insights(df)
+    insights = generate_insights(df, version)
     col1, col2 = st.columns(2)
     
     for i, insight in enumerate(insights):
@@ -1192,80 +1252,82 @@ def display_dashboard_overview(df):
     
     with col1:
         # Status distribution
-        status_counts = df['Status'].value_counts()
-        fig_status = px.pie(
-            values=status_counts.values,
-            names=status_counts.index,
-            title="Grant Status Distribution",
-            color_discrete_sequence=px.colors.qualitative.Set3
-        )
-        fig_status.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
-        st.plotly_chart(fig_status, use_container_width=True)
+        def status_chart():
+            status_counts = aggregates.counts('status')
+            fig_status = px.pie(
+                values=status_counts.values,
+                names=status_counts.index,
+                title="Grant Status Distribution",
+                color_discrete_sequence=px.colors.qualitative.Set3
+            )
+            fig_status.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
+            return fig_status
+        
+        st.plotly_chart(cached_figure('overview_status', version, status_chart, theme=theme), use_container_width=True)
     
     with col2:
         # Funding by agency
-        agency_funding = df.groupby('Agency')['Funding'].sum().sort_values(ascending=False).head(10)
-        fig_agency = px.bar(
-            x=agency_funding.index,
-            y=agency_funding.values,
-            title="Top 10 Agencies by Total Funding",
-            labels={'x': 'Agency', 'y': 'Total Funding ($)'},
-            color=agency_funding.values,
-            color_continuous_scale='Viridis'
-        )
-        fig_agency.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
-        st.plotly_chart(fig_agency, use_container_width=True)
+        def agency_chart():
+            agency_funding = aggregates.table('agency')['funding'].sort_values(ascending=False).head(10)
+            fig_agency = px.bar(
+                x=agency_funding.index,
+                y=agency_funding.values,
+                title="Top 10 Agencies by Total Funding",
+                labels={'x': 'Agency', 'y': 'Total Funding ($)'},
+                color=agency_funding.values,
+                color_continuous_scale='Viridis'
+            )
+            fig_agency.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
+            return fig_agency
+        
+        st.plotly_chart(cached_figure('overview_agency_funding', version, agency_chart, theme=theme), use_container_width=True)
     
     col1, col2 = st.columns(2)
     
     with col1:
         # Eligibility breakdown
-        eligibility_counts = df['Eligibility'].value_counts()
-        fig_elig = px.bar(
-            x=eligibility_counts.index,
-            y=eligibility_counts.values,
-            title="Eligibility Status Overview",
-            labels={'x': 'Eligibility', 'y': 'Count'},
-            color=eligibility_counts.index,
-            color_discrete_map={'Yes': '#27ae60', 'No': '#e74c3c'}
-        )
-        fig_elig.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
-        st.plotly_chart(fig_elig, use_container_width=True)
+        def eligibility_chart():
+            eligibility_counts = aggregates.counts('eligibility')
+            fig_elig = px.bar(
+                x=eligibility_counts.index,
+                y=eligibility_counts.values,
+                title="Eligibility Status Overview",
+                labels={'x': 'Eligibility', 'y': 'Count'},
+                color=eligibility_counts.index,
+                color_discrete_map={'Yes': '#27ae60', 'No': '#e74c3c'}
+            )
+            fig_elig.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
+            return fig_elig
+        
+        st.plotly_chart(cached_figure('overview_eligibility', version, eligibility_chart, theme=theme), use_container_width=True)
     
     with col2:
         # Grant types distribution
-        grant_type_counts = df['Grant Type'].value_counts().head(10)
-        fig_types = px.bar(
-            x=grant_type_counts.values,
-            y=grant_type_counts.index,
-            orientation='h',
-            title="Top 10 Grant Types",
-            labels={'x': 'Count', 'y': 'Grant Type'},
-            color=grant_type_counts.values,
-            color_continuous_scale='Blues'
-        )
-        fig_types.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
-        st.plotly_chart(fig_types, use_container_width=True)
+        def grant_type_chart():
+            grant_type_counts = aggregates.counts('grant_type').head(10)
+            fig_types = px.bar(
+                x=grant_type_counts.values,
+                y=grant_type_counts.index,
+                orientation='h',
+                title="Top 10 Grant Types",
+                labels={'x': 'Count', 'y': 'Grant Type'},
+                color=grant_type_counts.values,
+                color_continuous_scale='Blues'
+            )
+            fig_types.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
+            return fig_types
+        
+        st.plotly_chart(cached_figure('overview_grant_types', version, grant_type_chart, theme=theme), use_container_width=True)
     
     # Timeline analysis
     st.markdown("---")
     st.subheader("📅 Timeline Analysis")
     
     # Calculate urgency metrics
-    urgent_grants = []
-    warning_grants = []
-    safe_grants = []
-    
-    for _, grant in df.iterrows():
-        response_date = safe_date_parse(grant['Response Date'])
-        if response_date:
-            days_left = (response_date - datetime.now()).days
-            if days_left < 14:
-                urgent_grants.append(grant)
-            elif days_left < 30:
-                warning_grants.append(grant)
-            else:
-                safe_grants.append(grant)
+    deadlines = get_deadlines(df, st.session_state.get('df_version'))
+    urgent_count = deadlines.count('Urgent')
+    warning_count = deadlines.count('Warning')
+    safe_count = deadlines.count('Safe')
     
     col1, col2, col3 = st.columns(3)
     
@@ -1273,7 +1335,7 @@ def display_dashboard_overview(df):
         st.markdown(f"""
         <div class="deadline-urgent">
             🚨 URGENT<br>
-            <div style="font-size: 2rem; font-weight: bold;">{len(urgent_grants)}</div>
+            <div style="font-size: 2rem; font-weight: bold;">{urgent_count}</div>
             Grants due within 14 days
         </div>
         """, unsafe_allow_html=True)
@@ -1282,7 +1344,7 @@ def display_dashboard_overview(df):
         st.markdown(f"""
         <div class="deadline-warning">
             ⚠️ WARNING<br>
-            <div style="font-size: 2rem; font-weight: bold;">{len(warning_grants)}</div>
+            <div style="font-size: 2rem; font-weight: bold;">{warning_count}</div>
             Grants due within 30 days
         </div>
         """, unsafe_allow_html=True)
@@ -1291,7 +1353,7 @@ def display_dashboard_overview(df):
         st.markdown(f"""
         <div class="deadline-safe">
             ✅ SAFE<br>
-            <div style="font-size: 2rem; font-weight: bold;">{len(safe_grants)}</div>
+            <div style="font-size: 2rem; font-weight: bold;">{safe_count}</div>
             Grants due after 30 days
         </div>
         """, unsafe_allow_html=True)
@@ -1301,10 +1363,12 @@ def display_dashboard_overview(df):
     st.subheader("📥 Export Options")
     
     col1, col2, col3 = st.columns(3)
+    # Export the loaded columns only, not the parsed and derived helper columns
+    export_df = df[source_columns(current_grant_data())]
     
     with col1:
         # CSV export
-        csv = df.to_csv(index=False)
+        csv = export_df.to_csv(index=False)
         st.download_button(
             label="📄 Download CSV",
             data=csv,
@@ -1314,19 +1378,25 @@ def display_dashboard_overview(df):
         )
     
     with col2:
-        # Excel export
-        excel_data = create_excel_download(df)
+        # Excel export, only written when the button is clicked
         st.download_button(
             label="📊 Download Excel",
-            data=excel_data,
+            data=lambda: create_excel_download(export_df, aggregates),
             file_name="grants_report.xlsx",
             mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
             use_container_width=True
         )
+        export_stats = excel_exporter.stats()
+        if export_stats:
+            peak = f", peak {export_stats['peak_bytes'] / 1024 ** 2:,.1f} MB" if export_stats['peak_bytes'] is not None else ""
+            st.caption(
+                f"Last export: {export_stats['rows']:,} rows in {export_stats['seconds']:.1f}s "
+                f"({export_stats['rows_per_sec']:,.0f} rows/s{peak})"
+            )
     
     with col3:
         # JSON export
-        json_data = df.to_json(orient='records', indent=2)
+        json_data = export_df.to_json(orient='records', date_format='iso', indent=2)
         st.download_button(
             label="🔧 Download JSON",
             data=json_data,
@@ -1335,43 +1405,45 @@ def display_dashboard_overview(df):
             use_container_width=True
         )
 
+# Categorical columns the grant explorer filters on
+GRANT_FACETS = ['Status', 'Eligibility', 'Agency', 'Grant Type']
+
+# Grant explorer sort options and the (column, ascending) each sorts by
+GRANT_CARD_SORTS = {
+    "Funding (High to Low)": ('Funding', False),
+    "Funding (Low to High)": ('Funding', True),
+    "Deadline (Soonest)": (parsed_column_name('Response Date'), True),
+    "Recently Posted": (parsed_column_name('Posted Date'), False),
+    "Grant Score": ('Opportunity Score', False)
+}
+
 def display_grant_cards(df):
     """Display detailed grant cards with advanced filtering"""
+    started = time.perf_counter()
     st.header("🎯 Detailed Grant Explorer")
     
     # Advanced filtering section
     st.markdown('<div class="filter-section">', unsafe_allow_html=True)
     st.subheader("🔍 Advanced Filters")
     
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        status_filter = st.multiselect(
-            "Status",
-            options=df['Status'].unique().tolist(),
-            default=df['Status'].unique().tolist()
-        )
-    
-    with col2:
-        eligibility_filter = st.multiselect(
-            "Eligibility",
-            options=df['Eligibility'].unique().tolist(),
-            default=df['Eligibility'].unique().tolist()
-        )
+    facets = get_facet_index(df, GRANT_FACETS, ['Funding'], st.session_state.get('df_version'))
     
-    with col3:
-        agency_filter = st.multiselect(
-            "Agency",
-            options=df['Agency'].unique().tolist(),
-            default=df['Agency'].unique().tolist()
-        )
+    # Count each option against the other facets' current selections
+    counts = facets.counts(
+        {column: st.session_state.get(f"grant_facet_{column}") for column in GRANT_FACETS},
+        {'Funding': (st.session_state.get('grant_min_funding'), st.session_state.get('grant_max_funding'))}
+    )
     
-    with col4:
-        grant_type_filter = st.multiselect(
-            "Grant Type",
-            options=df['Grant Type'].unique().tolist(),
-            default=df['Grant Type'].unique().tolist()
-        )
+    selections = {}
+    for column, col in zip(GRANT_FACETS, st.columns(len(GRANT_FACETS))):
+        with col:
+            selections[column] = st.multiselect(
+                column,
+                options=facets.values(column),
+                default=facets.values(column),
+                format_func=with_count(counts[column]),
+                key=f"grant_facet_{column}"
+            )
     
     # Funding range filter
     col1, col2 = st.columns(2)
@@ -1381,7 +1453,8 @@ def display_grant_cards(df):
             min_value=0,
             max_value=int(df['Funding'].max()),
             value=0,
-            step=10000
+            step=10000,
+            key="grant_min_funding"
         )
     
     with col2:
@@ -1390,7 +1463,8 @@ def display_grant_cards(df):
             min_value=0,
             max_value=int(df['Funding'].max()),
             value=int(df['Funding'].max()),
-            step=10000
+            step=10000,
+            key="grant_max_funding"
         )
     
     # Search box
@@ -1401,61 +1475,60 @@ def display_grant_cards(df):
     
     st.markdown('</div>', unsafe_allow_html=True)
     
-    # Apply filters
-    filtered_df = df[
-        (df['Status'].isin(status_filter)) &
-        (df['Eligibility'].isin(eligibility_filter)) &
-        (df['Agency'].isin(agency_filter)) &
-        (df['Grant Type'].isin(grant_type_filter)) &
-        (df['Funding'] >= min_funding) &
-        (df['Funding'] <= max_funding)
-    ]
-    
-    # Apply search
-    if search_term:
-        search_mask = (
-            filtered_df['Title'].str.contains(search_term, case=False, na=False) |
-            filtered_df['Goal'].str.contains(search_term, case=False, na=False) |
-            filtered_df['Notes'].str.contains(search_term, case=False, na=False)
-        )
-        filtered_df = filtered_df[search_mask]
+    # Filtering and sorting only run when this filter/sort combination is new;
+    # otherwise the cached row order is reused and each page is just a slice.
+    # Scores and days left move with the date, so row orders are keyed on the day too
+    version = st.session_state.get('df_version')
+    order_version = chart_version()
+    ranges = {'Funding': (min_funding, max_funding)}
+    sort_options = (["Relevance"] if search_term else []) + list(GRANT_CARD_SORTS)
+    
+    def build_order(sort_by):
+        keep = facets.mask(selections, ranges)
+        if search_term:
+            # Restrict to search hits, keeping the index's relevance order for "Relevance"
+            matches = df.index.get_indexer(get_search_index(df, version).search(search_term))
+            matches = matches[matches >= 0]
+            if sort_by not in GRANT_CARD_SORTS:
+                return matches[keep[matches]]
+            hits = np.zeros(len(df), dtype=bool)
+            hits[matches] = True
+            keep &= hits
+        return get_sort_index(df, GRANT_CARD_SORTS, version).order(sort_by, keep)
+    
+    def filtered_order(sort_by):
+        key = order_key(order_version, selections, ranges, search_term, sort_by)
+        return page_orders.get(key, lambda: build_order(sort_by))
     
     # Display results count
     st.markdown(f"""
     <div class="alert-box">
-        Found {len(filtered_df)} grants matching your criteria
+        Found {len(filtered_order(sort_options[0]))} grants matching your criteria
     </div>
     """, unsafe_allow_html=True)
-    
+
+    # Insights for the matching grants; only insights whose columns differ are recomputed
+    with st.expander("💡 Insights for these grants"):
+        subset_version = order_key(order_version, selections, ranges, search_term)
+        subset = df.iloc[np.sort(filtered_order(sort_options[0]))]
+        for insight in generate_insights(subset, subset_version):
+            st.markdown(f"- {insight}")
+
     # Sorting options
     col1, col2 = st.columns(2)
     with col1:
-        sort_by = st.selectbox(
-            "Sort by",
-            ["Funding (High to Low)", "Funding (Low to High)", "Deadline (Soonest)", "Recently Posted", "Grant Score"]
-        )
+        sort_by = st.selectbox("Sort by", sort_options)
     
-    # Apply sorting
-    if sort_by == "Funding (High to Low)":
-        filtered_df = filtered_df.sort_values('Funding', ascending=False)
-    elif sort_by == "Funding (Low to High)":
-        filtered_df = filtered_df.sort_values('Funding', ascending=True)
-    elif sort_by == "Deadline (Soonest)":
-        filtered_df['Response Date Parsed'] = filtered_df['Response Date'].apply(safe_date_parse)
-        filtered_df = filtered_df.sort_values('Response Date Parsed', ascending=True)
-    elif sort_by == "Recently Posted":
-        filtered_df['Posted Date Parsed'] = filtered_df['Posted Date'].apply(safe_date_parse)
-        filtered_df = filtered_df.sort_values('Posted Date Parsed', ascending=False)
-    elif sort_by == "Grant Score":
-        filtered_df['Score'] = filtered_df.apply(calculate_grant_score, axis=1)
-        filtered_df = filtered_df.sort_values('Score', ascending=False)
+    positions = filtered_order(sort_by)
     
     # Pagination
     items_per_page = 5
-    total_pages = (len(filtered_df) - 1) // items_per_page + 1
+    total_pages = page_count(len(positions), items_per_page)
     
     if 'page' not in st.session_state:
         st.session_state['page'] = 0
+    # Narrower filters can leave the saved page past the end
+    st.session_state['page'] = min(st.session_state['page'], total_pages - 1)
     
     col1, col2, col3 = st.columns([1, 2, 1])
     with col1:
@@ -1463,31 +1536,40 @@ def display_grant_cards(df):
             st.session_state['page'] -= 1
     
     with col2:
-        st.markdown(f"""
-        <div style="text-align: center; padding: 1rem; font-size: 1.2rem; font-weight: bold;">
-            Page {st.session_state['page'] + 1} of {total_pages}
-        </div>
-        """, unsafe_allow_html=True)
+        page_label = st.empty()
     
     with col3:
         if st.button("Next ➡️") and st.session_state['page'] < total_pages - 1:
             st.session_state['page'] += 1
     
-    # Display grants for current page
-    start_idx = st.session_state['page'] * items_per_page
-    end_idx = start_idx + items_per_page
-    page_df = filtered_df.iloc[start_idx:end_idx]
+    page_label.markdown(f"""
+    <div style="text-align: center; padding: 1rem; font-size: 1.2rem; font-weight: bold;">
+        Page {st.session_state['page'] + 1} of {total_pages}
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Display grants for current page, materializing only these rows
+    page_df = page_slice(df, positions, st.session_state['page'], items_per_page)
     
+    first_card = None
     for _, grant in page_df.iterrows():
         display_grant_card(grant)
+        if first_card is None:
+            first_card = time.perf_counter() - started
+    
+    if first_card is not None:
+        st.caption(
+            f"⏱️ First card in {first_card * 1000:.0f} ms, page in "
+            f"{(time.perf_counter() - started) * 1000:.0f} ms"
+        )
 
 def display_data_table(df):
     """Display interactive data table with export options"""
     st.header("📊 Interactive Data Table")
     
-    # Column selector
+    # Column selector, offering the loaded columns rather than the parsed and derived helpers
     st.subheader("🔧 Customize Columns")
-    all_columns = df.columns.tolist()
+    all_columns = source_columns(current_grant_data())
     default_columns = ['Title', 'Grant Type', 'Status', 'Eligibility', 'Funding', 'Response Date', 'Agency']
     selected_columns = st.multiselect(
         "Select columns to display",
@@ -1534,7 +1616,7 @@ def display_data_table(df):
         )
     
     with col2:
-        json_data = df[selected_columns].to_json(orient='records', indent=2)
+        json_data = df[selected_columns].to_json(orient='records', date_format='iso', indent=2)
         st.download_button(
             label="🔧 Download as JSON",
             data=json_data,
@@ -1547,6 +1629,10 @@ def display_analytics_hub(df):
     """Display advanced analytics and insights"""
     st.header("📈 Analytics Intelligence Hub")
     
+    aggregates = get_aggregates(df, st.session_state.get('df_version'))
+    totals = aggregates.totals()
+    version, theme = chart_version(), st.get_option('theme.base')
+    
     # Create tabs for different analytics
     tab1, tab2, tab3, tab4, tab5 = st.tabs([
         "💰 Funding Analysis",
@@ -1565,7 +1651,7 @@ def display_analytics_hub(df):
         with col1:
             st.markdown(f"""
             <div class="metric-card">
-                <div class="metric-value">${df['Funding'].sum():,.0f}</div>
+                <div class="metric-value">${totals['funding']:,.0f}</div>
                 <div class="metric-label">Total Available Funding</div>
             </div>
             """, unsafe_allow_html=True)
@@ -1587,161 +1673,184 @@ def display_analytics_hub(df):
             """, unsafe_allow_html=True)
         
         # Funding distribution histogram
-        fig_dist = px.histogram(
-            df,
-            x='Funding',
-            nbins=30,
-            title="Funding Amount Distribution",
-            labels={'Funding': 'Grant Amount ($)', 'count': 'Number of Grants'},
-            color_discrete_sequence=['#667eea']
-        )
-        fig_dist.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
-        st.plotly_chart(fig_dist, use_container_width=True)
+        def funding_distribution_chart():
+            fig_dist = px.histogram(
+                df,
+                x='Funding',
+                nbins=30,
+                title="Funding Amount Distribution",
+                labels={'Funding': 'Grant Amount ($)', 'count': 'Number of Grants'},
+                color_discrete_sequence=['#667eea']
+            )
+            fig_dist.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
+            return fig_dist
+        
+        st.plotly_chart(cached_figure('hub_funding_distribution', version, funding_distribution_chart, theme=theme), use_container_width=True)
         
         # Funding by grant type
-        grant_type_funding = df.groupby('Grant Type')['Funding'].agg(['sum', 'mean', 'count']).sort_values('sum', ascending=False).head(15)
-        
-        fig_type_funding = go.Figure()
-        fig_type_funding.add_trace(go.Bar(
-            x=grant_type_funding.index,
-            y=grant_type_funding['sum'],
-            name='Total Funding',
-            marker_color='#667eea'
-        ))
-        fig_type_funding.update_layout(
-            title="Top 15 Grant Types by Total Funding",
-            xaxis_title="Grant Type",
-            yaxis_title="Total Funding ($)",
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)'
-        )
-        st.plotly_chart(fig_type_funding, use_container_width=True)
+        def grant_type_funding_chart():
+            grant_type_funding = aggregates.table('grant_type').rename(
+                columns={'funding': 'sum', 'funded': 'count'}
+            )[['sum', 'mean', 'count']].sort_values('sum', ascending=False).head(15)
+        
+            fig_type_funding = go.Figure()
+            fig_type_funding.add_trace(go.Bar(
+                x=grant_type_funding.index,
+                y=grant_type_funding['sum'],
+                name='Total Funding',
+                marker_color='#667eea'
+            ))
+            fig_type_funding.update_layout(
+                title="Top 15 Grant Types by Total Funding",
+                xaxis_title="Grant Type",
+                yaxis_title="Total Funding ($)",
+                plot_bgcolor='rgba(0,0,0,0)',
+                paper_bgcolor='rgba(0,0,0,0)'
+            )
+            return fig_type_funding
+        
+        st.plotly_chart(cached_figure('hub_grant_type_funding', version, grant_type_funding_chart, theme=theme), use_container_width=True)
         
         # Funding range analysis
         col1, col2 = st.columns(2)
         
         with col1:
-            fig_ceiling = px.box(
-                df,
-                y='Award Ceiling',
-                title="Award Ceiling Distribution",
-                color_discrete_sequence=['#27ae60']
-            )
-            fig_ceiling.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
-            st.plotly_chart(fig_ceiling, use_container_width=True)
+            def ceiling_chart():
+                fig_ceiling = px.box(
+                    df,
+                    y='Award Ceiling',
+                    title="Award Ceiling Distribution",
+                    color_discrete_sequence=['#27ae60']
+                )
+                fig_ceiling.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
+                return fig_ceiling
+            
+            st.plotly_chart(cached_figure('hub_award_ceiling', version, ceiling_chart, theme=theme), use_container_width=True)
         
         with col2:
-            fig_floor = px.box(
-                df,
-                y='Award Floor',
-                title="Award Floor Distribution",
-                color_discrete_sequence=['#e74c3c']
-            )
-            fig_floor.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
-            st.plotly_chart(fig_floor, use_container_width=True)
+            def floor_chart():
+                fig_floor = px.box(
+                    df,
+                    y='Award Floor',
+                    title="Award Floor Distribution",
+                    color_discrete_sequence=['#e74c3c']
+                )
+                fig_floor.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
+                return fig_floor
+            
+            st.plotly_chart(cached_figure('hub_award_floor', version, floor_chart, theme=theme), use_container_width=True)
     
     with tab2:
         st.subheader("📅 Timeline and Deadline Analytics")
         
-        # Deadline analysis
-        deadline_data = []
-        for _, grant in df.iterrows():
-            response_date = safe_date_parse(grant['Response Date'])
-            if response_date:
-                days_left = (response_date - datetime.now()).days
-                deadline_data.append({
-                    'Title': grant['Title'],
-                    'Days Left': days_left,
-                    'Response Date': response_date,
-                    'Urgency': 'Urgent' if days_left < 14 else 'Warning' if days_left < 30 else 'Safe'
-                })
+        # Deadline analysis, shared by the pie, the timeline and the urgent list
+        deadlines = get_deadlines(df, st.session_state.get('df_version'))
+        deadline_df = deadlines.frame
         
-        if deadline_data:
-            deadline_df = pd.DataFrame(deadline_data)
+        if not deadlines.empty:
             
             # Urgency distribution
-            urgency_counts = deadline_df['Urgency'].value_counts()
-            fig_urgency = px.pie(
-                values=urgency_counts.values,
-                names=urgency_counts.index,
-                title="Deadline Urgency Distribution",
-                color=urgency_counts.index,
-                color_discrete_map={'Urgent': '#e74c3c', 'Warning': '#f39c12', 'Safe': '#27ae60'}
-            )
-            fig_urgency.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
-            st.plotly_chart(fig_urgency, use_container_width=True)
+            def urgency_chart():
+                urgency_counts = deadlines.urgency_counts[deadlines.urgency_counts > 0]
+                fig_urgency = px.pie(
+                    values=urgency_counts.values,
+                    names=urgency_counts.index,
+                    title="Deadline Urgency Distribution",
+                    color=urgency_counts.index,
+                    color_discrete_map={'Urgent': '#e74c3c', 'Warning': '#f39c12', 'Safe': '#27ae60'}
+                )
+                fig_urgency.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
+                return fig_urgency
+            
+            st.plotly_chart(cached_figure('hub_urgency', version, urgency_chart, theme=theme), use_container_width=True)
             
             # Timeline scatter
-            fig_timeline = px.scatter(
-                deadline_df,
-                x='Response Date',
-                y='Days Left',
-                color='Urgency',
-                title="Grant Deadlines Timeline",
-                hover_data=['Title'],
-                color_discrete_map={'Urgent': '#e74c3c', 'Warning': '#f39c12', 'Safe': '#27ae60'}
-            )
-            fig_timeline.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
-            st.plotly_chart(fig_timeline, use_container_width=True)
+            def deadline_timeline_chart():
+                # Large datasets plot an LTTB sample per urgency with WebGL
+                timeline_df = downsample(deadline_df, 'Response Date', 'Days Left', by='Urgency')
+                shown = "" if len(timeline_df) == len(deadline_df) else f" ({len(timeline_df):,} of {len(deadline_df):,} shown)"
+                fig_timeline = px.scatter(
+                    timeline_df,
+                    x='Response Date',
+                    y='Days Left',
+                    color='Urgency',
+                    title=f"Grant Deadlines Timeline{shown}",
+                    render_mode=render_mode(len(deadline_df)),
+                    hover_data=['Title'],
+                    color_discrete_map={'Urgent': '#e74c3c', 'Warning': '#f39c12', 'Safe': '#27ae60'}
+                )
+                fig_timeline.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
+                return fig_timeline
             
-            # Top 10 most urgent grants
-            st.subheader("🚨 Top 10 Most Urgent Grants")
-            urgent_df = deadline_df.sort_values('Days Left').head(10)
+            st.plotly_chart(cached_figure('hub_deadline_timeline', version, deadline_timeline_chart, theme=theme), use_container_width=True)
             
-            for _, grant in urgent_df.iterrows():
-                urgency_color = '#e74c3c' if grant['Urgency'] == 'Urgent' else '#f39c12'
-                st.markdown(f"""
+            # Most urgent grants, rendered as one block
+            urgent_df = deadlines.most_urgent
+            st.subheader(f"🚨 Top {len(urgent_df)} Most Urgent Grants")
+            urgent_cards = zip(
+                np.where(urgent_df['Urgency'] == 'Urgent', '#e74c3c', '#f39c12'),
+                urgent_df['Title'],
+                urgent_df['Days Left'],
+                urgent_df['Response Date'].dt.strftime('%Y-%m-%d')
+            )
+            st.markdown(''.join(f"""
                 <div style="background: {urgency_color}; color: white; padding: 1rem; border-radius: 10px; margin: 0.5rem 0;">
-                    <strong>{grant['Title']}</strong><br>
-                    <small>Due in {grant['Days Left']} days - {grant['Response Date'].strftime('%Y-%m-%d')}</small>
+                    <strong>{title}</strong><br>
+                    <small>Due in {days_left} days - {due}</small>
                 </div>
-                """, unsafe_allow_html=True)
+                """ for urgency_color, title, days_left, due in urgent_cards), unsafe_allow_html=True)
     
     with tab3:
         st.subheader("🏢 Agency Intelligence")
         
         # Agency statistics
-        agency_stats = df.groupby('Agency').agg({
-            'Funding': ['sum', 'mean', 'count'],
-            'Opportunity Number': 'count'
-        }).round(0)
+        agency_stats = aggregates.table('agency')[['funding', 'mean', 'funded', 'opportunities']].round(0)
         agency_stats.columns = ['Total Funding', 'Avg Funding', 'Grant Count', 'Opportunities']
         agency_stats = agency_stats.sort_values('Total Funding', ascending=False)
         
         # Top agencies by funding
-        fig_agency_funding = px.bar(
-            x=agency_stats.head(10).index,
-            y=agency_stats.head(10)['Total Funding'],
-            title="Top 10 Agencies by Total Funding",
-            labels={'x': 'Agency', 'y': 'Total Funding ($)'},
-            color=agency_stats.head(10)['Total Funding'],
-            color_continuous_scale='Viridis'
-        )
-        fig_agency_funding.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
-        st.plotly_chart(fig_agency_funding, use_container_width=True)
+        def agency_funding_chart():
+            fig_agency_funding = px.bar(
+                x=agency_stats.head(10).index,
+                y=agency_stats.head(10)['Total Funding'],
+                title="Top 10 Agencies by Total Funding",
+                labels={'x': 'Agency', 'y': 'Total Funding ($)'},
+                color=agency_stats.head(10)['Total Funding'],
+                color_continuous_scale='Viridis'
+            )
+            fig_agency_funding.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
+            return fig_agency_funding
+        
+        st.plotly_chart(cached_figure('hub_agency_funding', version, agency_funding_chart, theme=theme), use_container_width=True)
         
         # Agency comparison
         col1, col2 = st.columns(2)
         
         with col1:
-            fig_agency_count = px.pie(
-                values=agency_stats['Grant Count'].head(8),
-                names=agency_stats['Grant Count'].head(8).index,
-                title="Top 8 Agencies by Grant Count"
-            )
-            fig_agency_count.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
-            st.plotly_chart(fig_agency_count, use_container_width=True)
+            def agency_count_chart():
+                fig_agency_count = px.pie(
+                    values=agency_stats['Grant Count'].head(8),
+                    names=agency_stats['Grant Count'].head(8).index,
+                    title="Top 8 Agencies by Grant Count"
+                )
+                fig_agency_count.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
+                return fig_agency_count
+            
+            st.plotly_chart(cached_figure('hub_agency_count', version, agency_count_chart, theme=theme), use_container_width=True)
         
         with col2:
-            fig_agency_avg = px.bar(
-                x=agency_stats.head(8).index,
-                y=agency_stats.head(8)['Avg Funding'],
-                title="Top 8 Agencies by Average Grant Size",
-                color=agency_stats.head(8)['Avg Funding'],
-                color_continuous_scale='Blues'
-            )
-            fig_agency_avg.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
-            st.plotly_chart(fig_agency_avg, use_container_width=True)
+            def agency_average_chart():
+                fig_agency_avg = px.bar(
+                    x=agency_stats.head(8).index,
+                    y=agency_stats.head(8)['Avg Funding'],
+                    title="Top 8 Agencies by Average Grant Size",
+                    color=agency_stats.head(8)['Avg Funding'],
+                    color_continuous_scale='Blues'
+                )
+                fig_agency_avg.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
+                return fig_agency_avg
+            
+            st.plotly_chart(cached_figure('hub_agency_average', version, agency_average_chart, theme=theme), use_container_width=True)
         
         # Agency details table
         st.subheader("📋 Detailed Agency Statistics")
@@ -1750,9 +1859,6 @@ def display_analytics_hub(df):
     with tab4:
         st.subheader("📊 Performance Metrics & KPIs")
         
-        # Calculate opportunity scores for all grants
-        df['Opportunity Score'] = df.apply(calculate_grant_score, axis=1)
-        
         # Score distribution
         col1, col2, col3 = st.columns(3)
         
@@ -1784,15 +1890,18 @@ def display_analytics_hub(df):
             """, unsafe_allow_html=True)
         
         # Score distribution histogram
-        fig_scores = px.histogram(
-            df,
-            x='Opportunity Score',
-            nbins=20,
-            title="Opportunity Score Distribution",
-            color_discrete_sequence=['#667eea']
-        )
-        fig_scores.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
-        st.plotly_chart(fig_scores, use_container_width=True)
+        def score_distribution_chart():
+            fig_scores = px.histogram(
+                df,
+                x='Opportunity Score',
+                nbins=20,
+                title="Opportunity Score Distribution",
+                color_discrete_sequence=['#667eea']
+            )
+            fig_scores.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
+            return fig_scores
+        
+        st.plotly_chart(cached_figure('hub_score_distribution', version, score_distribution_chart, theme=theme), use_container_width=True)
         
         # Top opportunities
         st.subheader("⭐ Top 10 Opportunities by Score")
@@ -1816,15 +1925,18 @@ def display_analytics_hub(df):
             """, unsafe_allow_html=True)
         
         # Status vs Eligibility matrix
-        status_eligibility = pd.crosstab(df['Status'], df['Eligibility'])
-        fig_matrix = px.imshow(
-            status_eligibility,
-            title="Status vs Eligibility Matrix",
-            labels=dict(x="Eligibility", y="Status", color="Count"),
-            color_continuous_scale='Viridis'
-        )
-        fig_matrix.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
-        st.plotly_chart(fig_matrix, use_container_width=True)
+        def status_eligibility_chart():
+            status_eligibility = aggregates.matrix('status_eligibility')
+            fig_matrix = px.imshow(
+                status_eligibility,
+                title="Status vs Eligibility Matrix",
+                labels=dict(x="Eligibility", y="Status", color="Count"),
+                color_continuous_scale='Viridis'
+            )
+            fig_matrix.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
+            return fig_matrix
+        
+        st.plotly_chart(cached_figure('hub_status_eligibility', version, status_eligibility_chart, theme=theme), use_container_width=True)
     
     with tab5:
         st.subheader("🔮 Predictive Insights & Recommendations")
@@ -1838,9 +1950,9 @@ def display_analytics_hub(df):
         """, unsafe_allow_html=True)
         
         # Calculate weighted metrics
-        eligible_grants = df[df['Eligibility'] == 'Yes']
-        eligible_funding = eligible_grants['Funding'].sum()
-        total_funding = df['Funding'].sum()
+        eligibility_funding = aggregates.table('eligibility')['funding']
+        eligible_funding = eligibility_funding.get('Yes', 0)
+        total_funding = totals['funding']
         eligible_percentage = (eligible_funding / total_funding) * 100
         
         col1, col2 = st.columns(2)
@@ -1858,7 +1970,7 @@ def display_analytics_hub(df):
             """, unsafe_allow_html=True)
         
         with col2:
-            interested_eligible = len(df[(df['Status'] == 'Interested') & (df['Eligibility'] == 'Yes')])
+            interested_eligible = int(aggregates.counts('status_eligibility').get(('Interested', 'Yes'), 0))
             st.markdown(f"""
             <div class="recommendation-card">
                 <h4>⭐ Priority Opportunities</h4>
@@ -1885,7 +1997,7 @@ def display_analytics_hub(df):
             },
             {
                 'title': 'Address Urgent Deadlines',
-                'description': f'{len([g for g in deadline_data if g["Urgency"] == "Urgent"])} grants have deadlines within 2 weeks.',
+                'description': f'{deadlines.count("Urgent")} grants have deadlines within 2 weeks.',
                 'action': 'Immediate action required - allocate resources to urgent applications'
             },
             {
@@ -1895,7 +2007,7 @@ def display_analytics_hub(df):
             },
             {
                 'title': 'Optimize Resource Allocation',
-                'description': f'Average grant size is ${df["Funding"].mean():,.0f} with significant variation.',
+                'description': f'Average grant size is ${totals["funding"] / totals["funded"]:,.0f} with significant variation.',
                 'action': 'Balance portfolio between high-value and quick-win opportunities'
             }
         ]
@@ -1910,18 +2022,21 @@ def display_analytics_hub(df):
             """, unsafe_allow_html=True)
         
         # Funding opportunity heatmap by grant type and status
-        heatmap_data = df.groupby(['Grant Type', 'Status'])['Funding'].sum().unstack(fill_value=0)
+        heatmap_data = aggregates.matrix('grant_type_status', 'funding')
         
         if not heatmap_data.empty:
-            fig_heatmap = px.imshow(
-                heatmap_data.head(15),
-                title="Funding Distribution Heatmap: Top 15 Grant Types vs Status",
-                labels=dict(x="Status", y="Grant Type", color="Total Funding"),
-                color_continuous_scale='RdYlGn',
-                aspect='auto'
-            )
-            fig_heatmap.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
-            st.plotly_chart(fig_heatmap, use_container_width=True)
+            def heatmap_chart():
+                fig_heatmap = px.imshow(
+                    heatmap_data.head(15),
+                    title="Funding Distribution Heatmap: Top 15 Grant Types vs Status",
+                    labels=dict(x="Status", y="Grant Type", color="Total Funding"),
+                    color_continuous_scale='RdYlGn',
+                    aspect='auto'
+                )
+                fig_heatmap.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)')
+                return fig_heatmap
+            
+            st.plotly_chart(cached_figure('hub_grant_type_status', version, heatmap_chart, theme=theme), use_container_width=True)
 
 # Run the application
 if __name__ == "__main__":
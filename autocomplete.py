@@ -0,0 +1,190 @@
+"""Typo-tolerant autocomplete over grant and client names"""
+
+import threading
+from collections import Counter, OrderedDict, namedtuple
+
+from config import (AUTOCOMPLETE_CACHE_SIZE, AUTOCOMPLETE_MAX_EDITS, AUTOCOMPLETE_TOP_K,
+                    AUTOCOMPLETE_TRIE_CACHE_SIZE, GRANT_CATEGORIES)
+from search_index import tokenize
+
+Suggestion = namedtuple('Suggestion', ['text', 'kind', 'distance'])
+
+# Source columns for each suggestion kind
+CLIENT_SOURCES = {'client': 'client', 'industry': 'Industry', 'state': 'State'}
+GRANT_SOURCES = {'title': 'Title', 'agency': 'Agency', 'grant_type': 'Grant Type'}
+
+
+def allowed_edits(prefix, max_edits=AUTOCOMPLETE_MAX_EDITS):
+    """Typos tolerated for a prefix: none under 3 characters, then one per 3 characters"""
+    return min(max_edits, len(prefix) // 3)
+
+
+class _Node:
+    __slots__ = ('children', 'entries', 'top')
+
+    def __init__(self):
+        self.children = {}
+        self.entries = []
+        self.top = ()
+
+
+class SuggestionTrie:
+    """Character trie over normalized phrases and each of their word suffixes.
+
+    "Health & Wellness Grants" is reachable from "hea", "wel" and "gra".
+    Every node stores the top_k heaviest phrases below it, computed once
+    by build(), so an exact prefix lookup is a walk of len(prefix) nodes;
+    typos are handled by a bounded Levenshtein walk over the same trie.
+    """
+
+    def __init__(self, top_k=AUTOCOMPLETE_TOP_K):
+        self.top_k = top_k
+        self.root = _Node()
+        self.phrases = []
+        self.weights = []
+
+    def __len__(self):
+        return len(self.phrases)
+
+    def build(self, phrases):
+        """Index an iterable of (text, kind, weight) and precompute each node's top phrases"""
+        for text, kind, weight in phrases:
+            words = tokenize(text)
+            if not words:
+                continue
+            phrase_id = len(self.phrases)
+            self.phrases.append((text, kind))
+            self.weights.append(weight)
+            for start in range(len(words)):
+                node = self.root
+                for char in ' '.join(words[start:]):
+                    node = node.children.setdefault(char, _Node())
+                node.entries.append(phrase_id)
+        self._rank(self.root)
+        return self
+
+    def _rank(self, root):
+        # Post-order without recursion: children are ranked before their parent
+        order, stack = [], [root]
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            stack.extend(node.children.values())
+        for node in reversed(order):
+            candidates = set(node.entries)
+            for child in node.children.values():
+                candidates.update(child.top)
+            node.top = tuple(sorted(candidates, key=lambda i: (-self.weights[i], self.phrases[i][0]))[:self.top_k])
+
+    def complete(self, prefix, max_edits=0):
+        """Return {phrase id: edit distance} for phrases within max_edits of prefix"""
+        matches = {}
+        row = list(range(len(prefix) + 1))
+        stack = [(self.root, row)]
+        while stack:
+            node, row = stack.pop()
+            if row[-1] <= max_edits:
+                for phrase_id in node.top:
+                    if row[-1] < matches.get(phrase_id, max_edits + 1):
+                        matches[phrase_id] = row[-1]
+                if row[-1] == 0:
+                    continue
+            if min(row) > max_edits:
+                continue
+            for char, child in node.children.items():
+                next_row = [row[0] + 1]
+                for i, prefix_char in enumerate(prefix, 1):
+                    next_row.append(min(next_row[i - 1] + 1, row[i] + 1, row[i - 1] + (prefix_char != char)))
+                stack.append((child, next_row))
+        return matches
+
+
+def build_phrases(grant_types=(), categories=GRANT_CATEGORIES, clients=None, grants=None):
+    """Return (text, kind, weight) phrases, weighted by how often each value occurs"""
+    counts = Counter()
+    for grant_type in grant_types:
+        counts[(grant_type, 'grant_type')] += 1
+    for category in categories:
+        counts[(category, 'category')] += 1
+    for frame, sources in ((clients, CLIENT_SOURCES), (grants, GRANT_SOURCES)):
+        if frame is None or frame.empty:
+            continue
+        for kind, column in sources.items():
+            if column not in frame.columns:
+                continue
+            values = frame[column].dropna().astype(str).value_counts()
+            for text, count in values.items():
+                counts[(text, kind)] += int(count)
+    return [(text, kind, weight) for (text, kind), weight in counts.items()]
+
+
+class Autocomplete:
+    """Prefix suggestions from one version's SuggestionTrie with a per-prefix LRU cache"""
+
+    def __init__(self, trie, cache_size=AUTOCOMPLETE_CACHE_SIZE):
+        self.cache_size = cache_size
+        self.trie = trie
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def suggest(self, query, limit=5):
+        """Return up to limit suggestions for query, closest and most common first"""
+        prefix = ' '.join(tokenize(query))
+        if not prefix:
+            return []
+        with self._lock:
+            if prefix in self._cache:
+                self._cache.move_to_end(prefix)
+                self.hits += 1
+                return self._cache[prefix][:limit]
+            self.misses += 1
+        trie = self.trie
+
+        matches = trie.complete(prefix, allowed_edits(prefix))
+        ranked = sorted(matches, key=lambda i: (matches[i], -trie.weights[i], trie.phrases[i][0]))
+        suggestions = [Suggestion(*trie.phrases[i], matches[i]) for i in ranked[:trie.top_k]]
+
+        with self._lock:
+            self._cache[prefix] = suggestions
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return suggestions[:limit]
+
+    def stats(self):
+        """Return prefix cache hits and misses and the number of phrases"""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'phrases': len(self.trie)}
+
+
+class AutocompleteCache:
+    """Bounded LRU of autocompletes keyed on the caller's data version"""
+
+    def __init__(self, maxsize=AUTOCOMPLETE_TRIE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._autocompletes = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, version, build):
+        """Return the autocomplete over build() phrases for version, building its trie on a miss"""
+        with self._lock:
+            if version in self._autocompletes:
+                self._autocompletes.move_to_end(version)
+                return self._autocompletes[version]
+
+        autocomplete = Autocomplete(SuggestionTrie().build(build()))
+        with self._lock:
+            self._autocompletes[version] = autocomplete
+            self._autocompletes.move_to_end(version)
+            while len(self._autocompletes) > self.maxsize:
+                self._autocompletes.popitem(last=False)
+        return autocomplete
+
+
+autocompletes = AutocompleteCache()
+
+
+def get_autocomplete(version, build):
+    """Return the shared autocomplete for this data version"""
+    return autocompletes.get(version, build)
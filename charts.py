@@ -0,0 +1,126 @@
+"""Built Plotly figures cached per chart, version, filters and theme, and large-trace downsampling"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from config import CHART_POINT_LIMIT, FIGURE_CACHE_SIZE
+
+
+def filter_hash(filters):
+    """Return a stable hash of the filter values a chart was built with"""
+    return hashlib.sha1(json.dumps(filters, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _numeric(values):
+    """Return values as floats, with datetimes as nanoseconds since the epoch"""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.to_numpy(dtype='datetime64[ns]').astype(np.int64).astype(float)
+    return pd.to_numeric(values, errors='coerce').to_numpy(dtype=float)
+
+
+def lttb_indices(x, y, threshold):
+    """Return the positions of the Largest-Triangle-Three-Buckets sample of (x, y).
+
+    x must be sorted. The first and last points are kept; every bucket in
+    between contributes the point forming the largest triangle with the
+    previously kept point and the next bucket's average, which keeps peaks,
+    dips and the overall shape of the series.
+    """
+    size = len(x)
+    if threshold >= size or threshold < 3:
+        return np.arange(size)
+    edges = np.linspace(1, size - 1, threshold - 1).astype(int)
+    kept = np.empty(threshold, dtype=np.int64)
+    kept[0], kept[-1] = 0, size - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else size
+        next_x = x[end:next_end].mean()
+        next_y = y[end:next_end].mean()
+        areas = np.abs(
+            (x[previous] - next_x) * (y[start:end] - y[previous]) -
+            (x[previous] - x[start:end]) * (next_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        kept[bucket + 1] = previous
+    return kept
+
+
+def downsample(df, x, y, limit=CHART_POINT_LIMIT, by=None):
+    """Return df sorted by x and reduced to about limit rows with LTTB.
+
+    With by, each group keeps its share of limit so every trace keeps its
+    shape. Frames already within limit are only sorted.
+    """
+    df = df.sort_values(x, kind='stable')
+    if len(df) <= limit:
+        return df
+    groups = df.groupby(by, observed=True, sort=False) if by else [(None, df)]
+    parts = []
+    for _, group in groups:
+        share = max(int(limit * len(group) / len(df)), 3)
+        parts.append(group.iloc[lttb_indices(_numeric(group[x]), _numeric(group[y]), share)])
+    return pd.concat(parts)
+
+
+def render_mode(rows, limit=CHART_POINT_LIMIT):
+    """Return the px render_mode for a trace of rows points: WebGL above limit"""
+    return 'webgl' if rows > limit else 'svg'
+
+
+class FigureCache:
+    """Bounded LRU of built figures keyed on (chart id, version, filter hash, theme).
+
+    build() does the chart's pandas aggregation and Plotly construction, so
+    a hit skips both. Figures are returned as built; Streamlit serializes
+    them without re-validating, which a JSON or dict round trip would not
+    avoid. Each chart id keeps its last build time and hit count.
+    """
+
+    def __init__(self, maxsize=FIGURE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._figures = OrderedDict()
+        self._charts = {}
+        self._lock = threading.Lock()
+
+    def get(self, chart_id, version, build, filters=None, theme=None):
+        """Return the figure for chart_id, calling build() only on a miss"""
+        key = (chart_id, version, filter_hash(filters), theme)
+        with self._lock:
+            chart = self._charts.setdefault(chart_id, {'builds': 0, 'hits': 0, 'build_ms': 0.0})
+            if key in self._figures:
+                self._figures.move_to_end(key)
+                chart['hits'] += 1
+                return self._figures[key]
+
+        started = time.perf_counter()
+        figure = build()
+        elapsed = (time.perf_counter() - started) * 1000
+        with self._lock:
+            chart['builds'] += 1
+            chart['build_ms'] = elapsed
+            self._figures[key] = figure
+            self._figures.move_to_end(key)
+            while len(self._figures) > self.maxsize:
+                self._figures.popitem(last=False)
+        return figure
+
+    def stats(self):
+        """Return {chart id: builds, hits and last build time in ms}"""
+        with self._lock:
+            return {chart_id: dict(chart) for chart_id, chart in self._charts.items()}
+
+
+figure_cache = FigureCache()
+
+
+def cached_figure(chart_id, version, build, filters=None, theme=None):
+    """Return the shared figure for this chart, data version, filters and theme"""
+    return figure_cache.get(chart_id, version, build, filters, theme)
@@ -0,0 +1,86 @@
+"""Memory-compact representation of loaded grant frames"""
+
+import pandas as pd
+
+from config import COMPACT_ARROW_STRINGS, COMPACT_CATEGORY_RATIO
+
+try:
+    import pyarrow  # noqa: F401
+    ARROW_STRINGS_AVAILABLE = True
+except ImportError:
+    ARROW_STRINGS_AVAILABLE = False
+
+AMOUNT_COLUMNS = ['Funding', 'Award Ceiling', 'Award Floor', 'Amount_Requested']
+
+
+def memory_usage(df):
+    """Return the deep in-memory size of df in bytes, per column and in total"""
+    per_column = df.memory_usage(deep=True, index=False)
+    return {
+        'total': int(per_column.sum() + df.index.memory_usage(deep=True)),
+        'columns': {column: int(size) for column, size in per_column.items()}
+    }
+
+
+def _downcast_amount(values):
+    """Shrink an amount column only when no value changes"""
+    if not pd.api.types.is_float_dtype(values) and not pd.api.types.is_integer_dtype(values):
+        return values
+    present = values.dropna()
+    if len(present) == len(values) and (present % 1 == 0).all():
+        return pd.to_numeric(values, downcast='integer')
+    as_float32 = values.astype('float32')
+    if (as_float32.astype('float64') == values)[values.notna()].all():
+        return as_float32
+    return values
+
+
+def _is_text(values):
+    if isinstance(values.dtype, pd.StringDtype):
+        return True
+    return values.dtype == object and pd.api.types.infer_dtype(values, skipna=True) in ('string', 'empty')
+
+
+def compact_frame(df, category_ratio=COMPACT_CATEGORY_RATIO, arrow_strings=COMPACT_ARROW_STRINGS):
+    """Return a smaller copy of df and a report of the bytes saved.
+
+    Text columns whose distinct values are at most category_ratio of the
+    rows become categoricals, so repeated Goal/Notes-style text is stored
+    once. Remaining text moves to Arrow-backed strings when pyarrow is
+    available, and amount columns are downcast when that is lossless.
+    """
+    before = memory_usage(df)
+    rows = max(len(df), 1)
+
+    compacted = {}
+    for column in df.columns:
+        values = df[column]
+        if column in AMOUNT_COLUMNS:
+            converted = _downcast_amount(values)
+        elif _is_text(values):
+            if values.nunique(dropna=True) <= category_ratio * rows:
+                converted = values.astype('category')
+            elif arrow_strings and ARROW_STRINGS_AVAILABLE and getattr(values.dtype, 'storage', None) != 'pyarrow':
+                converted = values.astype('string[pyarrow]')
+            else:
+                continue
+        else:
+            continue
+        if converted is not values:
+            compacted[column] = converted
+
+    result = df.assign(**compacted) if compacted else df
+    after = memory_usage(result)
+    report = {
+        'bytes_before': before['total'],
+        'bytes_after': after['total'],
+        'columns': {
+            column: {
+                'dtype': str(result[column].dtype),
+                'bytes_before': before['columns'][column],
+                'bytes_after': after['columns'][column]
+            }
+            for column in compacted
+        }
+    }
+    return result, report
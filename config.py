@@ -2,10 +2,47 @@
 
 # Google Sheets configuration
 GOOGLE_SHEETS_ID = "1xok6PwIk5Kyj78KhBFkjJYGNSdkosxeXliTy0Alt3bc"
+SHEET_CACHE_DIR = ".cache/sheets"  # raw exports and their ETag/Last-Modified validators
+SHEET_TABS = ["Sheet1"]  # tab names (or integer gids) loaded together
+SHEET_LOAD_WORKERS = 4  # tabs fetched concurrently
+SHEET_FRAME_CACHE_SIZE = 16  # parsed exports kept in memory to answer 304s without re-parsing
+SNAPSHOT_DIR = ".cache/snapshots"  # columnar copies of loaded datasets
+SNAPSHOT_KEEP = 5  # snapshots retained on disk
+SAVED_SEARCH_DB = ".cache/saved_searches.sqlite3"  # saved filter searches and their results
+SAVED_SEARCH_VERSIONS = 4  # dataset versions whose row hashes and saved search results are kept
+
+# HTTP fetch configuration
+HTTP_POOL_SIZE = 10  # keep-alive connections per host
+HTTP_MAX_RETRIES = 3
+HTTP_BACKOFF_FACTOR = 0.5  # seconds, doubled on each retry
+HTTP_CONNECT_TIMEOUT = 5  # seconds
+HTTP_READ_TIMEOUT = 30  # seconds
 
 # Dashboard configuration
 DASHBOARD_TITLE = "Grant Management Dashboard"
 REFRESH_INTERVAL = 300  # 5 minutes in seconds
+DERIVED_CACHE_SIZE = 8  # dataset versions whose derived columns stay in memory
+DATASET_REGISTRY_SIZE = 4  # prepared datasets shared across sessions
+SEARCH_INDEX_CACHE_SIZE = 4  # dataset versions whose search index stays in memory
+GLOBAL_SEARCH_CACHE_SIZE = 4  # dataset versions whose global search documents stay indexed
+AUTOCOMPLETE_TOP_K = 8  # suggestions precomputed per trie node
+AUTOCOMPLETE_MAX_EDITS = 2  # typos tolerated in longer prefixes
+AUTOCOMPLETE_CACHE_SIZE = 1024  # prefixes whose suggestions stay cached
+AUTOCOMPLETE_TRIE_CACHE_SIZE = 4  # dataset versions whose suggestion trie stays in memory
+FACET_CACHE_SIZE = 4  # dataset versions whose facet bitmaps stay in memory
+QUERY_CACHE_SIZE = 64  # filter results memoized per dataset version and filter spec
+PAGE_ORDER_CACHE_SIZE = 32  # filtered, sorted grant orders kept for paging
+SORT_INDEX_CACHE_SIZE = 4  # dataset versions whose sort permutations stay in memory
+AGGREGATE_CACHE_SIZE = 4  # dataset versions whose dashboard rollups stay in memory
+FIGURE_CACHE_SIZE = 128  # built chart figures kept across reruns
+CHART_POINT_LIMIT = 2000  # points per chart before traces are downsampled
+DEADLINE_CACHE_SIZE = 4  # dataset versions whose deadline analytics stay in memory
+URGENT_LIST_SIZE = 10  # most urgent grants listed in the analytics hub
+INSIGHT_CACHE_SIZE = 256  # insight results and column hashes kept per frame version
+EXPORT_CHUNK_ROWS = 5000  # rows converted at a time when streaming Excel exports
+EXPORT_SPOOL_BYTES = 8 * 1024 * 1024  # Excel exports larger than this spool to a temp file
+COMPACT_CATEGORY_RATIO = 0.5  # text columns with at most this share of distinct values become categoricals
+COMPACT_ARROW_STRINGS = True  # keep other text as Arrow strings when pyarrow is installed
 
 # Color scheme
 COLORS = {
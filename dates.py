@@ -0,0 +1,106 @@
+"""Date parsing and normalization for the Grant Dashboard"""
+
+from datetime import datetime
+
+import pandas as pd
+
+DATE_FORMATS = ["%Y-%m-%d", "%m/%d/%Y", "%d/%m/%Y", "%Y-%m-%d %H:%M:%S"]
+
+# Raw date columns that are parsed once at load time
+DATE_COLUMNS = ['Posted Date', 'Response Date', 'Created', 'Last Modified']
+
+
+def parsed_column_name(column):
+    """Return the name of the typed column holding the parsed values of column"""
+    return f"{column} Parsed"
+
+
+def safe_date_parse(date_str):
+    """Safely parse date strings with multiple format support"""
+    if pd.isna(date_str) or date_str is None or date_str == '':
+        return None
+
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(str(date_str), fmt)
+        except (ValueError, TypeError):
+            continue
+
+    return None
+
+
+def _parse_with_hits(values):
+    """Parse values format by format, returning the parsed column and hits per format"""
+    values = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.astype('datetime64[ns]'), {}
+
+    parsed = pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns]')
+    text = values[values.notna()].astype(str)
+    hits_by_format = {}
+    for fmt in DATE_FORMATS:
+        if text.empty:
+            hits_by_format[fmt] = 0
+            continue
+        attempt = pd.to_datetime(text, format=fmt, errors='coerce')
+        hits = attempt.notna()
+        parsed.loc[attempt.index[hits]] = attempt[hits]
+        hits_by_format[fmt] = int(hits.sum())
+        text = text[~hits]
+
+    return parsed, hits_by_format
+
+
+def parse_date_column(values):
+    """Parse a column of date strings with the same formats as safe_date_parse.
+
+    Each format is tried as one vectorized pass over the rows that are still
+    unparsed, so the common case costs one pass per column instead of up to
+    four strptime calls per cell.
+    """
+    return _parse_with_hits(values)[0]
+
+
+def normalize_dates(df, columns=DATE_COLUMNS):
+    """Add a typed datetime64 '<column> Parsed' column for each raw date column.
+
+    Returns the normalized frame and a report mapping each column to its hit
+    count per format plus the number of non-null values left unparsed.
+    """
+    parsed_columns = {}
+    report = {}
+    for column in columns:
+        if column not in df.columns:
+            continue
+        parsed, hits_by_format = _parse_with_hits(df[column])
+        parsed_columns[parsed_column_name(column)] = parsed
+        report[column] = {
+            **hits_by_format,
+            'unparsed': int(df[column].notna().sum() - parsed.notna().sum())
+        }
+
+    return df.assign(**parsed_columns), report
+
+
+def source_columns(df, columns=DATE_COLUMNS):
+    """Return the columns of df other than the parsed date columns normalize_dates adds"""
+    parsed = {parsed_column_name(column) for column in columns}
+    return [column for column in df.columns if column not in parsed]
+
+
+def date_column(df, column):
+    """Return the typed dates for column, parsing the raw strings only if needed"""
+    parsed_name = parsed_column_name(column)
+    if parsed_name in df.columns:
+        return df[parsed_name]
+    return parse_date_column(df[column])
+
+
+def row_date(row, column):
+    """Return the parsed date of column for a single grant row, or None"""
+    value = row.get(parsed_column_name(column))
+    if value is None:
+        return safe_date_parse(row[column])
+    if pd.isna(value):
+        return None
+    return value.to_pydatetime()
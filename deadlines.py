@@ -0,0 +1,69 @@
+"""Deadline analytics over the derived grant frame, computed once per version and day"""
+
+import threading
+from collections import OrderedDict
+from datetime import date
+
+from config import DEADLINE_CACHE_SIZE, URGENT_LIST_SIZE
+from dates import parsed_column_name
+from derived import URGENCY_LABELS, dataset_version
+
+
+class DeadlineAnalytics:
+    """Grants with a response date, their urgency counts and the most urgent few.
+
+    Built from the derived Days Left and Urgency columns with column
+    operations only; the insights, the urgency pie, the timeline scatter
+    and the urgent list all read this one result.
+    """
+
+    def __init__(self, df, top_n=URGENT_LIST_SIZE):
+        response = parsed_column_name('Response Date')
+        frame = df.loc[df['Days Left'].notna(), ['Title', 'Days Left', response, 'Urgency']]
+        self.frame = frame.rename(columns={response: 'Response Date'}).astype({'Days Left': int})
+        self.urgency_counts = self.frame['Urgency'].value_counts().reindex(URGENCY_LABELS, fill_value=0)
+        self.most_urgent = self.frame.nsmallest(top_n, 'Days Left')
+
+    def __len__(self):
+        return len(self.frame)
+
+    @property
+    def empty(self):
+        return self.frame.empty
+
+    def count(self, urgency):
+        """Return the number of grants in an urgency class"""
+        return int(self.urgency_counts.get(urgency, 0))
+
+
+class DeadlineCache:
+    """Bounded LRU of deadline analytics keyed on dataset version and day"""
+
+    def __init__(self, maxsize=DEADLINE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, df, version=None):
+        """Return the deadline analytics of df, computing them on a miss"""
+        key = (version or dataset_version(df), date.today())
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                return self._results[key]
+
+        result = DeadlineAnalytics(df)
+        with self._lock:
+            self._results[key] = result
+            self._results.move_to_end(key)
+            while len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+        return result
+
+
+deadline_cache = DeadlineCache()
+
+
+def get_deadlines(df, version=None):
+    """Return the shared deadline analytics for this version of df"""
+    return deadline_cache.get(df, version)
@@ -0,0 +1,96 @@
+"""Derived grant columns, computed once per dataset version"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+from config import DERIVED_CACHE_SIZE
+from dates import date_column, parsed_column_name
+from scoring import score_grants
+
+# Days-left bins for the urgency bucket: under 14 is urgent, under 30 a warning
+URGENCY_BINS = [-np.inf, 14, 30, np.inf]
+URGENCY_LABELS = ['Urgent', 'Warning', 'Safe']
+
+
+def dataset_version(df):
+    """Return a content hash identifying this version of the source frame"""
+    digest = hashlib.sha1()
+    digest.update('\x1f'.join(map(str, df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def urgency_buckets(days_left):
+    """Bucket a days-left column into Urgent/Warning/Safe"""
+    return pd.cut(days_left, bins=URGENCY_BINS, labels=URGENCY_LABELS, right=False)
+
+
+def derive_columns(df, now=None):
+    """Return df with the parsed dates, days left, urgency and opportunity score"""
+    now = pd.Timestamp(now or datetime.now())
+    response_dates = date_column(df, 'Response Date')
+    days_left = (response_dates - now).dt.days.astype('Int64')
+
+    return df.assign(**{
+        parsed_column_name('Response Date'): response_dates,
+        parsed_column_name('Posted Date'): date_column(df, 'Posted Date'),
+        'Days Left': days_left,
+        'Urgency': urgency_buckets(days_left),
+        'Opportunity Score': score_grants(df, now)
+    })
+
+
+class DerivedFrameCache:
+    """Bounded LRU of derived frames keyed on dataset version and day.
+
+    Days left and the deadline part of the score depend on the current date,
+    so entries are also keyed on today's date and roll over at midnight.
+    """
+
+    def __init__(self, maxsize=DERIVED_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._frames = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, df, version=None):
+        """Return the derived frame for df, computing it only on a cache miss"""
+        key = (version or dataset_version(df), date.today())
+        with self._lock:
+            if key in self._frames:
+                self._frames.move_to_end(key)
+                self.hits += 1
+                return self._frames[key]
+            self.misses += 1
+
+        derived = derive_columns(df)
+        with self._lock:
+            self._frames[key] = derived
+            self._frames.move_to_end(key)
+            while len(self._frames) > self.maxsize:
+                self._frames.popitem(last=False)
+        return derived
+
+    def clear(self):
+        """Drop every cached frame"""
+        with self._lock:
+            self._frames.clear()
+
+    def stats(self):
+        """Return hit/miss counts and the number of cached versions"""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._frames)}
+
+
+derived_cache = DerivedFrameCache()
+
+
+def get_derived_frame(df, version=None):
+    """Return a copy-on-write view of df with its derived columns from the shared cache"""
+    return derived_cache.get(df, version).copy(deep=False)
@@ -0,0 +1,126 @@
+"""Streaming Excel export through a write-only workbook spooled to a temp file"""
+
+import os
+import tempfile
+import threading
+import time
+
+import pandas as pd
+from openpyxl import Workbook
+
+from config import EXPORT_CHUNK_ROWS, EXPORT_SPOOL_BYTES
+
+
+def _rss():
+    """Return this process's resident memory in bytes, or None where /proc is unavailable"""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _column_values(series):
+    """Return a column as Excel-safe Python values with missing values as None"""
+    if isinstance(series.dtype, pd.DatetimeTZDtype):
+        series = series.dt.tz_localize(None)
+    return series.astype(object).where(series.notna(), None).tolist()
+
+
+def iter_rows(df, chunk_rows=EXPORT_CHUNK_ROWS, on_chunk=None):
+    """Yield the rows of df as tuples, converting chunk_rows rows at a time.
+
+    on_chunk(), if given, is called as each chunk is converted.
+    """
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        if on_chunk is not None:
+            on_chunk()
+        yield from zip(*(_column_values(chunk[column]) for column in chunk.columns))
+
+
+def summary_rows(aggregates):
+    """Return the Summary sheet rows from precomputed grant aggregates"""
+    totals = aggregates.totals()
+    average = totals['funding'] / totals['funded'] if totals['funded'] else 0
+    return [
+        ('Metric', 'Value'),
+        ('Total Grants', totals['rows']),
+        ('Total Funding', f"${totals['funding']:,.0f}"),
+        ('Average Funding', f"${average:,.0f}"),
+        ('Eligible Grants', int(aggregates.counts('eligibility').get('Yes', 0))),
+        ('Interested Grants', int(aggregates.counts('status').get('Interested', 0)))
+    ]
+
+
+def write_workbook(df, summary, target, sheet_name='All Grants', chunk_rows=EXPORT_CHUNK_ROWS, on_chunk=None):
+    """Write df and the summary rows as an xlsx workbook to a path or binary file"""
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(sheet_name)
+    sheet.append([str(column) for column in df.columns])
+    for row in iter_rows(df, chunk_rows, on_chunk):
+        sheet.append(row)
+    summary_sheet = workbook.create_sheet('Summary')
+    for row in summary:
+        summary_sheet.append(row)
+    workbook.save(target)
+
+
+class ExcelExporter:
+    """Writes Excel exports row by row and reports the speed and memory of the last one.
+
+    The write-only workbook streams each sheet to disk instead of building
+    the openpyxl cell model, and the output is spooled to a temp file once
+    it outgrows spool_bytes, so memory stays near one chunk of rows. Peak
+    memory is the largest resident-memory growth seen between chunks.
+    """
+
+    def __init__(self, chunk_rows=EXPORT_CHUNK_ROWS, spool_bytes=EXPORT_SPOOL_BYTES):
+        self.chunk_rows = chunk_rows
+        self.spool_bytes = spool_bytes
+        self._last = None
+        self._lock = threading.Lock()
+
+    def export(self, df, summary):
+        """Return a binary file positioned at the start of the xlsx export of df"""
+        baseline = _rss()
+        peak = [baseline]
+
+        def sample():
+            if baseline is not None:
+                peak[0] = max(peak[0], _rss())
+
+        started = time.perf_counter()
+        output = tempfile.SpooledTemporaryFile(max_size=self.spool_bytes, suffix='.xlsx')
+        write_workbook(df, summary, output, chunk_rows=self.chunk_rows, on_chunk=sample)
+        sample()
+        elapsed = time.perf_counter() - started
+
+        size = output.tell()
+        output.seek(0)
+        with self._lock:
+            self._last = {
+                'rows': len(df),
+                'seconds': elapsed,
+                'rows_per_sec': len(df) / elapsed if elapsed else 0.0,
+                'peak_bytes': peak[0] - baseline if baseline is not None else None,
+                'bytes': size
+            }
+        return output
+
+    def download(self, df, summary):
+        """Return the xlsx export of df as bytes, the form st.download_button accepts.
+
+        The workbook is still written through the spooled file; only the
+        finished file is read into memory.
+        """
+        with self.export(df, summary) as output:
+            return output.read()
+
+    def stats(self):
+        """Return rows, seconds, rows per second, peak memory growth and file size of the last export"""
+        with self._lock:
+            return dict(self._last) if self._last else None
+
+
+excel_exporter = ExcelExporter()
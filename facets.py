@@ -0,0 +1,128 @@
+"""Bitmap-indexed facet filtering with per-value counts"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from config import FACET_CACHE_SIZE
+from derived import dataset_version
+
+# Set bits in every byte value, for counting packed bitmaps
+POPCOUNT = np.array([bin(byte).count('1') for byte in range(256)], dtype=np.int64)
+
+
+class FacetIndex:
+    """Precomputed bitmaps per categorical value and sorted arrays per numeric column.
+
+    Filters are dicts: selections maps a categorical column to the values
+    to keep (None keeps everything, an empty list keeps nothing) and ranges
+    maps a numeric column to an inclusive (low, high) pair where either end
+    may be None. Bitmaps are bit-packed, so combining facets is a handful of
+    byte-wise ANDs/ORs and counting a facet value is a popcount.
+    """
+
+    def __init__(self, df, categorical=(), numeric=()):
+        self.index = df.index
+        self.size = len(df)
+        self._all = np.packbits(np.ones(self.size, dtype=bool))
+        self._values = {}
+        self._bitmaps = {}
+        for column in categorical:
+            codes, uniques = pd.factorize(df[column])
+            self._values[column] = list(uniques)
+            self._bitmaps[column] = {value: np.packbits(codes == code) for code, value in enumerate(uniques)}
+        self._sorted = {}
+        for column in numeric:
+            values = pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=float)
+            order = np.argsort(values, kind='stable')
+            present = ~np.isnan(values[order])
+            self._sorted[column] = (values[order][present], order[present])
+
+    def values(self, column):
+        """Return the distinct values of a categorical facet in order of appearance"""
+        return list(self._values[column])
+
+    def _value_bitmap(self, column, selected):
+        if selected is None:
+            return self._all
+        bitmap = np.zeros_like(self._all)
+        for value in selected:
+            value_bitmap = self._bitmaps[column].get(value)
+            if value_bitmap is not None:
+                bitmap |= value_bitmap
+        return bitmap
+
+    def _range_bitmap(self, column, low, high):
+        values, order = self._sorted[column]
+        start = 0 if low is None else np.searchsorted(values, low, side='left')
+        end = len(values) if high is None else np.searchsorted(values, high, side='right')
+        keep = np.zeros(self.size, dtype=bool)
+        keep[order[start:end]] = True
+        return np.packbits(keep)
+
+    def bitmap(self, selections=None, ranges=None, skip=None):
+        """Return the packed bitmap of rows passing every filter except the skip column"""
+        bitmap = self._all.copy()
+        for column, selected in (selections or {}).items():
+            if column != skip and selected is not None:
+                bitmap &= self._value_bitmap(column, selected)
+        for column, (low, high) in (ranges or {}).items():
+            if column != skip:
+                bitmap &= self._range_bitmap(column, low, high)
+        return bitmap
+
+    def mask(self, selections=None, ranges=None):
+        """Return a boolean row mask for the filters, aligned with the indexed frame"""
+        return np.unpackbits(self.bitmap(selections, ranges), count=self.size).astype(bool)
+
+    def counts(self, selections=None, ranges=None):
+        """Return {column: {value: rows}} for every categorical facet.
+
+        Each facet is counted with all the other filters applied but not its
+        own, so the counts say how many rows picking that value would give.
+        """
+        counts = {}
+        for column, bitmaps in self._bitmaps.items():
+            others = self.bitmap(selections, ranges, skip=column)
+            counts[column] = {value: int(POPCOUNT[others & bitmap].sum()) for value, bitmap in bitmaps.items()}
+        return counts
+
+
+class FacetIndexCache:
+    """Bounded LRU of facet indexes keyed on dataset version and facet columns"""
+
+    def __init__(self, maxsize=FACET_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._indexes = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, df, categorical=(), numeric=(), version=None):
+        """Return the facet index for df, building it on a miss"""
+        key = (version or dataset_version(df), tuple(categorical), tuple(numeric))
+        with self._lock:
+            if key in self._indexes:
+                self._indexes.move_to_end(key)
+                return self._indexes[key]
+
+        index = FacetIndex(df, categorical, numeric)
+        with self._lock:
+            self._indexes[key] = index
+            self._indexes.move_to_end(key)
+            while len(self._indexes) > self.maxsize:
+                self._indexes.popitem(last=False)
+        return index
+
+
+facet_indexes = FacetIndexCache()
+
+
+def get_facet_index(df, categorical=(), numeric=(), version=None):
+    """Return the shared facet index for this version of df"""
+    return facet_indexes.get(df, categorical, numeric, version)
+
+
+def with_count(counts):
+    """Return a multiselect format_func that shows each option's count"""
+    return lambda value: f"{value} ({counts.get(value, 0)})"
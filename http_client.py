@@ -0,0 +1,92 @@
+"""Shared pooled HTTP session for sheet and export fetches"""
+
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config import (HTTP_BACKOFF_FACTOR, HTTP_CONNECT_TIMEOUT, HTTP_MAX_RETRIES,
+                    HTTP_POOL_SIZE, HTTP_READ_TIMEOUT)
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+CHUNK_SIZE = 64 * 1024
+
+
+class HttpClient:
+    """Keep-alive session with bounded retries, timeouts and fetch counters.
+
+    One instance is shared by every loader so that several tabs or gids of
+    the same workbook reuse pooled connections instead of each paying a new
+    TLS handshake.
+    """
+
+    def __init__(self, pool_size=HTTP_POOL_SIZE, max_retries=HTTP_MAX_RETRIES,
+                 backoff_factor=HTTP_BACKOFF_FACTOR,
+                 timeout=(HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)):
+        self.timeout = timeout
+        self.session = requests.Session()
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self._lock = threading.Lock()
+        self._stats = {'requests': 0, 'errors': 0, 'retries': 0, 'bytes': 0, 'latency': 0.0}
+
+    def _record(self, **deltas):
+        with self._lock:
+            for key, value in deltas.items():
+                self._stats[key] += value
+
+    def get(self, url, headers=None, timeout=None):
+        """Open a streamed GET; read the body with iter_content or stream_to"""
+        start = time.perf_counter()
+        try:
+            response = self.session.get(url, headers=headers, timeout=timeout or self.timeout, stream=True)
+        except requests.RequestException:
+            self._record(requests=1, errors=1, latency=time.perf_counter() - start)
+            raise
+
+        retries = response.raw.retries
+        self._record(
+            requests=1,
+            errors=1 if response.status_code >= 400 else 0,
+            retries=len(retries.history) if retries is not None else 0,
+            latency=time.perf_counter() - start
+        )
+        return response
+
+    def iter_content(self, response, chunk_size=CHUNK_SIZE):
+        """Yield the body of a streamed response chunk by chunk, counting bytes"""
+        try:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                self._record(bytes=len(chunk))
+                yield chunk
+        finally:
+            response.close()
+
+    def stream_to(self, response, fileobj, chunk_size=CHUNK_SIZE):
+        """Write the body of a streamed response to fileobj and return its size"""
+        size = 0
+        for chunk in self.iter_content(response, chunk_size):
+            fileobj.write(chunk)
+            size += len(chunk)
+        return size
+
+    def stats(self):
+        """Return request, error, retry, byte and latency counters"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats['avg_latency'] = stats['latency'] / stats['requests'] if stats['requests'] else 0.0
+        return stats
+
+
+http_client = HttpClient()
@@ -0,0 +1,135 @@
+"""Pluggable grant insights, each recomputed only when the columns it reads change"""
+
+import hashlib
+import threading
+from collections import OrderedDict, namedtuple
+
+import pandas as pd
+
+from config import INSIGHT_CACHE_SIZE
+from derived import dataset_version
+
+# compute(df) returns the insight text, or None when it does not apply
+Insight = namedtuple('Insight', ['name', 'columns', 'compute'])
+
+INSIGHTS = []
+
+
+def insight(name, *columns):
+    """Register the decorated function as an insight that reads only these columns"""
+    def register(compute):
+        INSIGHTS.append(Insight(name, columns, compute))
+        return compute
+    return register
+
+
+@insight('total_funding', 'Funding')
+def total_funding(df):
+    return f"💰 Total available funding across all grants: ${df['Funding'].sum():,.0f}"
+
+
+@insight('average_funding', 'Funding')
+def average_funding(df):
+    if df['Funding'].count():
+        return f"📊 Average grant size: ${df['Funding'].mean():,.0f}"
+
+
+@insight('eligibility', 'Eligibility')
+def eligibility(df):
+    if len(df):
+        eligible_count = int((df['Eligibility'] == 'Yes').sum())
+        return f"✅ {eligible_count} grants ({eligible_count / len(df) * 100:.1f}%) match your eligibility criteria"
+
+
+@insight('urgent_deadlines', 'Urgency')
+def urgent_deadlines(df):
+    urgent_count = int((df['Urgency'] == 'Urgent').sum())
+    if urgent_count:
+        return f"🚨 {urgent_count} grants have deadlines within 2 weeks!"
+
+
+@insight('interested', 'Status')
+def interested(df):
+    interested_count = int((df['Status'] == 'Interested').sum())
+    return f"⭐ {interested_count} grants marked as 'Interested' - high priority opportunities"
+
+
+@insight('top_agency', 'Agency')
+def top_agency(df):
+    # Categorical agencies count every category, including ones filtered away
+    agencies = df['Agency'].value_counts()[lambda counts: counts > 0]
+    if not agencies.empty:
+        return f"🏛️ Most active agency: {agencies.index[0]} with {agencies.iloc[0]} grant opportunities"
+
+
+class InsightEngine:
+    """Runs registered insights with results cached on their input columns.
+
+    A result is looked up first by (insight, frame version), then by
+    (insight, content hash of the columns it declares), so a new dataset
+    version or filtered subset only recomputes insights whose inputs
+    changed. Column hashes are themselves cached per frame version.
+    """
+
+    def __init__(self, insights=INSIGHTS, maxsize=INSIGHT_CACHE_SIZE):
+        self.insights = insights
+        self.maxsize = maxsize
+        self.computed = 0
+        self.reused = 0
+        self._digests = OrderedDict()
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _remember(self, cache, key, value):
+        with self._lock:
+            cache[key] = value
+            cache.move_to_end(key)
+            while len(cache) > self.maxsize:
+                cache.popitem(last=False)
+
+    def _lookup(self, cache, key):
+        with self._lock:
+            if key in cache:
+                cache.move_to_end(key)
+                return True, cache[key]
+        return False, None
+
+    def _digest(self, df, version, column):
+        found, digest = self._lookup(self._digests, (version, column))
+        if not found:
+            hashes = pd.util.hash_pandas_object(df[column], index=False).to_numpy()
+            digest = hashlib.sha1(hashes.tobytes()).hexdigest()
+            self._remember(self._digests, (version, column), digest)
+        return digest
+
+    def run(self, df, version=None):
+        """Return the text of every insight that applies to df, in registration order"""
+        version = version or dataset_version(df)
+        texts = []
+        for item in self.insights:
+            if any(column not in df.columns for column in item.columns):
+                continue
+            found, text = self._lookup(self._results, (item.name, 'version', version))
+            if not found:
+                key = (item.name, 'columns', tuple(self._digest(df, version, column) for column in item.columns))
+                found, text = self._lookup(self._results, key)
+                if not found:
+                    text = item.compute(df)
+                    self._remember(self._results, key, text)
+                self._remember(self._results, (item.name, 'version', version), text)
+            with self._lock:
+                if found:
+                    self.reused += 1
+                else:
+                    self.computed += 1
+            if text:
+                texts.append(text)
+        return texts
+
+    def stats(self):
+        """Return how many insight results were computed and reused"""
+        with self._lock:
+            return {'computed': self.computed, 'reused': self.reused, 'entries': len(self._results)}
+
+
+insight_engine = InsightEngine()
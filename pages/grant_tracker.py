@@ -3,6 +3,10 @@ import pandas as pd
 import plotly.express as px
 from datetime import datetime, timedelta
 
+from charts import cached_figure
+from derived import dataset_version
+from facets import get_facet_index, with_count
+
 def show_grant_tracker():
     """Grant application tracking system"""
     st.header("Grant Application Tracker")
@@ -41,18 +45,26 @@ def show_grant_tracker():
                     'Notes': notes
                 }
                 st.session_state.grant_applications.append(new_app)
+                st.session_state.grant_applications_version = None
                 st.success("Application added successfully!")
                 st.rerun()
     
     # Display applications
     if st.session_state.grant_applications:
         df = pd.DataFrame(st.session_state.grant_applications)
+        # Hashed only after the applications change, not on every rerun
+        if st.session_state.get('grant_applications_version') is None:
+            st.session_state.grant_applications_version = dataset_version(df)
+        version = st.session_state.grant_applications_version
         
         # Status filter
+        facets = get_facet_index(df, ['Status'], version=version)
+        status_counts = facets.counts()['Status']
         status_filter = st.multiselect("Filter by Status", 
-            df['Status'].unique(), default=df['Status'].unique())
+            facets.values('Status'), default=facets.values('Status'),
+            format_func=with_count(status_counts))
         
-        filtered_df = df[df['Status'].isin(status_filter)]
+        filtered_df = df[facets.mask({'Status': status_filter})]
         
         # Display metrics
         col1, col2, col3, col4 = st.columns(4)
@@ -73,17 +85,25 @@ def show_grant_tracker():
         st.dataframe(filtered_df, use_container_width=True)
         
         # Status distribution chart
-        col1, col2 = st.columns(2)
-        with col1:
+        theme = st.get_option('theme.base')
+        
+        def status_chart():
             status_counts = filtered_df['Status'].value_counts()
-            fig = px.pie(values=status_counts.values, names=status_counts.index,
+            return px.pie(values=status_counts.values, names=status_counts.index,
                         title="Applications by Status")
-            st.plotly_chart(fig, use_container_width=True)
         
-        with col2:
+        def grant_type_chart():
             grant_type_amounts = filtered_df.groupby('Grant Type')['Amount Requested'].sum()
-            fig = px.bar(x=grant_type_amounts.index, y=grant_type_amounts.values,
+            return px.bar(x=grant_type_amounts.index, y=grant_type_amounts.values,
                         title="Requested Amount by Grant Type")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            fig = cached_figure('tracker_status', version, status_chart, {'Status': status_filter}, theme)
+            st.plotly_chart(fig, use_container_width=True)
+        
+        with col2:
+            fig = cached_figure('tracker_grant_type_amounts', version, grant_type_chart, {'Status': status_filter}, theme)
             st.plotly_chart(fig, use_container_width=True)
 
 def create_sample_applications():
@@ -0,0 +1,130 @@
+"""Cached sorted row orders for paging through filtered frames"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from datetime import date
+
+import numpy as np
+
+from config import PAGE_ORDER_CACHE_SIZE, SORT_INDEX_CACHE_SIZE
+from derived import dataset_version
+
+
+def order_key(*parts):
+    """Return a stable hash of the filter and sort settings that produce a row order"""
+    return hashlib.sha1(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class SortIndex:
+    """Argsort permutations of one frame, one per sort option.
+
+    sorts maps an option name to (column, ascending). Each permutation is
+    computed the first time its option is used and then reused, so ordering
+    a filtered subset is a boolean take from the permutation rather than a
+    sort. Missing values always sort last.
+    """
+
+    def __init__(self, df, sorts):
+        self.df = df
+        self.sorts = dict(sorts)
+        self._permutations = {}
+        self._lock = threading.Lock()
+
+    def permutation(self, sort_by):
+        """Return every row position of the frame in sort_by order"""
+        with self._lock:
+            permutation = self._permutations.get(sort_by)
+        if permutation is None:
+            column, ascending = self.sorts[sort_by]
+            values = self.df[column].reset_index(drop=True)
+            permutation = values.sort_values(ascending=ascending, kind='stable', na_position='last').index.to_numpy()
+            with self._lock:
+                self._permutations[sort_by] = permutation
+        return permutation
+
+    def order(self, sort_by, mask):
+        """Return the positions where mask is True, in sort_by order"""
+        permutation = self.permutation(sort_by)
+        return permutation[mask[permutation]]
+
+
+class SortIndexCache:
+    """Bounded LRU of sort indexes keyed on dataset version, day and sort options.
+
+    Sort columns such as the opportunity score are derived from the date,
+    so a permutation built yesterday is not reused today.
+    """
+
+    def __init__(self, maxsize=SORT_INDEX_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._indexes = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, df, sorts, version=None):
+        """Return the sort index for df, creating it on a miss"""
+        key = (version or dataset_version(df), date.today(), tuple(sorted(sorts.items())))
+        with self._lock:
+            if key in self._indexes:
+                self._indexes.move_to_end(key)
+                return self._indexes[key]
+            index = SortIndex(df, sorts)
+            self._indexes[key] = index
+            while len(self._indexes) > self.maxsize:
+                self._indexes.popitem(last=False)
+        return index
+
+
+sort_indexes = SortIndexCache()
+
+
+def get_sort_index(df, sorts, version=None):
+    """Return the shared sort index for this version of df"""
+    return sort_indexes.get(df, sorts, version)
+
+
+class PageOrderCache:
+    """Bounded LRU of filtered, sorted row positions keyed on order_key.
+
+    Once the order for a filter and sort is known, every page is a slice
+    of it, so paging back and forth never re-filters or re-sorts the frame.
+    """
+
+    def __init__(self, maxsize=PAGE_ORDER_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._orders = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, build):
+        """Return the row positions for key, calling build() on a miss"""
+        with self._lock:
+            if key in self._orders:
+                self._orders.move_to_end(key)
+                self.hits += 1
+                return self._orders[key]
+            self.misses += 1
+
+        positions = np.asarray(build(), dtype=np.int64)
+        with self._lock:
+            self._orders[key] = positions
+            self._orders.move_to_end(key)
+            while len(self._orders) > self.maxsize:
+                self._orders.popitem(last=False)
+        return positions
+
+
+page_orders = PageOrderCache()
+
+
+def page_count(total, page_size):
+    """Return the number of pages needed for total rows, at least one"""
+    return max((total - 1) // page_size + 1, 1)
+
+
+def page_slice(df, positions, page, page_size):
+    """Return the rows of df on this page of positions"""
+    start = page * page_size
+    return df.iloc[positions[start:start + page_size]]
@@ -0,0 +1,195 @@
+"""Compile saved filter specs into predicate plans over loaded frames"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+import pandas as pd
+
+from config import QUERY_CACHE_SIZE
+from dates import parse_date_column
+from facets import get_facet_index
+
+# Funding range slider labels and the amounts each covers; None is unbounded
+FUNDING_BANDS = {
+    "$0-25K": (0, 25000),
+    "$25K-50K": (25000, 50000),
+    "$50K-100K": (50000, 100000),
+    "$100K-250K": (100000, 250000),
+    "$250K-500K": (250000, 500000),
+    "$500K+": (500000, None)
+}
+
+# Which column each filter field reads in client and grant frames
+CLIENT_FILTER_COLUMNS = {
+    'categories': 'Grant_Type',
+    'industries': 'Industry',
+    'states': 'State',
+    'deadline': 'Deadline Type',
+    'funding_range': 'Amount_Requested',
+    'date_range': 'Application_Date'
+}
+GRANT_FILTER_COLUMNS = {
+    'categories': 'Category',
+    'deadline': 'Deadline Type',
+    'funding_range': 'Funding',
+    'date_range': 'Posted Date'
+}
+
+FILTER_FIELDS = ('categories', 'industries', 'states', 'funding_range', 'deadline', 'date_range')
+
+# kind is 'in' (value is a list) or 'range' (value is an inclusive low/high pair)
+Predicate = namedtuple('Predicate', ['field', 'column', 'kind', 'value'])
+
+
+def spec_hash(spec):
+    """Return a stable hash of the filter fields of a spec"""
+    fields = {field: spec.get(field) for field in FILTER_FIELDS}
+    return hashlib.sha1(json.dumps(fields, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def funding_bounds(funding_range):
+    """Turn a (low label, high label) slider value into an amount range"""
+    low_label, high_label = funding_range
+    return FUNDING_BANDS[low_label][0], FUNDING_BANDS[high_label][1]
+
+
+class QueryPlan:
+    """Ordered predicates for one filter spec against one frame layout.
+
+    Categorical predicates come first and run on the cached facet bitmaps;
+    range predicates then only look at the rows that survived. Filters the
+    frame lacks the column for are listed in skipped instead of failing.
+    """
+
+    def __init__(self, predicates, skipped):
+        self.predicates = predicates
+        self.skipped = skipped
+
+    def run(self, df, version):
+        """Return the boolean row mask of df that satisfies every predicate"""
+        categorical = [p for p in self.predicates if p.kind == 'in']
+        facets = get_facet_index(df, sorted({p.column for p in categorical}), version=version)
+        mask = facets.mask({p.column: p.value for p in categorical})
+
+        for predicate in self.predicates:
+            if predicate.kind != 'range':
+                continue
+            positions = np.flatnonzero(mask)
+            if not len(positions):
+                break
+            values = df[predicate.column].iloc[positions]
+            if predicate.field == 'date_range':
+                values = parse_date_column(values)
+            else:
+                values = pd.to_numeric(values, errors='coerce')
+            low, high = predicate.value
+            keep = values.notna().to_numpy(copy=True)
+            if low is not None:
+                keep &= (values >= low).to_numpy()
+            if high is not None:
+                keep &= (values <= high).to_numpy()
+            mask[positions[~keep]] = False
+        return mask
+
+
+def compile_filters(spec, columns, filter_columns, categories):
+    """Compile a filter spec into a QueryPlan for a frame with these columns.
+
+    categories maps category names to grant types; on frames whose category
+    column holds grant types the selected categories are expanded to them.
+    """
+    predicates, skipped = [], []
+
+    def target(field):
+        column = filter_columns.get(field)
+        if column is not None and column not in columns:
+            skipped.append(field)
+            return None
+        return column
+
+    if spec.get('categories'):
+        column = target('categories')
+        if column is not None:
+            values = list(spec['categories'])
+            if column != 'Category':
+                values = [grant for category in values for grant in categories.get(category, [])]
+            predicates.append(Predicate('categories', column, 'in', values))
+
+    for field in ('industries', 'states'):
+        if spec.get(field):
+            column = target(field)
+            if column is not None:
+                predicates.append(Predicate(field, column, 'in', list(spec[field])))
+
+    if spec.get('deadline') and spec['deadline'] != "All":
+        column = target('deadline')
+        if column is not None:
+            predicates.append(Predicate('deadline', column, 'in', [spec['deadline']]))
+
+    if spec.get('funding_range'):
+        bounds = funding_bounds(spec['funding_range'])
+        if bounds != (0, None):
+            column = target('funding_range')
+            if column is not None:
+                predicates.append(Predicate('funding_range', column, 'range', bounds))
+
+    date_range = spec.get('date_range')
+    if date_range is not None and len(date_range) == 2:
+        column = target('date_range')
+        if column is not None:
+            low, high = (pd.Timestamp(value) for value in date_range)
+            # The end date is inclusive, so it covers that whole day
+            end_of_day = high.normalize() + pd.Timedelta(days=1) - pd.Timedelta(nanoseconds=1)
+            predicates.append(Predicate('date_range', column, 'range', (low, end_of_day)))
+
+    return QueryPlan(predicates, skipped)
+
+
+class FilterResultCache:
+    """Bounded LRU of filter results keyed on dataset version and spec hash"""
+
+    def __init__(self, maxsize=QUERY_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def run(self, df, spec, filter_columns, categories, version):
+        """Return (filtered df, plan) for spec, reusing the mask computed for an identical spec.
+
+        version is the dataset version of df, computed once by its loader.
+        """
+        key = (version, spec_hash(spec), tuple(sorted(filter_columns.items())))
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None:
+                self._results.move_to_end(key)
+                self.hits += 1
+        if cached is None:
+            with self._lock:
+                self.misses += 1
+            plan = compile_filters(spec, df.columns, filter_columns, categories)
+            cached = (plan.run(df, version), plan)
+            with self._lock:
+                self._results[key] = cached
+                while len(self._results) > self.maxsize:
+                    self._results.popitem(last=False)
+        mask, plan = cached
+        return df[mask], plan
+
+    def stats(self):
+        """Return hit and miss counts and the number of cached results"""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._results)}
+
+
+filter_results = FilterResultCache()
+
+
+def run_filters(df, spec, filter_columns, categories, version):
+    """Return df filtered by spec and the plan that produced it, memoized per spec hash"""
+    return filter_results.run(df, spec, filter_columns, categories, version)
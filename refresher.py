@@ -0,0 +1,102 @@
+"""Stale-while-revalidate background refresh of loaded datasets"""
+
+import threading
+import time
+
+from config import REFRESH_INTERVAL
+from derived import dataset_version
+
+
+class DatasetRefresher:
+    """Reload a dataset every `interval` seconds on a daemon thread.
+
+    Readers always get the last good dataset immediately; a finished reload
+    is swapped in as one (df, version, loaded_at) tuple, so nobody ever sees
+    a half-built frame. `load` returns a DataFrame; on_change(df, version)
+    runs after a reload whose content differs from the previous one. version
+    seeds the version of data the caller already has (and has persisted), so
+    a first reload of the same data is not reported as a change.
+    """
+
+    def __init__(self, load, interval=REFRESH_INTERVAL, on_change=None, name='dataset', version=None):
+        self.load = load
+        self.interval = interval
+        self.on_change = on_change
+        self.name = name
+        self._current = (None, None, None)
+        self._version = version
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._stats = {'refreshes': 0, 'failures': 0, 'last_duration': None, 'last_error': None}
+
+    def start(self):
+        """Start the refresh thread if it is not running yet"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name=f"{self.name}-refresher", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Ask the refresh thread to exit after its current reload"""
+        self._stop.set()
+
+    def _run(self):
+        while True:
+            self.refresh()
+            if self._stop.wait(self.interval):
+                return
+
+    def refresh(self):
+        """Reload now on the calling thread; keeps the old dataset on failure"""
+        start = time.perf_counter()
+        try:
+            df = self.load()
+        except Exception as e:
+            with self._lock:
+                self._stats['failures'] += 1
+                self._stats['last_error'] = str(e)
+                self._stats['last_duration'] = time.perf_counter() - start
+            return False
+
+        version = dataset_version(df)
+        with self._lock:
+            changed = version != self._version
+            self._current = (df, version, time.time())
+            self._version = version
+            self._stats['refreshes'] += 1
+            self._stats['last_error'] = None
+            self._stats['last_duration'] = time.perf_counter() - start
+
+        if changed and self.on_change is not None:
+            self.on_change(df, version)
+        return True
+
+    def current(self):
+        """Return (df, version, loaded_at) of the last good dataset"""
+        with self._lock:
+            return self._current
+
+    def status(self):
+        """Return the data age, last refresh duration and refresh counters"""
+        with self._lock:
+            status = dict(self._stats)
+            loaded_at = self._current[2]
+        status['age'] = time.time() - loaded_at if loaded_at is not None else None
+        return status
+
+
+_refreshers = {}
+_refreshers_lock = threading.Lock()
+
+
+def get_refresher(key, load, **kwargs):
+    """Return the running refresher for key, creating and starting it on first use"""
+    with _refreshers_lock:
+        refresher = _refreshers.get(key)
+        if refresher is None:
+            refresher = _refreshers[key] = DatasetRefresher(load, name=str(key), **kwargs)
+    refresher.start()
+    return refresher
@@ -0,0 +1,104 @@
+"""Process-wide registry of loaded datasets shared by every session"""
+
+import threading
+import weakref
+from collections import OrderedDict
+
+from compact import memory_usage
+from config import DATASET_REGISTRY_SIZE
+from derived import dataset_version
+
+class DatasetLease:
+    """A session's hold on one registered version; keep it in session state.
+
+    The version stays registered for as long as any lease on it is alive,
+    so it is released when the session replaces its data or goes away.
+    """
+
+    def __init__(self, version):
+        self.version = version
+
+
+class DatasetRegistry:
+    """Bounded LRU of prepared datasets keyed on the raw data's version id.
+
+    Sessions keep only the version id and a lease on it. Registering data
+    that is already registered reuses the shared frame instead of preparing
+    another copy, so forty sessions on the same sheet hold one dataset
+    between them. Only versions no session leases are evicted, so the
+    registry can exceed maxsize while more versions than that are in use.
+    """
+
+    def __init__(self, maxsize=DATASET_REGISTRY_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._leases = {}
+        self._lock = threading.Lock()
+
+    def _evict(self):
+        unpinned = [version for version in self._entries if not self._leases.get(version)]
+        for version in unpinned[:max(len(self._entries) - self.maxsize, 0)]:
+            del self._entries[version]
+            self._leases.pop(version, None)
+
+    def register(self, df, prepare=None):
+        """Add df, prepared with prepare(df) -> (frame, info), and return its version"""
+        version = dataset_version(df)
+        with self._lock:
+            if version in self._entries:
+                self._entries.move_to_end(version)
+                self.hits += 1
+                return version
+            self.misses += 1
+
+        frame, info = prepare(df) if prepare is not None else (df, {})
+        with self._lock:
+            if version not in self._entries:
+                self._entries[version] = {'frame': frame, 'info': info, 'bytes': memory_usage(frame)['total']}
+            self._entries.move_to_end(version)
+            self._evict()
+        return version
+
+    def lease(self, version):
+        """Return a lease that keeps version registered until it is garbage collected"""
+        lease = DatasetLease(version)
+        with self._lock:
+            self._leases.setdefault(version, weakref.WeakSet()).add(lease)
+        return lease
+
+    def get(self, version):
+        """Return a shallow view of the dataset for version, or None if it is not registered.
+
+        Sessions may add or replace columns on the view; the shared frame is
+        never edited in place.
+        """
+        with self._lock:
+            entry = self._entries.get(version)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(version)
+            self.hits += 1
+        return entry['frame'].copy(deep=False)
+
+    def info(self, version):
+        """Return what prepare reported for version, or an empty dict"""
+        with self._lock:
+            entry = self._entries.get(version)
+        return entry['info'] if entry is not None else {}
+
+    def stats(self):
+        """Return hit/miss counts, the number of datasets and their memory in bytes"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self._entries),
+                'leased': sum(1 for version in self._entries if self._leases.get(version)),
+                'bytes': sum(entry['bytes'] for entry in self._entries.values())
+            }
+
+
+dataset_registry = DatasetRegistry()
@@ -0,0 +1,221 @@
+"""Saved filter searches persisted in SQLite with materialized results"""
+
+import json
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import datetime
+
+import pandas as pd
+
+from config import SAVED_SEARCH_DB, SAVED_SEARCH_VERSIONS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS saved_searches (
+    name TEXT PRIMARY KEY,
+    spec TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    seen_ids TEXT,
+    viewed_at TEXT
+);
+CREATE TABLE IF NOT EXISTS search_results (
+    name TEXT NOT NULL,
+    version TEXT NOT NULL,
+    result_ids TEXT NOT NULL,
+    PRIMARY KEY (name, version)
+);
+CREATE TABLE IF NOT EXISTS stored_versions (
+    dataset TEXT NOT NULL,
+    version TEXT NOT NULL,
+    PRIMARY KEY (dataset, version)
+);
+CREATE TABLE IF NOT EXISTS version_rows (
+    dataset TEXT NOT NULL,
+    version TEXT NOT NULL,
+    label TEXT NOT NULL,
+    row_hash TEXT NOT NULL,
+    PRIMARY KEY (dataset, version, label)
+);
+DROP TABLE IF EXISTS dataset_versions;
+DROP TABLE IF EXISTS dataset_rows;
+"""
+
+
+def _row_hashes(df):
+    """Return {json label: row hash} for every row of df"""
+    hashes = pd.util.hash_pandas_object(df.astype(object), index=False)
+    return {json.dumps(label): str(value) for label, value in zip(df.index.tolist(), hashes.tolist())}
+
+
+class SavedSearchStore:
+    """Saved searches whose result ids are kept current for one dataset.
+
+    refresh() is called with each loaded dataset version. Row hashes and
+    results are stored per version for the newest `keep` versions, so
+    sessions on different versions each find theirs already computed
+    instead of overwriting one another. A version seen for the first time
+    re-evaluates only the rows whose content hash differs from the newest
+    stored version a search has results for, so large datasets with small
+    edits keep their saved results up to date cheaply. Each search also
+    remembers the ids seen when it was last opened, which gives the
+    "new since last view" count.
+    """
+
+    def __init__(self, path=SAVED_SEARCH_DB, dataset='clients', keep=SAVED_SEARCH_VERSIONS):
+        self.path = path
+        self.dataset = dataset
+        self.keep = keep
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self):
+        if not self._initialized:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        connection = sqlite3.connect(self.path)
+        if not self._initialized:
+            connection.executescript(SCHEMA)
+            self._initialized = True
+        return connection
+
+    def save(self, name, spec):
+        """Store or replace a saved search; its results are computed on the next refresh"""
+        with self._lock, closing(self._connect()) as db, db:
+            db.execute(
+                "INSERT OR REPLACE INTO saved_searches (name, spec, created_at) VALUES (?, ?, ?)",
+                (name, json.dumps(spec, default=str), datetime.now().isoformat(timespec='seconds'))
+            )
+            db.execute("DELETE FROM search_results WHERE name = ?", (name,))
+
+    def delete(self, name):
+        """Remove a saved search"""
+        with self._lock, closing(self._connect()) as db, db:
+            db.execute("DELETE FROM saved_searches WHERE name = ?", (name,))
+            db.execute("DELETE FROM search_results WHERE name = ?", (name,))
+
+    def _result_ids(self, db, name, version):
+        row = db.execute(
+            "SELECT result_ids FROM search_results WHERE name = ? AND version = ?", (name, version)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def searches(self, version):
+        """Return every saved search with its spec and its result and new-match counts for version.
+
+        pending is True until a refresh has computed its results for version.
+        """
+        with self._lock, closing(self._connect()) as db:
+            rows = db.execute(
+                "SELECT name, spec, created_at, seen_ids, viewed_at FROM saved_searches ORDER BY name"
+            ).fetchall()
+            results = {name: self._result_ids(db, name, version) for name, *_ in rows}
+        searches = []
+        for name, spec, created_at, seen_ids, viewed_at in rows:
+            ids = results[name] or []
+            seen = set(json.loads(seen_ids)) if seen_ids else set()
+            searches.append({
+                'name': name,
+                'spec': json.loads(spec),
+                'created_at': created_at,
+                'viewed_at': viewed_at,
+                'pending': results[name] is None,
+                'matches': len(ids),
+                'new_matches': sum(1 for label in ids if label not in seen) if viewed_at else 0
+            })
+        return searches
+
+    def _store_rows(self, db, df, version):
+        """Store the row hashes of version and drop versions beyond the newest `keep`"""
+        db.execute("INSERT INTO stored_versions (dataset, version) VALUES (?, ?)", (self.dataset, version))
+        db.executemany(
+            "INSERT INTO version_rows (dataset, version, label, row_hash) VALUES (?, ?, ?, ?)",
+            [(self.dataset, version, key, value) for key, value in _row_hashes(df).items()]
+        )
+        stale = [row[0] for row in db.execute(
+            "SELECT version FROM stored_versions WHERE dataset = ? ORDER BY rowid DESC LIMIT -1 OFFSET ?",
+            (self.dataset, max(self.keep, 1))
+        )]
+        for old in stale:
+            db.execute("DELETE FROM stored_versions WHERE dataset = ? AND version = ?", (self.dataset, old))
+            db.execute("DELETE FROM version_rows WHERE dataset = ? AND version = ?", (self.dataset, old))
+            db.execute("DELETE FROM search_results WHERE version = ?", (old,))
+
+    def _rows(self, db, version):
+        return dict(db.execute(
+            "SELECT label, row_hash FROM version_rows WHERE dataset = ? AND version = ?", (self.dataset, version)
+        ))
+
+    def refresh(self, df, version, evaluate):
+        """Make sure every saved search has results for this version of df.
+
+        evaluate(frame, spec, version) returns the index labels of frame that
+        match spec; version identifies frame for the caller's filter caches.
+        A version whose rows and results are already stored costs two lookups.
+        """
+        with self._lock, closing(self._connect()) as db, db:
+            searches = db.execute(
+                "SELECT name, spec FROM saved_searches WHERE name NOT IN "
+                "(SELECT name FROM search_results WHERE version = ?)",
+                (version,)
+            ).fetchall()
+            stored = db.execute(
+                "SELECT 1 FROM stored_versions WHERE dataset = ? AND version = ?", (self.dataset, version)
+            ).fetchone()
+            if stored and not searches:
+                return
+            if not stored:
+                self._store_rows(db, df, version)
+
+            current, diffs = None, {}
+            for name, spec in searches:
+                spec = json.loads(spec)
+                base = db.execute(
+                    "SELECT r.version, r.result_ids FROM search_results r JOIN stored_versions v "
+                    "ON v.dataset = ? AND v.version = r.version "
+                    "WHERE r.name = ? AND r.version != ? ORDER BY v.rowid DESC LIMIT 1",
+                    (self.dataset, name, version)
+                ).fetchone()
+                if base is None:
+                    ids = pd.Index(evaluate(df, spec, version)).tolist()
+                else:
+                    base_version, result_ids = base
+                    if base_version not in diffs:
+                        current = current if current is not None else self._rows(db, version)
+                        old = self._rows(db, base_version)
+                        changed = [json.loads(key) for key, value in current.items() if old.get(key) != value]
+                        removed = {json.loads(key) for key in old.keys() - current.keys()}
+                        diffs[base_version] = (changed, removed)
+                    changed, removed = diffs[base_version]
+                    # Only the changed rows can enter or leave the result
+                    stale = removed.union(changed)
+                    ids = [label for label in json.loads(result_ids) if label not in stale]
+                    if changed:
+                        # The changed rows are fixed by the two versions, so they name the subset
+                        ids += pd.Index(evaluate(
+                            df.loc[changed], spec, f"{version}:changed-since:{base_version}"
+                        )).tolist()
+                db.execute(
+                    "INSERT OR REPLACE INTO search_results (name, version, result_ids) VALUES (?, ?, ?)",
+                    (name, version, json.dumps(ids))
+                )
+
+    def open(self, name, version):
+        """Return a saved search's spec, result ids for version and the ids new since it was last opened"""
+        with self._lock, closing(self._connect()) as db, db:
+            row = db.execute(
+                "SELECT spec, seen_ids, viewed_at FROM saved_searches WHERE name = ?", (name,)
+            ).fetchone()
+            if row is None:
+                return None
+            spec, seen_ids, viewed_at = row
+            ids = self._result_ids(db, name, version) or []
+            seen = set(json.loads(seen_ids)) if seen_ids else set()
+            new_ids = [label for label in ids if label not in seen] if viewed_at else []
+            db.execute(
+                "UPDATE saved_searches SET seen_ids = ?, viewed_at = ? WHERE name = ?",
+                (json.dumps(ids), datetime.now().isoformat(timespec='seconds'), name)
+            )
+        return {'spec': json.loads(spec), 'ids': ids, 'new_ids': new_ids}
+
+
+saved_searches = SavedSearchStore()
@@ -0,0 +1,137 @@
+"""Declared column schemas for grant and client sheets"""
+
+import pandas as pd
+
+# Column kinds:
+#   category - low-cardinality labels, stored as pandas categoricals
+#   text     - free text and codes that must never be sniffed as numbers
+#   number   - amounts; "$50,000"-style text is cleaned and coerced
+#   date     - raw date strings, kept as text and parsed by dates.normalize_dates
+GRANT_SCHEMA = {
+    'Grant Type': 'category',
+    'Opportunity Number': 'text',
+    'Status': 'category',
+    'Title': 'text',
+    'URL': 'text',
+    'Goal': 'text',
+    'Success Criteria': 'text',
+    'Notes': 'text',
+    'Eligibility': 'category',
+    'Eligibility Notes': 'text',
+    'Duration': 'text',
+    'Agency': 'category',
+    'Agency Email': 'text',
+    'Agency Phone': 'text',
+    'Posted Date': 'date',
+    'Response Date': 'date',
+    'Funding': 'number',
+    'Award Ceiling': 'number',
+    'Award Floor': 'number',
+    'Created': 'date',
+    'Last Modified': 'date',
+    'client': 'text',
+    'Email': 'text',
+    'Business': 'text',
+    'Summary': 'text',
+    'NSIC code': 'text',
+    'Industry': 'category',
+    'phone number': 'text',
+    'State': 'category',
+    'Country': 'category',
+    'Address': 'text'
+}
+
+CLIENT_SCHEMA = {
+    'client': 'text',
+    'Email': 'text',
+    'Business': 'text',
+    'Summary': 'text',
+    'NSIC code': 'text',
+    'Nsic code': 'text',
+    'Nsic_code': 'text',
+    'Industry': 'category',
+    'phone number': 'text',
+    'phone_number': 'text',
+    'State': 'category',
+    'Country': 'category',
+    'Address': 'text',
+    'Grant_Type': 'category',
+    'Amount_Requested': 'number',
+    'Status': 'category',
+    'Application_Date': 'date'
+}
+
+_READ_DTYPES = {'category': 'category', 'text': str, 'date': str}
+
+
+def read_csv_dtypes(schema):
+    """Return the read_csv dtype mapping for schema.
+
+    Number columns are left to the parser and coerced afterwards, so one
+    stray "$1,000" cell cannot fail the whole load.
+    """
+    return {column: _READ_DTYPES[kind] for column, kind in schema.items() if kind in _READ_DTYPES}
+
+
+def _coerce_number(values):
+    if pd.api.types.is_numeric_dtype(values):
+        return values
+    cleaned = values.astype(str).str.replace(r'[$,\s]', '', regex=True)
+    return pd.to_numeric(cleaned.where(values.notna()), errors='coerce')
+
+
+def _coerce_text(values):
+    if values.dtype == object or pd.api.types.is_string_dtype(values):
+        return values
+    return values.astype(object).where(values.isna(), values.astype(str))
+
+
+def apply_schema(df, schema):
+    """Cast df to the declared column kinds and report any schema drift.
+
+    The report lists declared columns missing from df, columns df has that
+    the schema does not declare, text/number columns that arrived with the
+    wrong dtype, and how many values per number column could not be coerced.
+    """
+    report = {
+        'missing': [column for column in schema if column not in df.columns],
+        'unexpected': [column for column in df.columns if column not in schema],
+        'retyped': {},
+        'coerced_to_null': {}
+    }
+
+    typed = {}
+    for column, kind in schema.items():
+        if column not in df.columns:
+            continue
+        values = df[column]
+        if kind == 'category':
+            converted = values if isinstance(values.dtype, pd.CategoricalDtype) else values.astype('category')
+        elif kind == 'number':
+            converted = _coerce_number(values)
+            lost = int(converted.isna().sum() - values.isna().sum())
+            if lost:
+                report['coerced_to_null'][column] = lost
+        else:
+            converted = _coerce_text(values)
+
+        if converted is not values:
+            typed[column] = converted
+            # Text becoming a categorical is the expected cast; anything else is drift
+            if kind != 'category':
+                report['retyped'][column] = f"{values.dtype} -> {converted.dtype}"
+
+    return df.assign(**typed) if typed else df, report
+
+
+def has_drift(report):
+    """Return True if a schema report shows anything other than a clean match"""
+    return any(report.values())
+
+
+def describe_drift(report):
+    """Summarize the type drift in a schema report as one line, or '' if there is none"""
+    parts = [f"{column} arrived as {change}" for column, change in report['retyped'].items()]
+    parts += [f"{count} {column} values could not be read as numbers"
+              for column, count in report['coerced_to_null'].items()]
+    return '; '.join(parts)
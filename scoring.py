@@ -0,0 +1,98 @@
+"""Grant opportunity scoring for the Grant Dashboard"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from dates import date_column, row_date
+
+MAX_SCORE = 100
+ELIGIBILITY_POINTS = 30
+STATUS_SCORES = {'Interested': 20, 'Under Review': 15, 'New': 10, 'Not Interested': 0}
+
+# (days left greater than, points) - anything at or below the last bound scores 5
+DEADLINE_BUCKETS = [(90, 20), (30, 15), (7, 10)]
+DEADLINE_FLOOR_POINTS = 5
+
+# (funding at least, points) - anything below the last bound scores 10
+FUNDING_BUCKETS = [(1000000, 30), (500000, 25), (250000, 20), (100000, 15)]
+FUNDING_FLOOR_POINTS = 10
+
+
+def calculate_grant_score(grant_data, now=None):
+    """Calculate a comprehensive grant opportunity score"""
+    score = 0
+    now = now or datetime.now()
+
+    # Eligibility (30 points)
+    if grant_data['Eligibility'] == 'Yes':
+        score += ELIGIBILITY_POINTS
+
+    # Status (20 points)
+    score += STATUS_SCORES.get(grant_data['Status'], 0)
+
+    # Deadline urgency (20 points)
+    response_date = row_date(grant_data, 'Response Date')
+    if response_date:
+        days_left = (response_date - now).days
+        for bound, points in DEADLINE_BUCKETS:
+            if days_left > bound:
+                score += points
+                break
+        else:
+            score += DEADLINE_FLOOR_POINTS
+
+    # Funding amount (30 points)
+    funding = grant_data['Funding']
+    for bound, points in FUNDING_BUCKETS:
+        if funding >= bound:
+            score += points
+            break
+    else:
+        score += FUNDING_FLOOR_POINTS
+
+    return min(score, MAX_SCORE)
+
+
+def score_components(df, now=None):
+    """Return the eligibility, status, deadline and funding score columns for df"""
+    now = pd.Timestamp(now or datetime.now())
+
+    eligibility = np.where(df['Eligibility'] == 'Yes', ELIGIBILITY_POINTS, 0)
+
+    status = df['Status'].map(STATUS_SCORES).fillna(0).to_numpy(dtype=np.int64)
+
+    response_dates = date_column(df, 'Response Date')
+    days_left = (response_dates - now).dt.days
+    has_deadline = days_left.notna().to_numpy()
+    days_left = days_left.to_numpy(dtype=float, na_value=np.nan)
+    deadline = np.select(
+        [days_left > bound for bound, _ in DEADLINE_BUCKETS],
+        [points for _, points in DEADLINE_BUCKETS],
+        default=DEADLINE_FLOOR_POINTS
+    )
+    deadline = np.where(has_deadline, deadline, 0)
+
+    funding_values = df['Funding'].to_numpy()
+    funding = np.select(
+        [funding_values >= bound for bound, _ in FUNDING_BUCKETS],
+        [points for _, points in FUNDING_BUCKETS],
+        default=FUNDING_FLOOR_POINTS
+    )
+
+    return pd.DataFrame({
+        'Eligibility': eligibility,
+        'Status': status,
+        'Deadline': deadline,
+        'Funding': funding
+    }, index=df.index).astype(np.int64)
+
+
+def score_grants(df, now=None):
+    """Vectorized equivalent of df.apply(calculate_grant_score, axis=1)"""
+    if df.empty:
+        return pd.Series(dtype=np.int64, index=df.index, name='Opportunity Score')
+
+    scores = score_components(df, now).sum(axis=1).clip(upper=MAX_SCORE)
+    return scores.rename('Opportunity Score')
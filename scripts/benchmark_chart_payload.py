@@ -0,0 +1,65 @@
+"""Benchmark deadline timeline payload size and build time against row count"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.io as pio
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from charts import downsample, render_mode
+from derived import urgency_buckets
+
+
+def make_deadlines(rows, seed=42):
+    """Build a synthetic deadline frame shaped like the analytics hub's"""
+    rng = np.random.default_rng(seed)
+    now = pd.Timestamp.now().normalize()
+    days_left = rng.integers(0, 365, size=rows)
+    return pd.DataFrame({
+        'Title': [f"Grant {i}" for i in range(rows)],
+        'Days Left': days_left,
+        'Response Date': now + pd.to_timedelta(days_left, unit='D'),
+        'Urgency': urgency_buckets(pd.Series(days_left))
+    })
+
+
+def timeline(df, sampled):
+    """Build the timeline figure from every row or from the downsampled rows"""
+    shown = downsample(df, 'Response Date', 'Days Left', by='Urgency') if sampled else df
+    return px.scatter(
+        shown, x='Response Date', y='Days Left', color='Urgency', hover_data=['Title'],
+        render_mode=render_mode(len(df)) if sampled else 'auto'
+    )
+
+
+def measure(df, sampled):
+    """Return (payload bytes, build + serialize seconds, points plotted)"""
+    start = time.perf_counter()
+    figure = timeline(df, sampled)
+    payload = pio.to_json(figure, validate=False)
+    elapsed = time.perf_counter() - start
+    return len(payload), elapsed, sum(len(trace.x) for trace in figure.data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'mode':>12} {'points':>8} {'payload (KB)':>13} {'build (ms)':>11}")
+    for rows in args.rows:
+        df = make_deadlines(rows)
+        for sampled in (False, True):
+            size, elapsed, points = measure(df, sampled)
+            mode = 'downsampled' if sampled else 'full'
+            print(f"{rows:>8} {mode:>12} {points:>8} {size / 1024:>13,.1f} {elapsed * 1000:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
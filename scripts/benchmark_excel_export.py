@@ -0,0 +1,88 @@
+"""Benchmark the streaming Excel export against an in-memory openpyxl ExcelWriter"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from export import ExcelExporter
+
+
+def make_grants(rows, seed=42):
+    """Build a synthetic grants frame with text, numeric and date columns"""
+    rng = np.random.default_rng(seed)
+    posted = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 365, size=rows), unit='D')
+    return pd.DataFrame({
+        'Title': [f"Grant program {i}" for i in range(rows)],
+        'Agency': rng.choice(['NSF', 'NIH', 'DOE', 'USDA', 'HUD', 'SBA'], size=rows),
+        'Status': rng.choice(['New', 'Interested', 'Under Review', 'Not Interested'], size=rows),
+        'Eligibility': rng.choice(['Yes', 'No'], size=rows),
+        'Funding': rng.integers(10000, 2000000, size=rows),
+        'Award Ceiling': rng.integers(100000, 5000000, size=rows),
+        'Posted Date': posted,
+        'Response Date': posted + pd.to_timedelta(rng.integers(14, 180, size=rows), unit='D'),
+        'Notes': rng.choice(['Priority for rural applicants', 'Matching funds required', None], size=rows)
+    })
+
+
+def summary(df):
+    """Summary rows as the previous export computed them"""
+    return [
+        ('Metric', 'Value'),
+        ('Total Grants', len(df)),
+        ('Total Funding', f"${df['Funding'].sum():,.0f}"),
+        ('Average Funding', f"${df['Funding'].mean():,.0f}"),
+        ('Eligible Grants', int((df['Eligibility'] == 'Yes').sum())),
+        ('Interested Grants', int((df['Status'] == 'Interested').sum()))
+    ]
+
+
+def excel_writer_export(df):
+    """The previous export: the whole workbook built in a BytesIO through pd.ExcelWriter"""
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+        df.to_excel(writer, sheet_name='All Grants', index=False)
+        rows = summary(df)
+        pd.DataFrame(rows[1:], columns=rows[0]).to_excel(writer, sheet_name='Summary', index=False)
+    return output
+
+
+def measure(func):
+    """Return (seconds, peak traced bytes) of func, timed without tracemalloc's overhead"""
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000])
+    parser.add_argument('--skip-writer', action='store_true', help="only time the streaming export")
+    args = parser.parse_args()
+
+    exporter = ExcelExporter()
+    print(f"{'rows':>8} {'export':>10} {'seconds':>8} {'rows/s':>9} {'peak (MB)':>10}")
+    for rows in args.rows:
+        df = make_grants(rows)
+        exports = [('streaming', lambda: exporter.export(df, summary(df)).close())]
+        if not args.skip_writer:
+            exports.append(('writer', lambda: excel_writer_export(df)))
+        for name, func in exports:
+            elapsed, peak = measure(func)
+            print(f"{rows:>8} {name:>10} {elapsed:>8.2f} {rows / elapsed:>9,.0f} {peak / 1024 ** 2:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Benchmark the vectorized grant scorer against the row-wise calculate_grant_score"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scoring import calculate_grant_score, score_grants
+
+
+def make_grants(rows, seed=42):
+    """Build a synthetic grants frame with mixed date formats and blanks"""
+    rng = np.random.default_rng(seed)
+    today = datetime.now()
+    offsets = rng.integers(-30, 365, size=rows)
+    formats = ["%Y-%m-%d", "%m/%d/%Y", "%d/%m/%Y", "%Y-%m-%d %H:%M:%S"]
+    response_dates = [
+        (today + timedelta(days=int(offset))).strftime(formats[i % len(formats)])
+        for i, offset in enumerate(offsets)
+    ]
+    for i in range(0, rows, 50):
+        response_dates[i] = ''
+
+    return pd.DataFrame({
+        'Eligibility': rng.choice(['Yes', 'No'], size=rows),
+        'Status': rng.choice(['New', 'Under Review', 'Interested', 'Not Interested', 'Archived'], size=rows),
+        'Response Date': response_dates,
+        'Funding': rng.integers(10000, 2000000, size=rows)
+    })
+
+
+def time_call(func, repeat):
+    """Return the best wall-clock time of func over repeat runs"""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 50000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'row-wise (s)':>14} {'vectorized (s)':>16} {'speedup':>9}  match")
+    for rows in args.rows:
+        df = make_grants(rows)
+        now = datetime.now()
+        rowwise_time, expected = time_call(
+            lambda: df.apply(calculate_grant_score, axis=1, now=now), args.repeat
+        )
+        vector_time, actual = time_call(lambda: score_grants(df, now=now), args.repeat)
+        match = bool((expected.to_numpy() == actual.to_numpy()).all())
+        print(f"{rows:>8} {rowwise_time:>14.4f} {vector_time:>16.4f} {rowwise_time / vector_time:>8.1f}x  {match}")
+
+
+if __name__ == "__main__":
+    main()
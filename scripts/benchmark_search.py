@@ -0,0 +1,82 @@
+"""Benchmark the inverted search index against chained str.contains scans"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from search_index import GrantSearchIndex
+
+WORDS = [
+    'research', 'innovation', 'rural', 'community', 'health', 'energy', 'education', 'veterans',
+    'housing', 'arts', 'culture', 'youth', 'disaster', 'relief', 'biomedical', 'agricultural',
+    'technology', 'transfer', 'small', 'business', 'women', 'minority', 'stem', 'teacher',
+    'environmental', 'efficiency', 'renewable', 'accessibility', 'preservation', 'development'
+]
+
+
+def make_grants(rows, seed=42):
+    """Build a synthetic grants frame with varied Title/Goal/Notes text"""
+    rng = np.random.default_rng(seed)
+
+    def sentences(length):
+        picks = rng.choice(WORDS, size=(rows, length))
+        ids = rng.integers(0, rows, size=rows)
+        return [' '.join(words) + f" program {i}" for words, i in zip(picks, ids)]
+
+    return pd.DataFrame({'Title': sentences(4), 'Goal': sentences(12), 'Notes': sentences(10)})
+
+
+def contains_search(df, query):
+    """The previous search: a case-insensitive substring scan of each field"""
+    mask = (
+        df['Title'].str.contains(query, case=False, na=False) |
+        df['Goal'].str.contains(query, case=False, na=False) |
+        df['Notes'].str.contains(query, case=False, na=False)
+    )
+    return df.index[mask]
+
+
+def best_time(func, repeat):
+    """Return the best wall-clock time of func over repeat runs"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--queries', nargs='+', default=['biomed', 'rural housing', 'veterans relief youth', 'program 4242'])
+    args = parser.parse_args()
+
+    df = make_grants(args.rows)
+    index = GrantSearchIndex()
+    start = time.perf_counter()
+    index.sync(df)
+    print(f"indexed {args.rows} grants in {time.perf_counter() - start:.2f}s")
+
+    edited = df.copy()
+    edited.loc[edited.index[:100], 'Notes'] = 'updated notes'
+    start = time.perf_counter()
+    changed, removed = index.copy().sync(edited)
+    print(f"resynced {changed} changed rows in {time.perf_counter() - start:.2f}s (including copy)")
+
+    print(f"{'query':>24} {'str.contains (ms)':>18} {'index (ms)':>11} {'hits':>7}")
+    for query in args.queries:
+        scan_time = best_time(lambda: contains_search(df, query), args.repeat)
+        index_time = best_time(lambda: index.search(query), args.repeat)
+        print(f"{query:>24} {scan_time * 1000:>18.2f} {index_time * 1000:>11.3f} {len(index.search(query)):>7}")
+
+
+if __name__ == "__main__":
+    main()
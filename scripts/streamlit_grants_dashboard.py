@@ -5,7 +5,13 @@ import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import requests
 import numpy as np
-from io import StringIO
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from schema import CLIENT_SCHEMA, apply_schema, describe_drift, read_csv_dtypes
+from sheet_fetch import csv_export_url, sheet_client
 
 # Page configuration
 st.set_page_config(
@@ -204,15 +210,16 @@ def load_google_sheets_data():
     try:
         # Convert Google Sheets URL to CSV export URL
         sheet_id = "1xok6PwIk5Kyj78KhBFkjJYGNSdkosxeXliTy0Alt3bc"
-        csv_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv&gid=0"
+        csv_url = csv_export_url(sheet_id, gid=0)
         
-        response = requests.get(csv_url, timeout=10)
-        if response.status_code == 200:
-            df = pd.read_csv(StringIO(response.text))
-            return df
-        else:
-            st.warning("Could not load live data. Using sample data.")
-            return generate_sample_data()
+        df = sheet_client.fetch_csv(csv_url, dtype=read_csv_dtypes(CLIENT_SCHEMA))
+        df, schema_report = apply_schema(df, CLIENT_SCHEMA)
+        if describe_drift(schema_report):
+            st.warning(f"Sheet schema drift: {describe_drift(schema_report)}")
+        return df
+    except requests.HTTPError:
+        st.warning("Could not load live data. Using sample data.")
+        return generate_sample_data()
     except Exception as e:
         st.warning(f"Error loading data: {str(e)}. Using sample data.")
         return generate_sample_data()
@@ -468,7 +475,7 @@ def show_analytics(df):
         with col2:
             st.subheader("Success Rate by Grant Type")
             if 'Grant_Type' in df.columns:
-                success_rate = df.groupby('Grant_Type')['Status'].apply(
+                success_rate = df.groupby('Grant_Type', observed=True)['Status'].apply(
                     lambda x: (x == 'Approved').sum() / len(x) * 100
                 ).sort_values(ascending=False)
                 
@@ -0,0 +1,251 @@
+"""Inverted full-text index over the searchable grant fields"""
+
+import bisect
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from config import SEARCH_INDEX_CACHE_SIZE
+from derived import dataset_version
+
+# Searchable fields and how much a term found in each counts towards relevance
+SEARCH_FIELDS = {'Title': 3.0, 'Goal': 1.0, 'Notes': 1.0}
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    """Split text into lowercase alphanumeric terms"""
+    if not isinstance(text, str):
+        return []
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class GrantSearchIndex:
+    """Term -> {row slot: weight} postings with a sorted vocabulary for prefixes.
+
+    Every query term is matched as a prefix, all terms must match (AND),
+    and rows are ranked by the field-weighted, idf-scaled sum of their
+    matching terms. Each term's postings are also kept as NumPy arrays,
+    rebuilt lazily after a change, so a query is a few bincounts rather
+    than a Python loop over matching rows. Rows can be added, replaced and
+    removed one at a time.
+
+    copy() shares each term's postings with the original; a postings dict is
+    copied only when a copy first writes to it, so syncing a copy with a few
+    changed rows costs those rows, not the whole vocabulary.
+    """
+
+    def __init__(self, fields=SEARCH_FIELDS):
+        self.fields = dict(fields)
+        self._postings = {}
+        self._owned = set()
+        self._arrays = {}
+        self._terms = []
+        self._row_terms = {}
+        self._slots = {}
+        self._labels = []
+        self._label_array = None
+        self._free_slots = []
+        self._row_hashes = pd.Series(dtype='uint64')
+
+    def __len__(self):
+        return len(self._slots)
+
+    def _row_weights(self, row):
+        weights = Counter()
+        for field, weight in self.fields.items():
+            for term in tokenize(row.get(field)):
+                weights[term] += weight
+        return weights
+
+    def _slot_for(self, label):
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self._labels[slot] = label
+        else:
+            slot = len(self._labels)
+            self._labels.append(label)
+        self._slots[label] = slot
+        self._label_array = None
+        return slot
+
+    def _writable_postings(self, term):
+        postings = self._postings.get(term)
+        if postings is not None and term not in self._owned:
+            postings = self._postings[term] = dict(postings)
+            self._owned.add(term)
+        return postings
+
+    def add_row(self, label, row):
+        """Index one row (a mapping of field -> text), replacing any earlier copy"""
+        self.remove_row(label)
+        slot = self._slot_for(label)
+        weights = self._row_weights(row)
+        for term, weight in weights.items():
+            postings = self._writable_postings(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                self._owned.add(term)
+                bisect.insort(self._terms, term)
+            postings[slot] = weight
+            self._arrays.pop(term, None)
+        self._row_terms[slot] = list(weights)
+
+    def remove_row(self, label):
+        """Drop a row from the index; unknown labels are ignored"""
+        slot = self._slots.pop(label, None)
+        if slot is None:
+            return
+        for term in self._row_terms.pop(slot):
+            postings = self._writable_postings(term)
+            del postings[slot]
+            self._arrays.pop(term, None)
+            if not postings:
+                del self._postings[term]
+                self._owned.discard(term)
+                del self._terms[bisect.bisect_left(self._terms, term)]
+        self._labels[slot] = None
+        self._label_array = None
+        self._free_slots.append(slot)
+
+    def _field_hashes(self, df):
+        fields = [field for field in self.fields if field in df.columns]
+        # Free text is mostly unique, so factorizing it first only adds work
+        return pd.util.hash_pandas_object(df[fields].astype(object), index=False, categorize=False)
+
+    def sync(self, df):
+        """Bring the index in line with df, re-indexing only rows that changed.
+
+        Returns the number of rows added or replaced and the number removed.
+        """
+        hashes = self._field_hashes(df)
+        hashes.index = df.index
+        previous = self._row_hashes
+        common = hashes.index.intersection(previous.index)
+        changed = common[hashes.loc[common].to_numpy() != previous.loc[common].to_numpy()]
+        added = hashes.index.difference(previous.index).append(changed)
+        removed = previous.index.difference(hashes.index)
+
+        for label in removed:
+            self.remove_row(label)
+        records = df.loc[added, [field for field in self.fields if field in df.columns]]
+        for label, row in zip(records.index, records.to_dict('records')):
+            self.add_row(label, row)
+
+        self._row_hashes = hashes
+        return len(added), len(removed)
+
+    def _term_arrays(self, term):
+        arrays = self._arrays.get(term)
+        if arrays is None:
+            postings = self._postings[term]
+            arrays = self._arrays[term] = (
+                np.fromiter(postings.keys(), dtype=np.int64, count=len(postings)),
+                np.fromiter(postings.values(), dtype=np.float64, count=len(postings))
+            )
+        return arrays
+
+    def _prefix_terms(self, prefix):
+        start = bisect.bisect_left(self._terms, prefix)
+        end = bisect.bisect_left(self._terms, prefix + '\uffff', lo=start)
+        return self._terms[start:end]
+
+    def search(self, query, limit=None):
+        """Return an Index of row labels matching every query term, most relevant first"""
+        terms = tokenize(query)
+        if not terms or not self._slots:
+            return pd.Index([])
+
+        size = len(self._labels)
+        total = len(self._slots)
+        scores = np.zeros(size)
+        matched = None
+        for term in dict.fromkeys(terms):
+            slots, weights = [], []
+            for vocab_term in self._prefix_terms(term):
+                term_slots, term_weights = self._term_arrays(vocab_term)
+                slots.append(term_slots)
+                weights.append(term_weights * math.log(1 + total / len(term_slots)))
+            if not slots:
+                return pd.Index([])
+            slots = np.concatenate(slots)
+            scores += np.bincount(slots, weights=np.concatenate(weights), minlength=size)
+            hit = np.zeros(size, dtype=bool)
+            hit[slots] = True
+            matched = hit if matched is None else matched & hit
+
+        found = np.flatnonzero(matched)
+        ranks = -scores[found]
+        if limit is not None and 0 < limit < len(found):
+            # Only rows scoring at least the limit-th best can make the cut; the
+            # stable sort of those keeps the same order a full sort would give
+            keep = ranks <= np.partition(ranks, limit - 1)[limit - 1]
+            found, ranks = found[keep], ranks[keep]
+        ranked = found[np.argsort(ranks, kind='stable')]
+        if limit is not None:
+            ranked = ranked[:limit]
+        if self._label_array is None:
+            self._label_array = pd.Index(self._labels)
+        return self._label_array.take(ranked)
+
+    def copy(self):
+        """Return a copy that can be synced to a newer dataset without changing this one.
+
+        Postings are shared copy-on-write; the per-row term lists and hashes
+        are only ever replaced, never changed in place, so they are shared too.
+        """
+        clone = GrantSearchIndex(self.fields)
+        clone._postings = dict(self._postings)
+        self._owned = set()
+        clone._arrays = dict(self._arrays)
+        clone._terms = list(self._terms)
+        clone._row_terms = dict(self._row_terms)
+        clone._slots = dict(self._slots)
+        clone._labels = list(self._labels)
+        clone._free_slots = list(self._free_slots)
+        clone._row_hashes = self._row_hashes
+        return clone
+
+
+class SearchIndexCache:
+    """Bounded LRU of search indexes keyed on dataset version.
+
+    A new version starts from a copy-on-write copy of the most recent index
+    and syncs only the rows whose searchable fields changed.
+    """
+
+    def __init__(self, maxsize=SEARCH_INDEX_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._indexes = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, df, version=None):
+        """Return the index for df, building or syncing it on a miss"""
+        version = version or dataset_version(df)
+        with self._lock:
+            if version in self._indexes:
+                self._indexes.move_to_end(version)
+                return self._indexes[version]
+            latest = next(reversed(self._indexes.values()), None)
+
+        index = latest.copy() if latest is not None else GrantSearchIndex()
+        index.sync(df)
+        with self._lock:
+            self._indexes[version] = index
+            self._indexes.move_to_end(version)
+            while len(self._indexes) > self.maxsize:
+                self._indexes.popitem(last=False)
+        return index
+
+
+search_indexes = SearchIndexCache()
+
+
+def get_search_index(df, version=None):
+    """Return the shared search index for this version of df"""
+    return search_indexes.get(df, version)
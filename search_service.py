@@ -0,0 +1,158 @@
+"""One search backend over grant types, categories, industries, clients and grants"""
+
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+import pandas as pd
+
+from config import GLOBAL_SEARCH_CACHE_SIZE, GRANT_CATEGORIES
+from search_index import GrantSearchIndex
+
+# kind is one of HIT_KINDS; key is the grant type/category/industry name or the row label
+SearchHit = namedtuple('SearchHit', ['kind', 'key', 'title', 'detail'])
+
+HIT_KINDS = ('grant_type', 'category', 'industry', 'client', 'grant')
+
+# Document fields: a hit in the title outranks one in the descriptive text
+DOCUMENT_FIELDS = {'Title': 3.0, 'Text': 1.0}
+
+
+def _joined(df, columns):
+    present = [column for column in columns if column in df.columns]
+    if not present:
+        return pd.Series('', index=df.index)
+    return df[present].astype(object).fillna('').astype(str).agg(' '.join, axis=1)
+
+
+def _documents(kind, keys, titles, texts, details):
+    return pd.DataFrame({
+        'Kind': kind,
+        'Key': list(keys),
+        'Title': list(titles),
+        'Text': list(texts),
+        'Detail': list(details)
+    })
+
+
+def build_documents(grant_types=(), categories=GRANT_CATEGORIES, clients=None, grants=None):
+    """Return the search documents for every source, one row per hit target"""
+    category_of = {grant: category for category, members in categories.items() for grant in members}
+    frames = [
+        _documents('grant_type', grant_types, grant_types,
+                   [category_of.get(grant, '') for grant in grant_types],
+                   [category_of.get(grant, '') for grant in grant_types]),
+        _documents('category', categories, categories,
+                   [' '.join(members) for members in categories.values()],
+                   [f"{len(members)} grant types" for members in categories.values()])
+    ]
+
+    if clients is not None and not clients.empty:
+        if 'Industry' in clients.columns:
+            counts = clients['Industry'].value_counts()
+            counts = counts[counts > 0]
+            frames.append(_documents('industry', counts.index, counts.index, [''] * len(counts),
+                                     [f"{count} clients" for count in counts]))
+        frames.append(_documents(
+            'client', clients.index, clients.get('client', pd.Series('', index=clients.index)).astype(str),
+            _joined(clients, ['Email', 'Business', 'Industry', 'State', 'Summary']),
+            _joined(clients, ['Business'])
+        ))
+
+    if grants is not None and not grants.empty:
+        frames.append(_documents(
+            'grant', grants.index, grants.get('Title', pd.Series('', index=grants.index)).astype(str),
+            _joined(grants, ['Goal', 'Notes', 'Agency', 'Grant Type']),
+            _joined(grants, ['Agency'])
+        ))
+
+    documents = pd.concat(frames, ignore_index=True)
+    documents.index = documents['Kind'] + ':' + documents['Key'].astype(str)
+    return documents
+
+
+class GlobalSearch:
+    """Ranked, typed search over one version of the documents from build_documents.
+
+    Instances are never re-pointed at other data: a session that holds one
+    keeps searching the version it was built for, whatever other sessions
+    load in the meantime.
+    """
+
+    def __init__(self, documents, index):
+        self.index = index
+        self._documents = documents
+        self._lock = threading.Lock()
+        self._stats = {'queries': 0, 'seconds': 0.0, 'last_seconds': None}
+
+    def search(self, query, kinds=None, limit=None):
+        """Return hits for query, most relevant first, optionally only of some kinds"""
+        start = time.perf_counter()
+        # Without a kind filter the index can stop at the top `limit` hits
+        labels = self.index.search(query, limit if kinds is None else None)
+        matches = self._documents.loc[labels]
+        if kinds is not None:
+            matches = matches[matches['Kind'].isin(kinds)]
+        if limit is not None:
+            matches = matches.head(limit)
+        hits = [
+            SearchHit(kind, key, title, detail)
+            for kind, key, title, detail in zip(matches['Kind'], matches['Key'], matches['Title'], matches['Detail'])
+        ]
+
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self._stats['queries'] += 1
+            self._stats['seconds'] += elapsed
+            self._stats['last_seconds'] = elapsed
+        return hits
+
+    def stats(self):
+        """Return the query count, last and average latency and indexed documents"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['documents'] = len(self._documents)
+        stats['avg_seconds'] = stats['seconds'] / stats['queries'] if stats['queries'] else 0.0
+        return stats
+
+
+class GlobalSearchCache:
+    """Bounded LRU of global searches keyed on the caller's data version.
+
+    A new version starts from a copy-on-write copy of the most recent index
+    and re-tokenizes only documents whose text changed, so a rerun with the
+    same data does no scanning at all.
+    """
+
+    def __init__(self, fields=DOCUMENT_FIELDS, maxsize=GLOBAL_SEARCH_CACHE_SIZE):
+        self.fields = fields
+        self.maxsize = maxsize
+        self._searches = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, version, build):
+        """Return the search over build() documents for version, indexing them on a miss"""
+        with self._lock:
+            if version in self._searches:
+                self._searches.move_to_end(version)
+                return self._searches[version]
+            latest = next(reversed(self._searches.values()), None)
+
+        documents = build()
+        index = latest.index.copy() if latest is not None else GrantSearchIndex(self.fields)
+        index.sync(documents)
+        search = GlobalSearch(documents, index)
+        with self._lock:
+            self._searches[version] = search
+            self._searches.move_to_end(version)
+            while len(self._searches) > self.maxsize:
+                self._searches.popitem(last=False)
+        return search
+
+
+global_searches = GlobalSearchCache()
+
+
+def get_global_search(version, build):
+    """Return the shared global search for this data version"""
+    return global_searches.get(version, build)
@@ -0,0 +1,211 @@
+"""Conditional fetching of Google Sheets CSV exports"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+import pandas as pd
+
+from config import SHEET_CACHE_DIR, SHEET_FRAME_CACHE_SIZE, SHEET_LOAD_WORKERS
+from http_client import http_client
+
+# path is the on-disk copy of the export, valid for both 200 and 304 answers
+FetchResult = namedtuple('FetchResult', ['path', 'status_code', 'not_modified'])
+
+
+def sheet_id_from_url(sheet_url):
+    """Extract the spreadsheet id from a Google Sheets URL, or None"""
+    if 'docs.google.com/spreadsheets' not in sheet_url or '/d/' not in sheet_url:
+        return None
+    return sheet_url.split('/d/')[1].split('/')[0]
+
+
+def csv_export_url(sheet_id, gid=None):
+    """Return the CSV export URL for a sheet, optionally for one gid"""
+    url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv"
+    if gid is not None:
+        url += f"&gid={gid}"
+    return url
+
+
+def gviz_csv_url(sheet_id, sheet_name):
+    """Return the gviz CSV URL for a named tab of a sheet"""
+    return f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={quote(sheet_name)}"
+
+
+def tab_url(sheet_id, tab):
+    """Return the CSV URL for a tab given by gid (int) or by name (str)"""
+    if isinstance(tab, int):
+        return csv_export_url(sheet_id, gid=tab)
+    return gviz_csv_url(sheet_id, tab)
+
+
+class SheetFetchClient:
+    """Fetch sheet exports with ETag/Last-Modified revalidation.
+
+    The raw bytes and validators of every successful download are stored in
+    cache_dir, so later requests are sent conditionally. A 304 answer skips
+    both the download and, when the same file was already parsed with the
+    same read_csv arguments in this process, the CSV parse. Parsed frames
+    are kept in a bounded LRU and handed out as shallow copies, so callers
+    can add or replace columns without touching the cached frame.
+    """
+
+    def __init__(self, cache_dir=SHEET_CACHE_DIR, http=None, max_frames=SHEET_FRAME_CACHE_SIZE):
+        self.cache_dir = cache_dir
+        self.http = http or http_client
+        self.max_frames = max_frames
+        self._frames = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _paths(self, url):
+        key = hashlib.sha1(url.encode()).hexdigest()
+        return (
+            os.path.join(self.cache_dir, f"{key}.csv"),
+            os.path.join(self.cache_dir, f"{key}.json")
+        )
+
+    def _load_meta(self, url):
+        content_path, meta_path = self._paths(url)
+        if not (os.path.exists(content_path) and os.path.exists(meta_path)):
+            return None
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _replace_atomically(self, path, write):
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                write(f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _store(self, url, response):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        content_path, meta_path = self._paths(url)
+        meta = {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified')
+        }
+        # Stream the body straight to disk, then write the validators that describe it
+        self._replace_atomically(content_path, lambda f: self.http.stream_to(response, f))
+        self._replace_atomically(meta_path, lambda f: f.write(json.dumps(meta).encode('utf-8')))
+        return content_path
+
+    def _parse(self, url, path, read_csv_kwargs):
+        """Return the frame parsed from path, reusing the copy parsed from the same file"""
+        stat = os.stat(path)
+        key = (url, json.dumps(read_csv_kwargs, sort_keys=True, default=str))
+        token = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._frames.get(key)
+            if cached is not None and cached[0] == token:
+                self._frames.move_to_end(key)
+                return cached[1].copy(deep=False)
+
+        df = pd.read_csv(path, **read_csv_kwargs)
+        with self._lock:
+            self._frames[key] = (token, df)
+            self._frames.move_to_end(key)
+            while len(self._frames) > self.max_frames:
+                self._frames.popitem(last=False)
+        return df.copy(deep=False)
+
+    def cached_path(self, url):
+        """Return the path of the stored export for url, or None if nothing is cached"""
+        content_path, _ = self._paths(url)
+        return content_path if os.path.exists(content_path) else None
+
+    def fetch(self, url):
+        """Fetch url, sending the stored validators as a conditional request"""
+        headers = {}
+        meta = self._load_meta(url)
+        if meta:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        response = self.http.get(url, headers=headers)
+        if response.status_code == 304 and meta:
+            response.close()
+            return FetchResult(self._paths(url)[0], 304, True)
+
+        try:
+            response.raise_for_status()
+        except Exception:
+            response.close()
+            raise
+        return FetchResult(self._store(url, response), response.status_code, False)
+
+    def load_csv(self, url, fallback_to_cache=False, **read_csv_kwargs):
+        """Fetch url and parse it, returning the frame and where it came from.
+
+        The source is 'network' for a fresh download, 'not_modified' after a
+        304 and 'cache' when the fetch failed and fallback_to_cache served
+        the last stored copy instead.
+        """
+        try:
+            result = self.fetch(url)
+        except Exception:
+            if not fallback_to_cache:
+                raise
+            path = self.cached_path(url)
+            if path is None:
+                raise
+            return self._parse(url, path, read_csv_kwargs), 'cache'
+
+        return self._parse(url, result.path, read_csv_kwargs), 'not_modified' if result.not_modified else 'network'
+
+    def fetch_csv(self, url, **read_csv_kwargs):
+        """Fetch url and return it parsed as a DataFrame"""
+        return self.load_csv(url, **read_csv_kwargs)[0]
+
+sheet_client = SheetFetchClient()
+
+
+def load_sheet_tabs(sheet_id, tabs, client=None, max_workers=SHEET_LOAD_WORKERS, **read_csv_kwargs):
+    """Fetch and parse several tabs of one workbook concurrently.
+
+    tabs holds tab names and/or gids. Returns a dict of frames keyed by tab
+    and a per-tab report with the load time, row count, source and error.
+    A tab that fails to load falls back to its cached copy; if it has none
+    it is left out of the frames and its error is reported.
+    """
+    client = client or sheet_client
+
+    def load(tab):
+        start = time.perf_counter()
+        df, source, error = None, 'failed', None
+        try:
+            df, source = client.load_csv(tab_url(sheet_id, tab), fallback_to_cache=True, **read_csv_kwargs)
+        except Exception as e:
+            error = str(e)
+        return tab, df, {
+            'seconds': time.perf_counter() - start,
+            'rows': 0 if df is None else len(df),
+            'source': source,
+            'error': error
+        }
+
+    if not tabs:
+        return {}, {}
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tabs))) as pool:
+        results = list(pool.map(load, tabs))
+
+    frames = {tab: df for tab, df, _ in results if df is not None}
+    report = {tab: info for tab, _, info in results}
+    return frames, report
@@ -0,0 +1,125 @@
+"""Persistent local snapshots of loaded grant data"""
+
+import glob
+import json
+import os
+import tempfile
+from datetime import datetime
+
+import pandas as pd
+
+from config import SNAPSHOT_DIR, SNAPSHOT_KEEP
+
+try:
+    import pyarrow  # noqa: F401
+    SNAPSHOT_FORMAT = 'parquet'
+except ImportError:
+    SNAPSHOT_FORMAT = 'pickle'
+
+
+def _arrow_safe(df):
+    """Stringify object columns holding mixed types, which Parquet cannot store"""
+    mixed = [
+        col for col in df.columns
+        if df[col].dtype == object and pd.api.types.infer_dtype(df[col], skipna=True).startswith('mixed')
+    ]
+    if not mixed:
+        return df
+    return df.assign(**{col: df[col].where(df[col].isna(), df[col].astype(str)) for col in mixed})
+
+
+class SnapshotStore:
+    """Columnar on-disk copies of each successfully loaded dataset.
+
+    Every save writes a new timestamped file plus a small JSON sidecar with
+    its source, row count and the dataset version of the saved data; only the
+    newest `keep` snapshots are retained.
+    """
+
+    def __init__(self, directory=SNAPSHOT_DIR, keep=SNAPSHOT_KEEP, name='grants'):
+        self.directory = directory
+        self.keep = keep
+        self.name = name
+
+    def _write_atomically(self, path, write):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        os.close(fd)
+        try:
+            write(tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def save(self, df, source=None, version=None):
+        """Write df as a new snapshot and prune old ones; returns its metadata"""
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+        path = os.path.join(self.directory, f"{self.name}-{stamp}.{SNAPSHOT_FORMAT}")
+        meta = {
+            'path': path,
+            'source': source,
+            'saved_at': datetime.now().isoformat(timespec='seconds'),
+            'rows': len(df),
+            'version': version,
+            'format': SNAPSHOT_FORMAT
+        }
+
+        if SNAPSHOT_FORMAT == 'parquet':
+            self._write_atomically(path, lambda tmp: _arrow_safe(df).to_parquet(tmp, index=False))
+        else:
+            self._write_atomically(path, lambda tmp: df.to_pickle(tmp))
+        self._write_atomically(f"{path}.json", lambda tmp: _write_json(tmp, meta))
+
+        self.prune()
+        return meta
+
+    def snapshots(self):
+        """Return the metadata of every stored snapshot, oldest first"""
+        pattern = os.path.join(self.directory, f"{self.name}-*.{SNAPSHOT_FORMAT}.json")
+        snapshots = []
+        for meta_path in sorted(glob.glob(pattern)):
+            try:
+                with open(meta_path, encoding='utf-8') as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return snapshots
+
+    def latest(self):
+        """Return the metadata of the newest snapshot, or None"""
+        snapshots = self.snapshots()
+        return snapshots[-1] if snapshots else None
+
+    def load(self, meta):
+        """Read the snapshot described by meta"""
+        if meta['format'] == 'parquet':
+            return pd.read_parquet(meta['path'])
+        return pd.read_pickle(meta['path'])
+
+    def load_latest(self):
+        """Return the newest snapshot and its metadata, or (None, None)"""
+        meta = self.latest()
+        if meta is None:
+            return None, None
+        try:
+            return self.load(meta), meta
+        except Exception:
+            return None, None
+
+    def prune(self):
+        """Delete all but the newest `keep` snapshots"""
+        for meta in self.snapshots()[:-max(self.keep, 1)]:
+            for path in (meta['path'], f"{meta['path']}.json"):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+def _write_json(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+
+
+snapshot_store = SnapshotStore()
@@ -0,0 +1,48 @@
+"""Grant aggregates keep integer counts on the build and update paths"""
+
+import pandas as pd
+
+from aggregates import GrantAggregates
+
+
+def grants():
+    return pd.DataFrame({
+        'Status': ['Interested', 'New', 'Interested', 'New'],
+        'Eligibility': ['Yes', 'No', 'Yes', 'Yes'],
+        'Grant Type': ['Infrastructure', 'Education', 'Energy', 'Energy'],
+        'Agency': ['USDA', 'NSF', 'DOE', 'DOE'],
+        'Urgency': ['Urgent', 'Safe', None, 'Soon'],
+        'Funding': [250000, None, 1200000, 50000],
+        'Opportunity Number': ['A-1', 'B-2', None, 'D-4']
+    })
+
+
+def assert_int_counts(aggregates):
+    totals = aggregates.totals()
+    for measure in ('rows', 'funded', 'opportunities'):
+        assert type(totals[measure]) is int
+    assert type(totals['funding']) is float
+    for table in aggregates.tables.values():
+        assert table['rows'].dtype.kind == 'i'
+
+
+def test_build_totals_are_ints():
+    aggregates = GrantAggregates.build(grants())
+    assert_int_counts(aggregates)
+    assert aggregates.totals()['rows'] == 4
+    assert aggregates.totals()['funded'] == 3
+
+
+def test_update_matches_build():
+    df = grants()
+    changed = df.copy()
+    changed.loc[1, 'Funding'] = 75000
+    changed.loc[3, 'Status'] = 'Interested'
+    changed = changed.drop(index=2)
+    updated = GrantAggregates.build(df).update(changed)
+    rebuilt = GrantAggregates.build(changed)
+
+    assert_int_counts(updated)
+    assert updated.totals() == rebuilt.totals()
+    for name, table in rebuilt.tables.items():
+        pd.testing.assert_frame_equal(updated.tables[name], table, check_index_type=False)
@@ -0,0 +1,36 @@
+"""Typo-tolerant suggestions, one trie per data version"""
+
+import pandas as pd
+
+from autocomplete import Autocomplete, AutocompleteCache, SuggestionTrie, allowed_edits, build_phrases
+
+
+def test_suggestions_match_word_prefixes_and_tolerate_typos():
+    trie = SuggestionTrie().build([
+        ('Health & Wellness Grants', 'grant_type', 1),
+        ('Healthcare', 'industry', 5),
+        ('Housing Assistance Grants', 'grant_type', 1)
+    ])
+    autocomplete = Autocomplete(trie)
+
+    assert [s.text for s in autocomplete.suggest('hea')] == ['Healthcare', 'Health & Wellness Grants']
+    assert [s.text for s in autocomplete.suggest('wel')] == ['Health & Wellness Grants']
+    # One typo is allowed from three characters on
+    assert allowed_edits('he') == 0 and allowed_edits('hous') == 1
+    assert [s.text for s in autocomplete.suggest('husing')] == ['Housing Assistance Grants']
+
+
+def test_phrases_are_weighted_by_frequency():
+    clients = pd.DataFrame({'client': ['A', 'B', 'C'], 'Industry': ['Energy', 'Energy', 'Arts'], 'State': ['CA'] * 3})
+    weights = {(text, kind): weight for text, kind, weight in build_phrases(categories={}, clients=clients)}
+    assert weights[('Energy', 'industry')] == 2
+    assert weights[('CA', 'state')] == 3
+
+
+def test_each_version_suggests_from_its_own_data():
+    cache = AutocompleteCache()
+    first = cache.get('v1', lambda: build_phrases(categories={}, clients=pd.DataFrame({'client': ['Acme Solar']})))
+    second = cache.get('v2', lambda: build_phrases(categories={}, clients=pd.DataFrame({'client': ['Acorn Labs']})))
+
+    assert [s.text for s in first.suggest('ac')] == ['Acme Solar']
+    assert [s.text for s in second.suggest('ac')] == ['Acorn Labs']
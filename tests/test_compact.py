@@ -0,0 +1,41 @@
+"""Compacted frames hold the same values in smaller dtypes"""
+
+import pandas as pd
+
+from compact import compact_frame
+
+
+def grants():
+    return pd.DataFrame({
+        'Status': ['New', 'Interested', 'New', 'New'] * 25,
+        'Title': [f"Grant {number}" for number in range(100)],
+        'Funding': [250000.0, 1200000.0, 50000.0, 75000.0] * 25,
+        'Award Floor': [0.1, 2.5, 1e-9, None] * 25,
+        'Days': list(range(100))
+    })
+
+
+def assert_same_values(compacted, df):
+    for column in df.columns:
+        assert compacted[column].astype(object).where(compacted[column].notna(), None).tolist() == \
+            df[column].astype(object).where(df[column].notna(), None).tolist(), column
+
+
+def test_compact_frame_keeps_values_and_shrinks_memory():
+    df = grants()
+    compacted, report = compact_frame(df, category_ratio=0.5, arrow_strings=False)
+    assert_same_values(compacted, df)
+    assert isinstance(compacted['Status'].dtype, pd.CategoricalDtype)
+    assert compacted['Funding'].dtype.kind == 'i'
+    # Downcasting these floats would change them, and non-amount columns are left alone
+    assert compacted['Award Floor'].dtype == 'float64'
+    assert compacted['Days'].dtype == df['Days'].dtype
+    assert set(report['columns']) == {'Status', 'Funding'}
+    assert report['bytes_after'] < report['bytes_before']
+
+
+def test_compact_frame_returns_df_when_nothing_changes():
+    df = pd.DataFrame({'Days': [1, 2, 3]})
+    compacted, report = compact_frame(df)
+    assert compacted is df
+    assert report['columns'] == {}
@@ -0,0 +1,26 @@
+"""Vectorized date parsing matches the per-cell parser it replaces"""
+
+import pandas as pd
+
+from dates import normalize_dates, parse_date_column, safe_date_parse, source_columns
+
+RAW_DATES = ['2024-03-05', '03/04/2024', '25/12/2024', '2024-01-02 10:30:00', '', None, 'not a date', '13/13/2024']
+
+
+def test_parse_date_column_matches_safe_date_parse():
+    values = pd.Series(RAW_DATES)
+    parsed = parse_date_column(values)
+    expected = [safe_date_parse(value) for value in RAW_DATES]
+    assert [None if pd.isna(value) else value.to_pydatetime() for value in parsed] == expected
+
+
+def test_normalize_dates_reports_hits_and_keeps_source_columns():
+    df = pd.DataFrame({'Title': ['a'] * len(RAW_DATES), 'Response Date': RAW_DATES})
+    normalized, report = normalize_dates(df)
+    assert 'Response Date Parsed' in normalized.columns
+    assert report['Response Date']['%Y-%m-%d'] == 1
+    assert report['Response Date']['%m/%d/%Y'] == 1
+    assert report['Response Date']['%d/%m/%Y'] == 1
+    # The empty string and the two unparseable values
+    assert report['Response Date']['unparsed'] == 3
+    assert source_columns(normalized) == ['Title', 'Response Date']
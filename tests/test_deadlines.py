@@ -0,0 +1,52 @@
+"""Deadline analytics match the per-view deadline frames they replace"""
+
+from datetime import datetime
+
+import pandas as pd
+
+from deadlines import DeadlineAnalytics, DeadlineCache
+from derived import derive_columns
+
+NOW = datetime(2024, 6, 1)
+
+
+def grants():
+    return derive_columns(pd.DataFrame({
+        'Title': [f"Grant {number}" for number in range(7)],
+        'Response Date': ['2024-06-05', None, '2024-06-20', '2024-09-01', 'unknown', '2024-06-02', '2024-07-15'],
+        'Posted Date': ['2024-01-01'] * 7,
+        'Eligibility': ['Yes'] * 7,
+        'Status': ['New'] * 7,
+        'Funding': [100000] * 7
+    }), now=NOW)
+
+
+def test_analytics_match_legacy_deadline_frame():
+    df = grants()
+    legacy = df.loc[
+        df['Days Left'].notna(), ['Title', 'Days Left', 'Response Date Parsed', 'Urgency']
+    ].rename(columns={'Response Date Parsed': 'Response Date'})
+    legacy['Days Left'] = legacy['Days Left'].astype(int)
+
+    analytics = DeadlineAnalytics(df, top_n=3)
+    pd.testing.assert_frame_equal(analytics.frame, legacy)
+    assert len(analytics) == 5
+    assert analytics.urgency_counts.to_dict() == {'Urgent': 2, 'Warning': 1, 'Safe': 2}
+    assert analytics.count('Urgent') == legacy['Urgency'].value_counts()['Urgent']
+    assert analytics.most_urgent['Title'].tolist() == legacy.sort_values('Days Left').head(3)['Title'].tolist()
+
+
+def test_analytics_without_deadlines():
+    df = grants()
+    analytics = DeadlineAnalytics(df[df['Days Left'].isna()])
+    assert analytics.empty
+    assert analytics.count('Urgent') == 0
+
+
+def test_cache_reuses_analytics_per_version():
+    df = grants()
+    cache = DeadlineCache(maxsize=1)
+    first = cache.get(df, 'v1')
+    assert cache.get(df, 'v1') is first
+    cache.get(df, 'v2')
+    assert cache.get(df, 'v1') is not first
@@ -0,0 +1,44 @@
+"""Excel export through st.download_button's deferred data path"""
+
+from io import BytesIO
+
+import pandas as pd
+from streamlit.runtime.media_file_manager import MediaFileManager
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+
+from aggregates import GrantAggregates
+from export import ExcelExporter, summary_rows
+
+
+def grants():
+    return pd.DataFrame({
+        'Title': ['Rural broadband', 'STEM teachers', 'Clean energy'],
+        'Status': ['Interested', 'New', 'Interested'],
+        'Eligibility': ['Yes', 'No', 'Yes'],
+        'Grant Type': ['Infrastructure', 'Education', 'Energy'],
+        'Agency': ['USDA', 'NSF', 'DOE'],
+        'Urgency': ['Urgent', 'Safe', None],
+        'Funding': [250000, 90000, 1200000],
+        'Opportunity Number': ['A-1', 'B-2', None],
+        'Response Date': pd.to_datetime(['2026-11-01', '2027-01-15', None])
+    })
+
+
+def test_deferred_download_returns_workbook():
+    df = grants()
+    summary = summary_rows(GrantAggregates.build(df))
+    manager = MediaFileManager(MemoryMediaFileStorage('/media'))
+    file_id = manager.add_deferred(
+        lambda: ExcelExporter().download(df, summary),
+        'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        'export_button',
+        file_name='grants_report.xlsx'
+    )
+
+    url = manager.execute_deferred(file_id)
+    stored = manager._storage.get_file(url.rsplit('/', 1)[-1].split('.')[0])
+    sheets = pd.read_excel(BytesIO(stored.content), sheet_name=None)
+
+    assert list(sheets) == ['All Grants', 'Summary']
+    assert sheets['All Grants']['Title'].tolist() == df['Title'].tolist()
+    assert sheets['Summary'].set_index('Metric').loc['Total Grants', 'Value'] == 3
@@ -0,0 +1,61 @@
+"""Bitmap facet masks and counts match the equivalent pandas filters"""
+
+import numpy as np
+import pandas as pd
+
+from facets import FacetIndex
+
+
+def grants():
+    rng = np.random.default_rng(7)
+    # 29 rows, so the packed bitmaps end in a partial byte
+    funding = rng.integers(0, 2000000, 29).astype(float)
+    funding[[3, 11]] = np.nan
+    return pd.DataFrame({
+        'Status': rng.choice(['New', 'Interested', 'Under Review'], 29),
+        'Agency': rng.choice(['DOE', 'NSF', 'USDA', 'NIH'], 29),
+        'Funding': funding
+    }, index=range(100, 129))
+
+
+def pandas_mask(df, selections, ranges, skip=None):
+    keep = pd.Series(True, index=df.index)
+    for column, selected in selections.items():
+        if column != skip and selected is not None:
+            keep &= df[column].isin(selected)
+    for column, (low, high) in ranges.items():
+        if column != skip:
+            values = df[column]
+            keep &= values.notna()
+            if low is not None:
+                keep &= values >= low
+            if high is not None:
+                keep &= values <= high
+    return keep
+
+
+def test_mask_matches_pandas_filters():
+    df = grants()
+    index = FacetIndex(df, ['Status', 'Agency'], ['Funding'])
+    cases = [
+        ({}, {}),
+        ({'Status': ['New']}, {}),
+        ({'Status': ['New', 'Interested'], 'Agency': ['DOE']}, {'Funding': (250000, None)}),
+        ({'Agency': []}, {}),
+        ({'Status': None}, {'Funding': (None, 1000000)})
+    ]
+    for selections, ranges in cases:
+        assert index.mask(selections, ranges).tolist() == pandas_mask(df, selections, ranges).tolist()
+
+
+def test_counts_apply_every_filter_but_their_own():
+    df = grants()
+    index = FacetIndex(df, ['Status', 'Agency'], ['Funding'])
+    selections = {'Status': ['Interested'], 'Agency': ['DOE', 'NSF']}
+    ranges = {'Funding': (100000, 1500000)}
+    counts = index.counts(selections, ranges)
+    for column in ('Status', 'Agency'):
+        others = df[pandas_mask(df, selections, ranges, skip=column)]
+        expected = others[column].value_counts().to_dict()
+        assert {value: rows for value, rows in counts[column].items() if rows} == expected
+        assert set(counts[column]) == set(df[column])
@@ -0,0 +1,51 @@
+"""Registered insights produce the text the inline insight code produced"""
+
+import pandas as pd
+
+from insights import InsightEngine, top_agency
+
+
+def grants():
+    return pd.DataFrame({
+        'Funding': [250000, 1200000, 50000, 400000],
+        'Eligibility': ['Yes', 'No', 'Yes', 'Yes'],
+        'Urgency': ['Urgent', 'Safe', 'Urgent', 'Warning'],
+        'Status': ['Interested', 'New', 'Interested', 'New'],
+        'Agency': ['DOE', 'NSF', 'DOE', 'USDA']
+    })
+
+
+def legacy_insights(df, deadlines):
+    insights = [
+        f"💰 Total available funding across all grants: ${df['Funding'].sum():,.0f}",
+        f"📊 Average grant size: ${df['Funding'].mean():,.0f}"
+    ]
+    eligible_count = len(df[df['Eligibility'] == 'Yes'])
+    insights.append(
+        f"✅ {eligible_count} grants ({eligible_count / len(df) * 100:.1f}%) match your eligibility criteria"
+    )
+    urgent_count = deadlines.count('Urgent')
+    if urgent_count:
+        insights.append(f"🚨 {urgent_count} grants have deadlines within 2 weeks!")
+    interested_count = len(df[df['Status'] == 'Interested'])
+    insights.append(f"⭐ {interested_count} grants marked as 'Interested' - high priority opportunities")
+    agencies = df['Agency'].value_counts().head(1)
+    if not agencies.empty:
+        insights.append(f"🏛️ Most active agency: {agencies.index[0]} with {agencies.values[0]} grant opportunities")
+    return insights
+
+
+def test_engine_matches_legacy_insights_and_reuses_results():
+    df = grants()
+    engine = InsightEngine()
+    expected = legacy_insights(df, df['Urgency'].tolist())
+    assert engine.run(df) == expected
+    assert engine.run(df) == expected
+    assert engine.stats()['reused'] == len(expected)
+
+
+def test_top_agency_skips_unobserved_categories():
+    df = grants().astype({'Agency': 'category'})
+    subset = df[df['Agency'] == 'NSF']
+    assert top_agency(subset) == "🏛️ Most active agency: NSF with 1 grant opportunities"
+    assert top_agency(df.iloc[:0]) is None
@@ -0,0 +1,32 @@
+"""Sort indexes and page orders are not reused across days"""
+
+from datetime import date
+
+import pandas as pd
+
+import pagination
+from pagination import SortIndexCache, order_key
+
+SORTS = {'Grant Score': ('Opportunity Score', False)}
+
+
+class Tomorrow(date):
+    @classmethod
+    def today(cls):
+        return date(2030, 1, 2)
+
+
+def test_sort_index_is_rebuilt_on_a_new_day(monkeypatch):
+    df = pd.DataFrame({'Opportunity Score': [3, 1, 2]})
+    cache = SortIndexCache()
+    first = cache.get(df, SORTS, 'v1')
+    assert cache.get(df, SORTS, 'v1') is first
+
+    monkeypatch.setattr(pagination, 'date', Tomorrow)
+    assert cache.get(df, SORTS, 'v1') is not first
+
+
+def test_order_key_differs_by_day():
+    today = order_key(('v1', '2030-01-01'), {}, {}, '', 'Grant Score')
+    tomorrow = order_key(('v1', '2030-01-02'), {}, {}, '', 'Grant Score')
+    assert today != tomorrow
@@ -0,0 +1,70 @@
+"""Compiled filter plans order their predicates and match the filters they replace"""
+
+import pandas as pd
+
+from query_plan import (CLIENT_FILTER_COLUMNS, GRANT_FILTER_COLUMNS, FilterResultCache, compile_filters)
+
+CATEGORIES = {
+    'Research': ['SBIR', 'STTR'],
+    'Energy': ['Solar', 'Wind']
+}
+
+
+def clients():
+    return pd.DataFrame({
+        'Grant_Type': ['SBIR', 'Solar', 'STTR', 'Wind', 'SBIR'],
+        'Industry': ['Technology', 'Energy', 'Technology', 'Energy', 'Healthcare'],
+        'State': ['CA', 'TX', 'NY', 'CA', 'CA'],
+        'Amount_Requested': [30000, 120000, 50000, None, 25000],
+        'Application_Date': ['2024-01-05', '2024-02-10', '2024-02-29', '2024-03-01', '2024-02-29 18:00:00']
+    })
+
+
+SPEC = {
+    'date_range': ['2024-02-01', '2024-02-29'],
+    'funding_range': ['$25K-50K', '$50K-100K'],
+    'states': ['CA', 'NY'],
+    'categories': ['Research'],
+    'deadline': 'Rolling'
+}
+
+
+def test_plan_puts_categorical_predicates_before_ranges():
+    plan = compile_filters(SPEC, clients().columns, CLIENT_FILTER_COLUMNS, CATEGORIES)
+    assert [(p.field, p.kind) for p in plan.predicates] == [
+        ('categories', 'in'), ('states', 'in'), ('funding_range', 'range'), ('date_range', 'range')
+    ]
+    # Categories expand to grant types on frames that hold grant types
+    assert plan.predicates[0].value == ['SBIR', 'STTR']
+    assert plan.predicates[2].value == (25000, 100000)
+    assert plan.skipped == ['deadline']
+
+
+def test_plan_matches_pandas_filters():
+    df = clients()
+    plan = compile_filters(SPEC, df.columns, CLIENT_FILTER_COLUMNS, CATEGORIES)
+    dates = pd.to_datetime(df['Application_Date'], format='ISO8601')
+    expected = (
+        df['Grant_Type'].isin(['SBIR', 'STTR'])
+        & df['State'].isin(['CA', 'NY'])
+        & df['Amount_Requested'].between(25000, 100000)
+        & (dates >= '2024-02-01') & (dates < '2024-03-01')
+    )
+    assert plan.run(df, 'clients-v1').tolist() == expected.tolist()
+
+
+def test_grant_categories_match_legacy_list_filter():
+    grants = ['SBIR', 'Solar', 'Wind', 'Broadband', 'STTR']
+    frame = pd.DataFrame({
+        'Grant Type': grants,
+        'Category': ['Research', 'Energy', 'Energy', 'Other Grants', 'Research']
+    })
+    filters = {'categories': ['Energy', 'Research']}
+    category_grants = [grant for category in filters['categories'] for grant in CATEGORIES[category]]
+    expected = [grant for grant in grants if grant in category_grants]
+
+    cache = FilterResultCache()
+    filtered, plan = cache.run(frame, filters, GRANT_FILTER_COLUMNS, CATEGORIES, 'grants-v1')
+    assert filtered['Grant Type'].tolist() == expected
+    cache.run(frame, dict(filters), GRANT_FILTER_COLUMNS, CATEGORIES, 'grants-v1')
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'entries': 1}
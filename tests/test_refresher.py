@@ -0,0 +1,28 @@
+"""Background refresh reports only reloads that change the data"""
+
+import pandas as pd
+
+from derived import dataset_version
+from refresher import DatasetRefresher
+
+
+def test_first_reload_of_seeded_data_is_not_a_change():
+    df = pd.DataFrame({'Title': ['Rural broadband'], 'Funding': [250000]})
+    saved = []
+    refresher = DatasetRefresher(lambda: df, on_change=lambda frame, version: saved.append(version),
+                                 version=dataset_version(df))
+
+    assert refresher.refresh()
+    assert saved == []
+    assert refresher.current()[1] == dataset_version(df)
+
+
+def test_changed_reload_runs_on_change_once():
+    frames = [pd.DataFrame({'Funding': [1]}), pd.DataFrame({'Funding': [2]}), pd.DataFrame({'Funding': [2]})]
+    saved = []
+    refresher = DatasetRefresher(lambda: frames.pop(0), on_change=lambda frame, version: saved.append(version),
+                                 version=dataset_version(frames[0]))
+
+    for _ in range(3):
+        refresher.refresh()
+    assert saved == [dataset_version(pd.DataFrame({'Funding': [2]}))]
@@ -0,0 +1,36 @@
+"""Datasets that sessions still lease are never evicted from the registry"""
+
+import gc
+
+import pandas as pd
+
+from registry import DatasetRegistry
+
+
+def frame(seed):
+    return pd.DataFrame({'Title': [f"Grant {seed}"], 'Funding': [seed]})
+
+
+def test_leased_versions_survive_eviction():
+    registry = DatasetRegistry(maxsize=2)
+    first = registry.register(frame(1))
+    lease = registry.lease(first)
+    for seed in range(2, 6):
+        registry.register(frame(seed))
+
+    assert registry.get(first) is not None
+    assert registry.stats()['entries'] == 2
+
+    del lease
+    gc.collect()
+    registry.register(frame(6))
+    registry.register(frame(7))
+    assert registry.get(first) is None
+
+
+def test_views_do_not_share_new_columns():
+    registry = DatasetRegistry()
+    version = registry.register(frame(1))
+    view = registry.get(version)
+    view['Extra'] = 1
+    assert 'Extra' not in registry.get(version).columns
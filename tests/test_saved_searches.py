@@ -0,0 +1,66 @@
+"""Saved search results stay current through versioned filter evaluation"""
+
+import pandas as pd
+
+from derived import dataset_version
+from query_plan import CLIENT_FILTER_COLUMNS, run_filters
+from saved_searches import SavedSearchStore
+
+
+def clients():
+    return pd.DataFrame({
+        'client': ['Client_1', 'Client_2', 'Client_3'],
+        'Industry': ['Technology', 'Energy', 'Technology'],
+        'State': ['CA', 'TX', 'NY']
+    })
+
+
+def test_refresh_evaluates_each_frame_under_its_own_version(tmp_path):
+    store = SavedSearchStore(path=str(tmp_path / 'saved.sqlite3'))
+    calls = []
+
+    def evaluate(frame, spec, version):
+        calls.append((len(frame), version))
+        return run_filters(frame, spec, CLIENT_FILTER_COLUMNS, {}, version)[0].index
+
+    df = clients()
+    store.save('tech', {'industries': ['Technology']})
+    store.refresh(df, dataset_version(df), evaluate)
+    assert store.open('tech', dataset_version(df))['ids'] == [0, 2]
+
+    edited = df.copy()
+    edited.loc[1, 'Industry'] = 'Technology'
+    version = dataset_version(edited)
+    store.refresh(edited, version, evaluate)
+
+    search = store.open('tech', version)
+    assert search['ids'] == [0, 2, 1]
+    assert search['new_ids'] == [1]
+    # The incremental pass filters only the edited row, keyed apart from the full frame
+    assert calls[-1] == (1, f"{version}:changed-since:{dataset_version(df)}")
+
+
+def test_sessions_on_different_versions_reuse_stored_results(tmp_path, monkeypatch):
+    store = SavedSearchStore(path=str(tmp_path / 'saved.sqlite3'))
+    calls = []
+
+    def evaluate(frame, spec, version):
+        calls.append(version)
+        return run_filters(frame, spec, CLIENT_FILTER_COLUMNS, {}, version)[0].index
+
+    old = clients()
+    new = old.copy()
+    new.loc[1, 'Industry'] = 'Technology'
+    store.save('tech', {'industries': ['Technology']})
+    store.refresh(old, dataset_version(old), evaluate)
+    store.refresh(new, dataset_version(new), evaluate)
+    assert len(calls) == 2
+
+    # Alternating versions neither rehashes rows nor evaluates again
+    monkeypatch.setattr('saved_searches._row_hashes', lambda df: 1 / 0)
+    for _ in range(3):
+        store.refresh(old, dataset_version(old), evaluate)
+        store.refresh(new, dataset_version(new), evaluate)
+    assert len(calls) == 2
+    assert store.searches(dataset_version(old))[0]['matches'] == 2
+    assert store.searches(dataset_version(new))[0]['matches'] == 3
@@ -0,0 +1,41 @@
+"""Declared schemas keep codes as text and coerce amounts with a drift report"""
+
+import io
+
+import pandas as pd
+
+from schema import GRANT_SCHEMA, apply_schema, describe_drift, has_drift, read_csv_dtypes
+
+CSV = """Opportunity Number,Agency,Funding,NSIC code,Response Date,Extra
+00123,DOE,"$50,000",0541,2024-06-01,x
+00456,NSF,TBD,1200,06/15/2024,y
+00789,DOE,75000,,,z
+"""
+
+
+def test_schema_read_keeps_codes_as_text():
+    # Sniffed dtypes drop the leading zeros of codes and leave amounts as text
+    sniffed = pd.read_csv(io.StringIO(CSV))
+    assert sniffed['Opportunity Number'].tolist() == [123, 456, 789]
+
+    raw = pd.read_csv(io.StringIO(CSV), dtype=read_csv_dtypes(GRANT_SCHEMA))
+    df, report = apply_schema(raw, GRANT_SCHEMA)
+    assert df['Opportunity Number'].tolist() == ['00123', '00456', '00789']
+    assert df['NSIC code'].tolist()[:2] == ['0541', '1200']
+    assert isinstance(df['Agency'].dtype, pd.CategoricalDtype)
+    assert df['Funding'].tolist()[::2] == [50000, 75000]
+    assert pd.isna(df['Funding'][1])
+    assert df['Response Date'].tolist()[:2] == ['2024-06-01', '06/15/2024']
+
+    assert report['unexpected'] == ['Extra']
+    assert report['coerced_to_null'] == {'Funding': 1}
+    assert has_drift(report)
+    assert describe_drift(report).endswith("1 Funding values could not be read as numbers")
+
+
+def test_schema_reports_retyped_text_columns():
+    df = pd.DataFrame({'Opportunity Number': [123, 456], 'Funding': [1.0, 2.0]})
+    typed, report = apply_schema(df, {'Opportunity Number': 'text', 'Funding': 'number'})
+    assert typed['Opportunity Number'].tolist() == ['123', '456']
+    assert typed['Funding'].dtype == 'float64'
+    assert list(report['retyped']) == ['Opportunity Number']
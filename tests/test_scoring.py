@@ -0,0 +1,35 @@
+"""Vectorized scores match the row-by-row scoring they replace"""
+
+from datetime import datetime
+
+import pandas as pd
+
+from dates import normalize_dates
+from scoring import calculate_grant_score, score_grants
+
+NOW = datetime(2024, 6, 1)
+
+
+def grants():
+    return pd.DataFrame({
+        'Eligibility': ['Yes', 'No', 'Yes', 'Yes', 'No', 'Yes'],
+        'Status': ['Interested', 'Under Review', 'New', 'Not Interested', 'Unknown', 'Interested'],
+        'Response Date': ['2024-12-01', '07/01/2024', '2024-06-05', None, 'soon', '2024-05-01'],
+        'Funding': [1500000, 600000, 250000, 100000, 5000, None]
+    })
+
+
+def test_score_grants_matches_calculate_grant_score():
+    df = grants()
+    expected = df.apply(calculate_grant_score, axis=1, now=NOW).tolist()
+    assert score_grants(df, NOW).tolist() == expected
+    # Reading the parsed dates gives the same scores as parsing the raw strings
+    normalized, _ = normalize_dates(df)
+    assert normalized.apply(calculate_grant_score, axis=1, now=NOW).tolist() == expected
+    assert score_grants(normalized, NOW).tolist() == expected
+
+
+def test_score_grants_on_empty_frame():
+    scores = score_grants(grants().iloc[:0], NOW)
+    assert scores.empty
+    assert scores.name == 'Opportunity Score'
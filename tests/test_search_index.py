@@ -0,0 +1,41 @@
+"""Search index copies stay independent and limited searches rank like full ones"""
+
+import pandas as pd
+
+from search_index import GrantSearchIndex, SearchIndexCache
+
+
+def grants():
+    return pd.DataFrame({
+        'Title': ['Rural broadband', 'Broadband for schools', 'Clean energy', 'Energy storage', 'Solar energy'],
+        'Goal': ['Connect rural homes', 'Connect classrooms', 'Cut emissions', 'Grid storage', 'Rooftop solar'],
+        'Notes': [None, 'Matching funds required', None, 'Energy energy', None]
+    })
+
+
+def test_synced_copy_leaves_the_original_unchanged():
+    df = grants()
+    cache = SearchIndexCache()
+    original = cache.get(df, 'v1')
+
+    edited = df.copy()
+    edited.loc[0, 'Title'] = 'Rural water'
+    edited = edited.drop(index=4)
+    updated = cache.get(edited, 'v2')
+
+    assert list(original.search('broadband')) == [0, 1]
+    assert list(original.search('solar')) == [4]
+    assert list(updated.search('broadband')) == [1]
+    assert list(updated.search('water')) == [0]
+    assert list(updated.search('solar')) == []
+    assert list(original.search('water')) == []
+
+
+def test_limited_search_matches_the_full_ranking():
+    df = pd.DataFrame({'Title': ['energy'] * 6 + ['energy energy'] * 3, 'Goal': [None] * 9, 'Notes': [None] * 9})
+    index = GrantSearchIndex()
+    index.sync(df)
+
+    ranked = list(index.search('energy'))
+    for limit in range(len(ranked) + 2):
+        assert list(index.search('energy', limit=limit)) == ranked[:limit]
@@ -0,0 +1,32 @@
+"""Global search keeps one index per data version"""
+
+import pandas as pd
+
+from search_service import GlobalSearchCache, build_documents
+
+
+def clients(*names):
+    return pd.DataFrame({'client': list(names), 'Industry': ['Energy'] * len(names)})
+
+
+def test_each_version_searches_its_own_documents():
+    cache = GlobalSearchCache()
+    first = cache.get('v1', lambda: build_documents(clients=clients('Acme Solar', 'Birch Farms')))
+    second = cache.get('v2', lambda: build_documents(clients=clients('Cedar Labs')))
+
+    assert [hit.key for hit in first.search('acme', kinds=['client'])] == [0]
+    assert [hit.title for hit in second.search('cedar', kinds=['client'])] == ['Cedar Labs']
+    assert first.search('cedar', kinds=['client']) == []
+    assert second.search('acme', kinds=['client']) == []
+
+
+def test_known_version_is_not_rebuilt():
+    cache = GlobalSearchCache()
+    builds = []
+
+    def build():
+        builds.append(1)
+        return build_documents(clients=clients('Acme Solar'))
+
+    assert cache.get('v1', build) is cache.get('v1', build)
+    assert len(builds) == 1
@@ -0,0 +1,113 @@
+"""Conditional sheet fetches against a local stub server"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+
+import sheet_fetch
+from http_client import HttpClient
+from sheet_fetch import SheetFetchClient
+
+
+class StubSheet:
+    """Serves one CSV body with an ETag and Last-Modified, answering 304 to matching validators"""
+
+    def __init__(self, body, etag):
+        self.body, self.etag, self.requests = body, etag, []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                stub.requests.append(dict(self.headers))
+                if self.headers.get('If-None-Match') == stub.etag:
+                    self.send_response(304)
+                    self.send_header('ETag', stub.etag)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('ETag', stub.etag)
+                self.send_header('Last-Modified', 'Wed, 01 Jan 2025 00:00:00 GMT')
+                self.send_header('Content-Type', 'text/csv')
+                self.send_header('Content-Length', str(len(stub.body)))
+                self.end_headers()
+                self.wfile.write(stub.body)
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/export?format=csv"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+
+@pytest.fixture
+def stub():
+    stub = StubSheet(b"Title,Funding\nRural broadband,250000\nClean energy,1200000\n", '"v1"')
+    yield stub
+    stub.server.shutdown()
+    stub.server.server_close()
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    calls = []
+    read_csv = pd.read_csv
+
+    def counting_read_csv(*args, **kwargs):
+        calls.append(kwargs)
+        return read_csv(*args, **kwargs)
+
+    monkeypatch.setattr(sheet_fetch.pd, 'read_csv', counting_read_csv)
+    return calls
+
+
+def test_not_modified_reuses_the_parsed_frame(tmp_path, stub, parses):
+    client = SheetFetchClient(cache_dir=str(tmp_path), http=HttpClient())
+
+    first, source = client.load_csv(stub.url)
+    assert source == 'network'
+    second, source = client.load_csv(stub.url)
+    assert source == 'not_modified'
+
+    assert stub.requests[1]['If-None-Match'] == '"v1"'
+    assert stub.requests[1]['If-Modified-Since'] == 'Wed, 01 Jan 2025 00:00:00 GMT'
+    assert len(parses) == 1
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_returned_frames_do_not_share_edits_with_the_cache(tmp_path, stub):
+    client = SheetFetchClient(cache_dir=str(tmp_path), http=HttpClient())
+
+    df = client.fetch_csv(stub.url)
+    df['Funding'] = 0
+    df.loc[0, 'Title'] = 'Edited'
+
+    again = client.fetch_csv(stub.url)
+    assert again['Funding'].tolist() == [250000, 1200000]
+    assert again.loc[0, 'Title'] == 'Rural broadband'
+
+
+def test_parse_arguments_are_part_of_the_key(tmp_path, stub, parses):
+    client = SheetFetchClient(cache_dir=str(tmp_path), http=HttpClient(), max_frames=1)
+
+    client.fetch_csv(stub.url)
+    typed = client.fetch_csv(stub.url, dtype={'Funding': str})
+    assert typed['Funding'].tolist() == ['250000', '1200000']
+    assert len(parses) == 2
+    assert len(client._frames) == 1
+
+
+def test_changed_sheet_is_downloaded_and_parsed_again(tmp_path, stub, parses):
+    client = SheetFetchClient(cache_dir=str(tmp_path), http=HttpClient())
+    client.fetch_csv(stub.url)
+
+    stub.body, stub.etag = b"Title,Funding\nSolar energy,50000\n", '"v2"'
+    df, source = client.load_csv(stub.url)
+    assert source == 'network'
+    assert df['Title'].tolist() == ['Solar energy']
+    assert len(parses) == 2
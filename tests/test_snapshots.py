@@ -0,0 +1,22 @@
+"""Snapshots record the dataset version of the data they hold"""
+
+import pandas as pd
+
+from derived import dataset_version
+from refresher import DatasetRefresher
+from snapshots import SnapshotStore
+
+
+def test_refresh_of_snapshotted_data_saves_no_duplicate(tmp_path):
+    store = SnapshotStore(directory=str(tmp_path))
+    df = pd.DataFrame({'Title': ['Rural broadband'], 'Funding': [250000]})
+    meta = store.save(df, source='sheet', version=dataset_version(df))
+
+    refresher = DatasetRefresher(
+        lambda: df.copy(),
+        on_change=lambda frame, version: store.save(frame, source='sheet', version=version),
+        version=store.latest()['version']
+    )
+    refresher.refresh()
+
+    assert [snapshot['path'] for snapshot in store.snapshots()] == [meta['path']]